@@ -14,8 +14,8 @@ import time
 import clintosaurous.text
 
 
-VERSION = '1.0.0'
-LAST_UPDATE = '2023-01-04'
+VERSION = '1.1.0'
+LAST_UPDATE = '2026-10-17'
 
 
 # Script start time for use with run_time()
@@ -276,3 +276,63 @@ def timestamp(usr_time: int = None, tz: bool = True) -> str:
         return time.strftime("%Y-%m-%d %H:%M:%S %Z", usr_time)
     else:
         return time.strftime("%Y-%m-%d %H:%M:%S", usr_time)
+
+
+def time_slices(start: str, end: str, count: int) -> list[list[str]]:
+
+    """ Split a Time Range Into Slices
+
+    Splits an inclusive time range into `count` contiguous, non-overlapping
+    inclusive ranges of whole seconds for use with SQL `between`.
+
+        slices = clintosaurous.datetime.time_slices(
+            '2023-01-04 00:00:00', '2023-01-04 23:59:59', 4)
+
+    Fewer slices are returned if the range has fewer than `count` seconds.
+
+    Parameters:
+
+    start (str): Range start time. Format is "YYYY-MM-DD HH:MM:SS".
+    end (str): Range end time. Format is "YYYY-MM-DD HH:MM:SS".
+    count (int): Number of slices.
+
+    Return:
+
+    list[list[str]]: [start time, end time] of each slice in the same format.
+
+    Raises:
+
+    TypeError: `start` is not a `str`.
+    TypeError: `end` is not a `str`.
+    TypeError: `count` is not an `int`.
+    ValueError: `count` is less than 1 or `end` is before `start`.
+    """
+
+    # Type hints.
+    if not isinstance(start, str):
+        raise TypeError(f'start expected `str`, received {type(start)}')
+    if not isinstance(end, str):
+        raise TypeError(f'end expected `str`, received {type(end)}')
+    if isinstance(count, bool) or not isinstance(count, int):
+        raise TypeError(f'count expected `int`, received {type(count)}')
+    if count < 1:
+        raise ValueError(f'count must be at least 1, received {count}')
+
+    time_format = '%Y-%m-%d %H:%M:%S'
+    start_secs = int(time.mktime(time.strptime(start, time_format)))
+    end_secs = int(time.mktime(time.strptime(end, time_format)))
+    if end_secs < start_secs:
+        raise ValueError(f'end {end} is before start {start}')
+
+    seconds = end_secs - start_secs + 1
+    count = min(count, seconds)
+
+    slices = []
+    for i in range(count):
+        slice_start = start_secs + seconds * i // count
+        slice_end = start_secs + seconds * (i + 1) // count - 1
+        slices.append([
+            timestamp(slice_start, tz=False), timestamp(slice_end, tz=False)
+        ])
+
+    return slices
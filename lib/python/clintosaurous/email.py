@@ -3,16 +3,11 @@
 """ Functions for e-mail services. """
 
 
-from email.mime.application import MIMEApplication
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-from email.utils import formatdate
 from os.path import basename
-import smtplib
 
 
-VERSION = '1.1.0'
-LAST_UPDATE = "2022-09-28"
+VERSION = '1.2.0'
+LAST_UPDATE = "2026-10-17"
 
 
 def send(
@@ -42,6 +37,13 @@ def send(
     `html`: Boolean of if text is HTML. Default to not HTML.
     """
 
+    # The email packages are slow to import. Only import them when sending.
+    from email.mime.application import MIMEApplication
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.text import MIMEText
+    from email.utils import formatdate
+    import smtplib
+
     msg = MIMEMultipart()
     msg['From'] = from_addr
     msg['To'] = to_addr
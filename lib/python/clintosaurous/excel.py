@@ -5,14 +5,11 @@ Module to work with Excel spreadsheets.
 """
 
 
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill
-from openpyxl.utils import get_column_letter
 import re
 
 
-VERSION = "1.1.0"
-LAST_UPDATE = "2022-09-28"
+VERSION = "1.2.0"
+LAST_UPDATE = "2026-10-17"
 
 
 def _column_width(string, bold=False):
@@ -91,6 +88,11 @@ def generate(file_name, sheets):
         rows:       A list of list rows of data.
     """
 
+    # openpyxl is slow to import. Only import it when a workbook is built.
+    from openpyxl import Workbook
+    from openpyxl.styles import Font, PatternFill
+    from openpyxl.utils import get_column_letter
+
     wb = Workbook()
     bg_heading = PatternFill(
         start_color="DDDDDD",
@@ -15,20 +15,28 @@ import atexit
 import clintosaurous.datetime
 import clintosaurous.log as log
 import clintosaurous.opts
+import copy
+import marshal
 import os
 import pathlib
 import re
 import sys
-import yaml
 
 
-VERSION = '1.0.0'
-LAST_UPDATE = '2023-01-18'
+VERSION = '1.2.0'
+LAST_UPDATE = '2026-10-17'
 
 
 _conf_path = False
 etc = '/etc/clintosaurous'
 
+# Use precompiled configuration cache files.
+conf_cache_file = True
+# Cache file format version. Cache files with another version are ignored.
+_conf_cache_version = 1
+# Validated configurations: path -> ((mtime_ns, size), conf_data)
+_conf_cache = {}
+
 # Default lock file timeout in seconds. Default: 12 hours in lock()
 _lock_age = None
 # Lock file path.
@@ -55,6 +63,13 @@ def conf(conf_path: str = None, fail_friendly: bool = True) -> dict:
 
         config = clintosaurous.file.conf()
 
+    The validated configuration is cached in memory and reused until the
+    file's modify time or size changes. The validated configuration is also
+    written to a precompiled cache file next to the configuration file,
+    `<conf_path>.cache`, when the directory is writable. Later runs load it
+    instead of parsing the YAML. Set `conf_cache_file` to `False` to disable
+    the cache file.
+
     If `fail_friendly` is True, messages will be output to STDERR, but will
     be in a friendly format so a user can understand what the issue is, vs.
     a developer. Important for this function since it validates a user
@@ -104,13 +119,59 @@ def conf(conf_path: str = None, fail_friendly: bool = True) -> dict:
         conf_path = conf_file()
 
     # If configuration file does not exist, return empty dictionary.
-    if not os.path.exists(conf_path):
+    try:
+        conf_stat = os.stat(conf_path)
+    except OSError:
         return {}
 
+    # Reuse the configuration if the file has not changed since it was read.
+    conf_key = (conf_stat.st_mtime_ns, conf_stat.st_size)
+    cached = _conf_cache.get(conf_path)
+    if cached is not None and cached[0] == conf_key:
+        return copy.deepcopy(cached[1])
+
+    # Use the precompiled cache file if it matches the file.
+    if conf_cache_file:
+        conf_data = _conf_cache_read(conf_path, conf_stat)
+        if conf_data is not None:
+            _conf_cache[conf_path] = (conf_key, conf_data)
+            return copy.deepcopy(conf_data)
+
+    # yaml is slow to import. Only import it when the file must be parsed.
+    import yaml
+
     # If the file exists, read in file contents.
     with open(conf_path, newline='') as c:
         conf_data = yaml.safe_load(c)
 
+    # Configuration file is validated once and cached.
+    _conf_validate(conf_data, fail_friendly)
+
+    if conf_cache_file:
+        _conf_cache_write(conf_path, conf_stat, conf_data)
+
+    _conf_cache[conf_path] = (conf_key, conf_data)
+
+    return copy.deepcopy(conf_data)
+
+
+def _conf_validate(conf_data: dict, fail_friendly: bool) -> None:
+
+    """ Validate DDI Configuration File Contents
+
+    Internal only function and should not be called directly.
+
+    Parameters:
+
+    conf_data (dict): Contents from the configuration file.
+    fail_friendly (bool): If there is an error, output user friendly message.
+
+    Raises:
+
+    KeyError: When required configuration keys do not exist.
+    TypeError: When required configuration keys are not the correct type.
+    """
+
     # Perform configuration validation.
 
     example = '\n'.join([
@@ -249,9 +310,96 @@ def conf(conf_path: str = None, fail_friendly: bool = True) -> dict:
                     f'received {type(db_conf[key])}'
                 )
 
+
+def _conf_cache_read(conf_path: str, conf_stat: os.stat_result) -> dict:
+
+    """ Read the Precompiled Configuration Cache File
+
+    The cache file is only trusted if it has the same owner as the
+    configuration file and is not writable by anyone else.
+
+    Internal only function and should not be called directly.
+
+    Parameters:
+
+    conf_path (str): Path to configuration file.
+    conf_stat (os.stat_result): Configuration file `os.stat()` results.
+
+    Return:
+
+    dict: Validated configuration. `None` if there is no usable cache file.
+    """
+
+    cache_path = f'{conf_path}.cache'
+
+    try:
+        with open(cache_path, 'rb') as f:
+            cache_stat = os.fstat(f.fileno())
+            if (
+                cache_stat.st_uid != conf_stat.st_uid
+                or cache_stat.st_mode & 0o022
+            ):
+                return None
+            version, mtime_ns, size, conf_data = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    if (
+        version != _conf_cache_version
+        or mtime_ns != conf_stat.st_mtime_ns
+        or size != conf_stat.st_size
+    ):
+        return None
+
     return conf_data
 
 
+def _conf_cache_write(
+    conf_path: str, conf_stat: os.stat_result, conf_data: dict
+) -> None:
+
+    """ Write the Precompiled Configuration Cache File
+
+    The cache file gets the configuration file's permissions since it holds
+    the same secrets. Failures are ignored. The cache file is optional.
+
+    Internal only function and should not be called directly.
+
+    Parameters:
+
+    conf_path (str): Path to configuration file.
+    conf_stat (os.stat_result): Configuration file `os.stat()` results.
+    conf_data (dict): Validated configuration.
+    """
+
+    cache_path = f'{conf_path}.cache'
+    tmp_path = f'{cache_path}.{os.getpid()}'
+
+    # Only the configuration file owner writes the cache file.
+    if conf_stat.st_uid != os.geteuid():
+        return
+
+    try:
+        cache_data = marshal.dumps((
+            _conf_cache_version, conf_stat.st_mtime_ns, conf_stat.st_size,
+            conf_data
+        ))
+        fd = os.open(
+            tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL,
+            conf_stat.st_mode & 0o755
+        )
+        with os.fdopen(fd, 'wb') as f:
+            f.write(cache_data)
+        os.replace(tmp_path, cache_path)
+
+    # Values marshal cannot store, such as YAML dates, raise ValueError.
+    except (OSError, ValueError):
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
 def conf_file(conf_path: str = None) -> str:
 
     """ Retrieve and/or Set the DDI Configuration File Path
@@ -16,18 +16,47 @@ Facilitates logging functions.
     +---------+---------+
 
 Log level (5) is the default log level.
+
+Log levels can be set per module with `log_level(level, module=...)` or the
+`--log-module` CLI option. A module level applies to the module and all of
+its sub-modules.
+
+    clintosaurous.log.log_level(7, module='clintosaurous.snmp')
+
+Messages below the enabled level cost one comparison. Build expensive
+messages lazily with %-style arguments or a callable, or guard them with
+`is_enabled()`.
+
+    log.dbg('find_hostname(): ip: %s', ip)
+    log.dbg(lambda: f'find_hostname(): {len(cache):,} cached')
+    if log.is_enabled(7):
+        log.dbg(expensive_summary())
+
+Messages are written synchronously by default. With `--log-async` or
+`async_mode()`, messages are queued in memory and written by a single
+background thread that keeps the log file or syslog connection open and
+writes in batches. If the background thread fails to write, the error is
+reported to STDERR and later messages are written synchronously.
+
+Child processes can forward their messages to a sink in the parent process
+with `forward_start()` and `forward_to()`. The parent writes them in batches
+with the child process name attached.
 """
 
 
+import atexit
 import clintosaurous.opts
 import clintosaurous.datetime
 import os
+import queue
 import sys
 import syslog as slog
+import threading
+import time
 
 
-VERSION = '1.0.0'
-LAST_UPDATE = '2023-01-18'
+VERSION = '1.3.2'
+LAST_UPDATE = '2026-10-17'
 
 
 # CLI options.
@@ -41,6 +70,23 @@ _parser_log_group.add_argument(
         file.
     """
 )
+_parser_log_group.add_argument(
+    '--log-async',
+    action='store_true',
+    help="""
+        Queue log messages and write them from a background thread in
+        batches. Reduces logging overhead for scripts that log heavily.
+    """
+)
+_parser_log_group.add_argument(
+    '--log-module',
+    action='append',
+    metavar='MODULE=LEVEL',
+    help="""
+        Set the log level for a module and its sub-modules. Example:
+        clintosaurous.snmp=7. Can be specified multiple times.
+    """
+)
 _parser_log_group.add_argument(
     '--log-file',
     type=str,
@@ -79,14 +125,30 @@ _parser_log_group.add_argument(
 # Predefined variables.
 log_levels = ['EMR', 'ALR', 'CRI', 'ERR', 'WRN', 'LOG', 'INF', 'DBG']
 _out_level = None
+# Per module log levels.
+_module_levels = {}
+# Resolved log level per module name.
+_module_cache = {}
+# Highest level enabled for any module. Messages above it are dropped
+# without further checks. Starts at the maximum until levels are resolved.
+_max_level = 7
 _syslog_proc = os.path.basename(sys.argv[0])
 _syslog_levels = [
     slog.LOG_EMERG, slog.LOG_ALERT, slog.LOG_CRIT, slog.LOG_ERR,
     slog.LOG_WARNING, slog.LOG_NOTICE, slog.LOG_INFO, slog.LOG_DEBUG
 ]
+# Background writer when asynchronous logging is enabled.
+_writer = None
+# Asynchronous logging settings. `None` enabled defers to --log-async.
+_async_conf = {"enabled": None, "batch_size": 500, "flush_interval": 1.0}
+# Parent process sinks for log messages forwarded by child processes.
+# Start method -> sink. None is the default start method.
+_sinks = {}
+# Queue to the parent sink when this process forwards its log messages.
+_forward = None
 
 
-def emr(msg: str, syslog: bool = False) -> None:
+def emr(msg: str, *args, syslog: bool = False) -> None:
 
     """ Output Emergency Level Log Messages
 
@@ -94,28 +156,35 @@ def emr(msg: str, syslog: bool = False) -> None:
 
     `msg` can be a single string or a list of strings to output. All strings
     will be split on linefeeds and have a separate log message for each.
+    `msg` can also be a callable returning the message(s), or a %-style
+    format string for `args`. Either is only formatted if output.
 
     CLI option `--quiet` does not suppress these messages.
 
     Parameters:
 
-    msg (str|list): Single string or list of messages to output.
+    msg (str|list|callable): Single string or list of messages to output.
+    args: Values for %-style formatting of `msg`.
     syslog (bool): Output messages as syslog entries instead of STDOUT/STDERR.
         Default: False
 
     Raises:
 
-    TypeError: `msg` is not a `str` or `list`.
+    TypeError: `msg` is not a `str`, `list`, or callable.
     TypeError: `syslog` is not a `bool`.
     """
 
+    # Disabled messages are dropped before any other work is done.
+    if 0 > _max_level:
+        return
+
     # Type hints are handled by _msg_out().
 
     if msg:
-        _msg_out(0, msg, syslog=syslog)
+        _msg_out(0, msg, *args, syslog=syslog)
 
 
-def alr(msg: str, syslog: bool = False) -> None:
+def alr(msg: str, *args, syslog: bool = False) -> None:
 
     """ Output Alarm Level Log Messages
 
@@ -123,28 +192,35 @@ def alr(msg: str, syslog: bool = False) -> None:
 
     `msg` can be a single string or a list of strings to output. All strings
     will be split on linefeeds and have a separate log message for each.
+    `msg` can also be a callable returning the message(s), or a %-style
+    format string for `args`. Either is only formatted if output.
 
     CLI option `--quiet` does not suppress these messages.
 
     Parameters:
 
-    msg (str|list): Single string or list of messages to output.
+    msg (str|list|callable): Single string or list of messages to output.
+    args: Values for %-style formatting of `msg`.
     syslog (bool): Output messages as syslog entries instead of STDOUT/STDERR.
         Default: False
 
     Raises:
 
-    TypeError: `msg` is not a `str` or `list`.
+    TypeError: `msg` is not a `str`, `list`, or callable.
     TypeError: `syslog` is not a `bool`.
     """
 
+    # Disabled messages are dropped before any other work is done.
+    if 1 > _max_level:
+        return
+
     # Type hints are handled by _msg_out().
 
     if msg:
-        _msg_out(1, msg, syslog=syslog)
+        _msg_out(1, msg, *args, syslog=syslog)
 
 
-def cri(msg: str, syslog: bool = False) -> None:
+def cri(msg: str, *args, syslog: bool = False) -> None:
 
     """ Output Critical Level Log Messages
 
@@ -152,28 +228,35 @@ def cri(msg: str, syslog: bool = False) -> None:
 
     `msg` can be a single string or a list of strings to output. All strings
     will be split on linefeeds and have a separate log message for each.
+    `msg` can also be a callable returning the message(s), or a %-style
+    format string for `args`. Either is only formatted if output.
 
     CLI option `--quiet` does not suppress these messages.
 
     Parameters:
 
-    msg (str|list): Single string or list of messages to output.
+    msg (str|list|callable): Single string or list of messages to output.
+    args: Values for %-style formatting of `msg`.
     syslog (bool): Output messages as syslog entries instead of STDOUT/STDERR.
         Default: False
 
     Raises:
 
-    TypeError: `msg` is not a `str` or `list`.
+    TypeError: `msg` is not a `str`, `list`, or callable.
     TypeError: `syslog` is not a `bool`.
     """
 
+    # Disabled messages are dropped before any other work is done.
+    if 2 > _max_level:
+        return
+
     # Type hints are handled by _msg_out().
 
     if msg:
-        _msg_out(2, msg, syslog=syslog)
+        _msg_out(2, msg, *args, syslog=syslog)
 
 
-def err(msg: str, syslog: bool = False) -> None:
+def err(msg: str, *args, syslog: bool = False) -> None:
 
     """ Output Error Level Log Messages
 
@@ -181,28 +264,35 @@ def err(msg: str, syslog: bool = False) -> None:
 
     `msg` can be a single string or a list of strings to output. All strings
     will be split on linefeeds and have a separate log message for each.
+    `msg` can also be a callable returning the message(s), or a %-style
+    format string for `args`. Either is only formatted if output.
 
     CLI option `--quiet` does not suppress these messages.
 
     Parameters:
 
-    msg (str|list): Single string or list of messages to output.
+    msg (str|list|callable): Single string or list of messages to output.
+    args: Values for %-style formatting of `msg`.
     syslog (bool): Output messages as syslog entries instead of STDOUT/STDERR.
         Default: False
 
     Raises:
 
-    TypeError: `msg` is not a `str` or `list`.
+    TypeError: `msg` is not a `str`, `list`, or callable.
     TypeError: `syslog` is not a `bool`.
     """
 
+    # Disabled messages are dropped before any other work is done.
+    if 3 > _max_level:
+        return
+
     # Type hints are handled by _msg_out().
 
     if msg:
-        _msg_out(3, msg, syslog=syslog)
+        _msg_out(3, msg, *args, syslog=syslog)
 
 
-def wrn(msg: str, syslog: bool = False) -> None:
+def wrn(msg: str, *args, syslog: bool = False) -> None:
 
     """ Output Warning Level Log Messages
 
@@ -210,28 +300,35 @@ def wrn(msg: str, syslog: bool = False) -> None:
 
     `msg` can be a single string or a list of strings to output. All strings
     will be split on linefeeds and have a separate log message for each.
+    `msg` can also be a callable returning the message(s), or a %-style
+    format string for `args`. Either is only formatted if output.
 
     CLI option `--quiet` does not suppress these messages.
 
     Parameters:
 
-    msg (str|list): Single string or list of messages to output.
+    msg (str|list|callable): Single string or list of messages to output.
+    args: Values for %-style formatting of `msg`.
     syslog (bool): Output messages as syslog entries instead of STDOUT/STDERR.
         Default: False
 
     Raises:
 
-    TypeError: `msg` is not a `str` or `list`.
+    TypeError: `msg` is not a `str`, `list`, or callable.
     TypeError: `syslog` is not a `bool`.
     """
 
+    # Disabled messages are dropped before any other work is done.
+    if 4 > _max_level:
+        return
+
     # Type hints are handled by _msg_out().
 
     if msg:
-        _msg_out(4, msg, syslog=syslog)
+        _msg_out(4, msg, *args, syslog=syslog)
 
 
-def log(msg: str, syslog: bool = False) -> None:
+def log(msg: str, *args, syslog: bool = False) -> None:
 
     """ Output Log Level Log Messages
 
@@ -239,28 +336,35 @@ def log(msg: str, syslog: bool = False) -> None:
 
     `msg` can be a single string or a list of strings to output. All strings
     will be split on linefeeds and have a separate log message for each.
+    `msg` can also be a callable returning the message(s), or a %-style
+    format string for `args`. Either is only formatted if output.
 
     CLI option `--quiet` suppresses these messages.
 
     Parameters:
 
-    msg (str|list): Single string or list of messages to output.
+    msg (str|list|callable): Single string or list of messages to output.
+    args: Values for %-style formatting of `msg`.
     syslog (bool): Output messages as syslog entries instead of STDOUT/STDERR.
         Default: False
 
     Raises:
 
-    TypeError: `msg` is not a `str` or `list`.
+    TypeError: `msg` is not a `str`, `list`, or callable.
     TypeError: `syslog` is not a `bool`.
     """
 
+    # Disabled messages are dropped before any other work is done.
+    if 5 > _max_level:
+        return
+
     # Type hints are handled by _msg_out().
 
     if msg:
-        _msg_out(5, msg, syslog=syslog)
+        _msg_out(5, msg, *args, syslog=syslog)
 
 
-def inf(msg: str, syslog: bool = False) -> None:
+def inf(msg: str, *args, syslog: bool = False) -> None:
 
     """ Output Informational Level Log Messages
 
@@ -268,28 +372,35 @@ def inf(msg: str, syslog: bool = False) -> None:
 
     `msg` can be a single string or a list of strings to output. All strings
     will be split on linefeeds and have a separate log message for each.
+    `msg` can also be a callable returning the message(s), or a %-style
+    format string for `args`. Either is only formatted if output.
 
     Output is suppressed unless `--info` or `--debug` options are set.
 
     Parameters:
 
-    msg (str|list): Single string or list of messages to output.
+    msg (str|list|callable): Single string or list of messages to output.
+    args: Values for %-style formatting of `msg`.
     syslog (bool): Output messages as syslog entries instead of STDOUT/STDERR.
         Default: False
 
     Raises:
 
-    TypeError: `msg` is not a `str` or `list`.
+    TypeError: `msg` is not a `str`, `list`, or callable.
     TypeError: `syslog` is not a `bool`.
     """
 
+    # Disabled messages are dropped before any other work is done.
+    if 6 > _max_level:
+        return
+
     # Type hints are handled by _msg_out().
 
     if msg:
-        _msg_out(6, msg, syslog=syslog)
+        _msg_out(6, msg, *args, syslog=syslog)
 
 
-def dbg(msg: str, syslog: bool = False) -> None:
+def dbg(msg: str, *args, syslog: bool = False) -> None:
 
     """ Output Debug Level Log Messages
 
@@ -297,39 +408,53 @@ def dbg(msg: str, syslog: bool = False) -> None:
 
     `msg` can be a single string or a list of strings to output. All strings
     will be split on linefeeds and have a separate log message for each.
+    `msg` can also be a callable returning the message(s), or a %-style
+    format string for `args`. Either is only formatted if output.
 
     Output is suppressed unless `--debug` option is set.
 
     Parameters:
 
-    msg (str|list): Single string or list of messages to output.
+    msg (str|list|callable): Single string or list of messages to output.
+    args: Values for %-style formatting of `msg`.
     syslog (bool): Output messages as syslog entries instead of STDOUT/STDERR.
         Default: False
 
     Raises:
 
-    TypeError: `msg` is not a `str` or `list`.
+    TypeError: `msg` is not a `str`, `list`, or callable.
     TypeError: `syslog` is not a `bool`.
     """
 
+    # Disabled messages are dropped before any other work is done.
+    if 7 > _max_level:
+        return
+
     # Type hints are handled by _msg_out().
 
     if msg:
-        _msg_out(7, msg, syslog=syslog)
+        _msg_out(7, msg, *args, syslog=syslog)
 
 
-def log_level(level: int = None) -> int:
+def log_level(level: int = None, module: str = None) -> int:
 
     """ Retrieve Or Update the Current Logging Level
 
     Retrieve the current logging level or set a new logging level. This is a
-    global update.
+    global update unless `module` is supplied.
+
+    When `module` is supplied, the level is retrieved or set for that module
+    and its sub-modules only. Modules without their own level use the
+    nearest parent module level, then the global level.
+
+        clintosaurous.log.log_level(7, module='clintosaurous.snmp')
 
     Set to -1 to disable logging.
 
     Parameters:
 
     level (int): New logging level. Set to -1 to disable logging. Default: 5
+    module (str): Module name to retrieve or set the logging level for.
 
     Return:
 
@@ -338,6 +463,7 @@ def log_level(level: int = None) -> int:
     Raises:
 
     TypeError: `level` is not an `int`.
+    TypeError: `module` is not a `str`.
     """
 
     # Type hints.
@@ -345,12 +471,17 @@ def log_level(level: int = None) -> int:
         isinstance(level, bool) or not isinstance(level, int)
     )):
         raise TypeError(f'`level` expected `int`, received {type(level)}')
+    if module is not None and not isinstance(module, str):
+        raise TypeError(f'`module` expected `str`, received {type(module)}')
 
     global _out_level
 
     opts = clintosaurous.opts.cli()
 
-    if level is not None:
+    if _out_level is None:
+        _cli_module_levels(opts)
+
+    if level is not None and module is None:
         _out_level = level
     elif _out_level is None:
         if opts.silent:
@@ -364,10 +495,363 @@ def log_level(level: int = None) -> int:
         else:
             _out_level = 5
 
+    if level is not None and module is not None:
+        _module_levels[module] = level
+
+    # Resolved module levels fall back to the global level.
+    if level is not None:
+        _module_cache.clear()
+
+    _set_max_level()
+
+    if module is not None:
+        return _module_level(module)
+
     return _out_level
 
 
-def _msg_out(level: int, msg: str, syslog: bool = False) -> None:
+def is_enabled(level: int, module: str = None) -> bool:
+
+    """ Check If a Log Level Is Output
+
+    Use to skip building expensive log messages that would not be output.
+
+        if log.is_enabled(7):
+            log.dbg(expensive_summary())
+
+    Parameters:
+
+    level (int): Log level to check.
+    module (str): Module name to check the level for. Default: Calling
+        module.
+
+    Return:
+
+    bool: Whether messages at `level` are output.
+    """
+
+    # Type hints are skipped to keep this check cheap.
+
+    return _enabled(level, module, 2)
+
+
+def async_mode(
+    enabled: bool = True, batch_size: int = None,
+    flush_interval: float = None
+) -> bool:
+
+    """ Enable or Disable Asynchronous Logging
+
+    Messages are placed on an in-memory queue and written by one background
+    thread. The thread keeps the log file or syslog connection open and
+    writes messages in batches. A batch is written when `batch_size`
+    messages are queued, when `flush_interval` seconds have passed since the
+    oldest queued message, on `flush()`, and on exit.
+
+        clintosaurous.log.async_mode()
+
+    The `--log-async` CLI option enables this mode with the default
+    settings.
+
+    Parameters:
+
+    enabled (bool): Enable or disable asynchronous logging. Disabling writes
+        out all queued messages first. Default: True
+    batch_size (int): Maximum number of messages written per batch.
+        Default: 500
+    flush_interval (int|float): Maximum number of seconds a message is held
+        before being written. Default: 1.0
+
+    Return:
+
+    bool: Whether asynchronous logging is enabled.
+
+    Raises:
+
+    TypeError: `enabled` is not a `bool`.
+    TypeError: `batch_size` is not an `int`.
+    TypeError: `flush_interval` is not an `int` or `float`.
+    ValueError: `batch_size` or `flush_interval` is not a positive number.
+    """
+
+    # Type hints.
+    if not isinstance(enabled, bool):
+        raise TypeError(f'`enabled` expected `bool`, received {type(enabled)}')
+    if batch_size is not None and (
+        isinstance(batch_size, bool) or not isinstance(batch_size, int)
+    ):
+        raise TypeError(
+            f'`batch_size` expected `int`, received {type(batch_size)}')
+    if flush_interval is not None and (
+        isinstance(flush_interval, bool)
+        or not isinstance(flush_interval, (int, float))
+    ):
+        raise TypeError(
+            '`flush_interval` expected `int` or `float`, ' +
+            f'received {type(flush_interval)}'
+        )
+    if batch_size is not None and batch_size < 1:
+        raise ValueError(
+            f'`batch_size` must be a positive number, received {batch_size}')
+    if flush_interval is not None and flush_interval <= 0:
+        raise ValueError(
+            '`flush_interval` must be a positive number, ' +
+            f'received {flush_interval}'
+        )
+
+    global _writer
+
+    if batch_size is not None:
+        _async_conf["batch_size"] = batch_size
+    if flush_interval is not None:
+        _async_conf["flush_interval"] = flush_interval
+
+    # Settings only apply to a new writer, so restart a running one.
+    if _writer is not None:
+        _writer.stop()
+        _writer = None
+
+    _async_conf["enabled"] = enabled
+
+    return enabled
+
+
+def forward_start(context=None) -> 'multiprocessing.Queue':
+
+    """ Start the Parent Process Log Sink
+
+    Starts a thread that receives log messages forwarded by child processes
+    and writes them through the background writer in batches. Each message
+    is prefixed with the child process name.
+
+        log_queue = clintosaurous.log.forward_start()
+
+    Pass the returned queue to each child process, which calls
+    `forward_to()` before logging. `clintosaurous.multiprocessing.start`
+    does this when `log_forward` is set.
+
+    Queues created for the default fork start method can't be passed to
+    spawn or forkserver processes. Pass the multiprocessing context the
+    child processes are started with to get a queue that can.
+
+    Parameters:
+
+    context (multiprocessing.context.BaseContext): Context of the child
+        processes. Default: The default context.
+
+    Return:
+
+    multiprocessing.Queue: Queue child processes forward messages to.
+    """
+
+    if context is None:
+        method = None
+    else:
+        method = context.get_start_method()
+
+    if method not in _sinks:
+        _sinks[method] = _forward_sink(context)
+
+    return _sinks[method].queue
+
+
+def forward_to(
+    log_queue: 'multiprocessing.Queue', name: str = None
+) -> None:
+
+    """ Forward Log Messages to the Parent Process
+
+    Sends all log messages from the current process to the parent sink
+    started with `forward_start()` instead of writing them directly. The
+    log level is still checked in the current process.
+
+        clintosaurous.log.forward_to(log_queue)
+
+    Parameters:
+
+    log_queue (multiprocessing.Queue): Queue returned by `forward_start()`.
+    name (str): Name to prefix messages with. Default: Current process name.
+
+    Raises:
+
+    TypeError: `name` is not a `str`.
+    """
+
+    # Type hints.
+    if name is not None and not isinstance(name, str):
+        raise TypeError(f'`name` expected `str`, received {type(name)}')
+
+    global _forward
+
+    if name is None:
+        import multiprocessing
+        name = multiprocessing.current_process().name
+
+    _forward = (log_queue, name)
+
+
+def flush() -> None:
+
+    """ Write All Queued Log Messages
+
+    Blocks until every message queued by asynchronous logging has been
+    written. Does nothing when asynchronous logging is not in use.
+
+        clintosaurous.log.flush()
+    """
+
+    if _writer is not None:
+        _writer.flush()
+
+
+def _async_enabled() -> bool:
+
+    """ Check If Asynchronous Logging Is Enabled
+
+    Internal only function and should not be called directly.
+
+    Return:
+
+    bool: Whether messages should be queued for the background writer.
+    """
+
+    if _async_conf["enabled"] is None:
+        _async_conf["enabled"] = bool(clintosaurous.opts.cli().log_async)
+
+    return _async_conf["enabled"]
+
+
+def _get_writer() -> object:
+
+    """ Retrieve the Background Writer
+
+    Starts the background writer if it is not already running.
+
+    Internal only function and should not be called directly.
+
+    Return:
+
+    _async_writer: Background writer.
+    """
+
+    global _writer
+
+    if _writer is None:
+        _writer = _async_writer(
+            _async_conf["batch_size"], _async_conf["flush_interval"])
+
+    return _writer
+
+
+def _cli_module_levels(opts: clintosaurous.opts.argparse.Namespace) -> None:
+
+    """ Load Per Module Log Levels From CLI Options
+
+    Internal only function and should not be called directly.
+
+    Parameters:
+
+    opts (argparse.Namespace): Parsed CLI options.
+
+    Raises:
+
+    ValueError: A `--log-module` value is not in MODULE=LEVEL format.
+    """
+
+    for value in opts.log_module or []:
+        module, sep, level = value.partition('=')
+        if not sep or not module or not level.lstrip('-').isdigit():
+            raise ValueError(
+                f'--log-module expected MODULE=LEVEL, received {value}')
+        _module_levels.setdefault(module, int(level))
+
+    _module_cache.clear()
+
+
+def _enabled(level: int, module: str, frame_depth: int) -> bool:
+
+    """ Check If a Log Level Is Output
+
+    Internal only function and should not be called directly.
+
+    Parameters:
+
+    level (int): Log level to check.
+    module (str): Module name. If `None`, the module of the stack frame at
+        `frame_depth` is used. The module is only looked up if per module
+        log levels are set.
+    frame_depth (int): Stack depth of the calling module's frame relative to
+        this function.
+
+    Return:
+
+    bool: Whether messages at `level` are output.
+    """
+
+    if level > _max_level:
+        return False
+
+    if _out_level is None:
+        log_level()
+
+    if not _module_levels:
+        return level <= _out_level
+
+    if module is None:
+        module = sys._getframe(frame_depth).f_globals.get('__name__', '')
+
+    return level <= _module_level(module)
+
+
+def _module_level(module: str) -> int:
+
+    """ Resolve the Log Level for a Module
+
+    Internal only function and should not be called directly.
+
+    Parameters:
+
+    module (str): Module name.
+
+    Return:
+
+    int: Log level of the nearest module with a level set, otherwise the
+        global log level.
+    """
+
+    try:
+        return _module_cache[module]
+    except KeyError:
+        pass
+
+    level = _out_level
+    name = module
+    while name:
+        if name in _module_levels:
+            level = _module_levels[name]
+            break
+        name = name.rpartition('.')[0]
+
+    _module_cache[module] = level
+
+    return level
+
+
+def _set_max_level() -> None:
+
+    """ Update the Highest Enabled Log Level
+
+    Internal only function and should not be called directly.
+    """
+
+    global _max_level
+
+    _max_level = max([_out_level, *_module_levels.values()])
+
+
+def _msg_out(
+    level: int, msg: str, *args, syslog: bool = False
+) -> None:
 
     """ Outputs Log Message to Appropriate Facility
 
@@ -379,23 +863,38 @@ def _msg_out(level: int, msg: str, syslog: bool = False) -> None:
     Parameters:
 
     level (int): Log level for message(s) being output.
-    msg (str|list): Single string or list of messages to output.
+    msg (str|list|callable): Single string or list of messages to output.
+    args: Values for %-style formatting of `msg`.
     syslog (bool): Output messages as syslog entries instead of STDOUT/STDERR.
         Default: False
 
     Raises:
 
     TypeError: `level` is not an `int.
-    TypeError: `msg` is not a `str` or `list`.
+    TypeError: `msg` is not a `str`, `list`, or callable.
     TypeError: `syslog` is not a `bool`.
     """
 
+    # Validate the logging level includes this message's level. Checked
+    # first so disabled messages are never formatted. The calling module is
+    # two frames up, past the log level function.
+    if not _enabled(level, None, 3):
+        return
+
+    # Build lazy messages.
+    if callable(msg):
+        msg = msg()
+    if args and isinstance(msg, str):
+        msg = msg % args
+
     # Type hints.
     if not isinstance(level, int):
         raise TypeError(f'`level` expected `int`, received {type(level)}')
     if not isinstance(msg, str) and not isinstance(msg, list):
         raise TypeError(
-            f'`msg` expected `str` or `list`, received {type(msg)}')
+            '`msg` expected `str`, `list`, or callable, ' +
+            f'received {type(msg)}'
+        )
     if not isinstance(syslog, bool):
         raise TypeError(f'`syslog` expected `str`, received {type(syslog)}')
 
@@ -405,8 +904,14 @@ def _msg_out(level: int, msg: str, syslog: bool = False) -> None:
     if not isinstance(msg, list):
         msg = [msg]
 
-    # Validate the logging level includes this message's level.
-    if level > log_level():
+    # Send the message to the parent process log sink.
+    if _forward is not None:
+        _forward[0].put((level, time.time(), msg, syslog, _forward[1]))
+        return
+
+    # Hand the message off to the background writer.
+    if _async_enabled():
+        _get_writer().put((level, time.time(), msg, syslog, None))
         return
 
     opts = clintosaurous.opts.cli()
@@ -447,3 +952,319 @@ def _msg_out(level: int, msg: str, syslog: bool = False) -> None:
     # If outputting to a file, close the file.
     if opts.log_file:
         out.close()
+
+
+class _async_writer:
+
+    """ Background Log Writer
+
+    Writes queued log messages from a single thread. Created by _msg_out()
+    when asynchronous logging is enabled.
+
+    Internal only class and should not be called directly.
+    """
+
+    def __init__(self, batch_size: int, flush_interval: float):
+
+        """ Start the Background Writer Thread
+
+        Parameters:
+
+        batch_size (int): Maximum number of messages written per batch.
+        flush_interval (float): Maximum number of seconds a message is held
+            before being written.
+        """
+
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.SimpleQueue()
+        # Serializes writes from the thread and synchronous fallback writes.
+        self._lock = threading.Lock()
+        self._file = None
+        self._syslog_open = False
+        # Only timestamps within the same second are reused.
+        self._stamp_sec = None
+        self._stamp = None
+
+        self.thread = threading.Thread(
+            target=self._run, name='clintosaurous.log', daemon=True)
+        self.thread.start()
+
+    def put(self, record: tuple) -> None:
+
+        """ Queue a Log Record
+
+        Written synchronously if the writer thread is not running.
+
+        Parameters:
+
+        record (tuple): (level, unix time, list of messages, syslog,
+            process name or None)
+        """
+
+        if self.thread.is_alive():
+            self.queue.put(record)
+        else:
+            self._write_safe([record])
+
+    def flush(self) -> None:
+
+        """ Block Until All Currently Queued Messages Are Written
+
+        Returns early if the writer thread stops before writing them.
+        """
+
+        if not self.thread.is_alive():
+            return
+
+        done = threading.Event()
+        self.queue.put(done)
+        while not done.wait(0.1):
+            if not self.thread.is_alive():
+                return
+
+    def stop(self) -> None:
+
+        """ Write All Queued Messages and Stop the Writer Thread """
+
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+
+    def _run(self) -> None:
+
+        """ Writer Thread Main Loop """
+
+        batch = []
+        deadline = None
+
+        while True:
+            if batch:
+                timeout = max(deadline - time.monotonic(), 0)
+            else:
+                timeout = None
+
+            try:
+                record = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                self._write_safe(batch)
+                batch = []
+                continue
+
+            if record is None:
+                self._write_safe(batch)
+                self._close()
+                return
+
+            if isinstance(record, threading.Event):
+                self._write_safe(batch)
+                batch = []
+                record.set()
+                continue
+
+            if not batch:
+                deadline = time.monotonic() + self.flush_interval
+            batch.append(record)
+
+            if len(batch) >= self.batch_size:
+                self._write_safe(batch)
+                batch = []
+
+    def _timestamp(self, msg_time: float) -> str:
+
+        """ Formatted Timestamp, Cached Per Second """
+
+        msg_sec = int(msg_time)
+        if msg_sec != self._stamp_sec:
+            self._stamp_sec = msg_sec
+            self._stamp = clintosaurous.datetime.timestamp(msg_sec)
+
+        return self._stamp
+
+    def _write(self, batch: list) -> None:
+
+        """ Write a Batch of Log Records """
+
+        if not batch:
+            return
+
+        opts = clintosaurous.opts.cli()
+        stdout_lines = []
+        stderr_lines = []
+
+        for level, msg_time, msgs, syslog, name in batch:
+            if name is not None:
+                prefix = f'{name}: '
+            else:
+                prefix = ''
+
+            # Loop through each user supplied message.
+            for msg in msgs:
+                # Split multiline messages into individual log messages.
+                for line in msg.split("\n"):
+                    # If outputting to syslog. The connection stays open
+                    # until the writer stops.
+                    if syslog or opts.syslog:
+                        if not self._syslog_open:
+                            slog.openlog(
+                                _syslog_proc, facility=slog.LOG_LOCAL2)
+                            self._syslog_open = True
+                        slog.syslog(
+                            _syslog_levels[level], prefix + line.strip())
+                        continue
+
+                    out_line = (
+                        f'{self._timestamp(msg_time)}: ' +
+                        f'{log_levels[level]}: {prefix}{line.rstrip()}\n'
+                    )
+                    if opts.log_file or opts.no_log_stderr or level >= 5:
+                        stdout_lines.append(out_line)
+                    else:
+                        stderr_lines.append(out_line)
+
+        # The log file stays open until the writer stops.
+        if opts.log_file:
+            if self._file is None:
+                self._file = open(opts.log_file, "a")
+            self._file.write(''.join(stdout_lines))
+            self._file.flush()
+            return
+
+        if stdout_lines:
+            sys.stdout.write(''.join(stdout_lines))
+            sys.stdout.flush()
+        if stderr_lines:
+            sys.stderr.write(''.join(stderr_lines))
+            sys.stderr.flush()
+
+    def _write_safe(self, batch: list) -> None:
+
+        """ Write a Batch of Log Records, Reporting Errors
+
+        A failed write is reported to STDERR and the batch is lost. New
+        messages are written synchronously from then on, so the callers see
+        further errors.
+        """
+
+        with self._lock:
+            try:
+                self._write(batch)
+            except Exception:
+                _async_conf["enabled"] = False
+                try:
+                    self._close()
+                except Exception:
+                    self._file = None
+                try:
+                    # Only needed on failure, so not imported with the
+                    # module.
+                    import traceback
+                    sys.stderr.write(
+                        f'clintosaurous.log: Failed to write {len(batch)} ' +
+                        'log messages. Writing synchronously.\n' +
+                        traceback.format_exc()
+                    )
+                    sys.stderr.flush()
+                except Exception:
+                    pass
+
+    def _close(self) -> None:
+
+        """ Close the Log File and Syslog Connection """
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._syslog_open:
+            slog.closelog()
+            self._syslog_open = False
+
+
+class _forward_sink:
+
+    """ Parent Process Sink for Forwarded Log Messages
+
+    Moves log records from the child process queue to the background writer.
+    Created by forward_start().
+
+    Internal only class and should not be called directly.
+    """
+
+    def __init__(self, context=None):
+
+        """ Start the Sink Thread
+
+        Parameters:
+
+        context (multiprocessing.context.BaseContext): Context to create the
+            queue with. Default: The default context.
+        """
+
+        # multiprocessing is only imported when log forwarding is used.
+        if context is None:
+            import multiprocessing as context
+        self.queue = context.Queue()
+        self.thread = threading.Thread(
+            target=self._run, name='clintosaurous.log sink', daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+
+        """ Pass On All Received Messages and Stop the Sink Thread """
+
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+        self.queue.close()
+
+    def _run(self) -> None:
+
+        """ Sink Thread Main Loop """
+
+        while True:
+            record = self.queue.get()
+            if record is None:
+                return
+            _get_writer().put(record)
+
+
+def _atexit() -> None:
+
+    """ Code To Execute on Script Exit
+
+    Stop the forwarded log sink, write all queued log messages, and stop the
+    background writer.
+
+    Internal only function and should not be called directly.
+    """
+
+    global _writer
+
+    for sink in _sinks.values():
+        sink.stop()
+    _sinks.clear()
+
+    if _writer is not None:
+        _writer.stop()
+        _writer = None
+
+
+def _after_fork() -> None:
+
+    """ Reset Background Writer State in a Forked Child
+
+    The writer and sink threads do not exist in a forked child. The child
+    starts its own writer on its first message.
+
+    Internal only function and should not be called directly.
+    """
+
+    global _writer
+
+    _sinks.clear()
+    _writer = None
+
+
+# Register to run commands on exit.
+atexit.register(_atexit)
+os.register_at_fork(after_in_child=_after_fork)
@@ -0,0 +1,438 @@
+#!/opt/clintosaurous/venv/bin/python3 -Bu
+
+""" Clintosaurous Tools In-Process Metrics
+
+This module provides named phase timers, counters, and histograms for
+Clintosaurous tools scripts.
+
+    import clintosaurous.metrics as metrics
+
+    with metrics.timer('query_syslog_fw'):
+        rows = cursor.fetchall()
+    metrics.count('syslog_rows', len(rows))
+
+    @metrics.timed('process_msgs_fw')
+    def process_msgs_fw(services, parsed_msgs):
+        ...
+
+    metrics.observe('batch_rows', len(batch))
+
+Nothing is done until the first metric is recorded. At exit, a summary of
+all recorded metrics is logged. With `--metrics-textfile`, the metrics are
+also written in the Prometheus text format for the node_exporter textfile
+collector.
+"""
+
+
+import atexit
+import clintosaurous.datetime
+import clintosaurous.log as log
+import clintosaurous.opts
+import clintosaurous.text
+import functools
+import os
+import re
+import sys
+import threading
+import time
+
+
+VERSION = '1.0.0'
+LAST_UPDATE = '2026-10-17'
+
+
+# CLI options.
+_parser_metrics_group = \
+    clintosaurous.opts.parser.add_argument_group('metrics')
+
+_parser_metrics_group.add_argument(
+    '--metrics-textfile',
+    type=str,
+    help="""
+        Write recorded metrics to this file on exit in the Prometheus text
+        format. Point it at the node_exporter textfile collector directory.
+        Example: /var/lib/node_exporter/textfile/firewall-reports.prom
+    """
+)
+
+# Default histogram bucket upper bounds.
+buckets = [
+    0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000,
+    10000, 50000, 100000
+]
+
+# Recorded metrics.
+# Timers: name -> [count, total seconds, min seconds, max seconds]
+_timers = {}
+# Counters: name -> value
+_counters = {}
+# Histograms: name -> [bucket bounds, bucket counts, count, sum]
+_histograms = {}
+_lock = threading.Lock()
+# Exit processing is registered with the first recorded metric.
+_registered = False
+# Script name for metric labels.
+_script = os.path.basename(sys.argv[0])
+
+
+class timer:
+
+    """ Named Phase Timer
+
+    Context manager that records the elapsed time of a block under `name`.
+
+        with clintosaurous.metrics.timer('query_syslog_fw'):
+            ...
+
+    Attributes:
+
+        name (str): Timer name.
+        elapsed (float): Elapsed seconds once the block has exited.
+    """
+
+    __slots__ = ('name', 'elapsed', '_start')
+
+    def __init__(self, name: str):
+
+        """ Create a Named Timer
+
+        Parameters:
+
+        name (str): Timer name. Repeated timings with the same name are
+            combined.
+
+        Raises:
+
+        TypeError: `name` is not a `str`.
+        """
+
+        # Type hints.
+        if not isinstance(name, str):
+            raise TypeError(f'`name` expected `str`, received {type(name)}')
+
+        self.name = name
+        self.elapsed = None
+        self._start = None
+
+    def __enter__(self):
+
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+
+        self.elapsed = time.perf_counter() - self._start
+        record_time(self.name, self.elapsed)
+        return False
+
+
+def timed(name: str = None):
+
+    """ Function Timer Decorator
+
+    Records the run time of each call to the decorated function.
+
+        @clintosaurous.metrics.timed('parse_msgs_fw')
+        def parse_msgs_fw(...):
+
+    Parameters:
+
+    name (str): Timer name. Default: The function name.
+
+    Return:
+
+    Decorator function.
+
+    Raises:
+
+    TypeError: `name` is not a `str`.
+    """
+
+    # Type hints.
+    if name is not None and not isinstance(name, str):
+        raise TypeError(f'`name` expected `str`, received {type(name)}')
+
+    def decorator(func):
+
+        timer_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record_time(timer_name, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+def count(name: str, value: int = 1) -> None:
+
+    """ Increment a Counter
+
+        clintosaurous.metrics.count('syslog_rows', len(rows))
+
+    Parameters:
+
+    name (str): Counter name.
+    value (int|float): Amount to add. Default: 1
+    """
+
+    # Type hints are skipped to keep recording cheap.
+
+    with _lock:
+        if not _registered:
+            _register()
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def observe(name: str, value: float, bounds: list = None) -> None:
+
+    """ Add a Value to a Histogram
+
+        clintosaurous.metrics.observe('batch_rows', len(batch))
+
+    Parameters:
+
+    name (str): Histogram name.
+    value (int|float): Value observed.
+    bounds (list): Bucket upper bounds, used when the histogram is created
+        by this call. Default: clintosaurous.metrics.buckets
+    """
+
+    # Type hints are skipped to keep recording cheap.
+
+    with _lock:
+        if not _registered:
+            _register()
+
+        try:
+            hist = _histograms[name]
+        except KeyError:
+            hist_bounds = sorted(bounds or buckets)
+            hist = [hist_bounds, [0] * len(hist_bounds), 0, 0]
+            _histograms[name] = hist
+
+        for i, bound in enumerate(hist[0]):
+            if value <= bound:
+                hist[1][i] += 1
+                break
+        hist[2] += 1
+        hist[3] += value
+
+
+def record_time(name: str, seconds: float) -> None:
+
+    """ Record a Timing Measured Elsewhere
+
+        clintosaurous.metrics.record_time('query_syslog_fw', elapsed)
+
+    Parameters:
+
+    name (str): Timer name.
+    seconds (float): Elapsed seconds.
+    """
+
+    # Type hints are skipped to keep recording cheap.
+
+    with _lock:
+        if not _registered:
+            _register()
+
+        try:
+            stats = _timers[name]
+        except KeyError:
+            _timers[name] = [1, seconds, seconds, seconds]
+            return
+
+        stats[0] += 1
+        stats[1] += seconds
+        if seconds < stats[2]:
+            stats[2] = seconds
+        if seconds > stats[3]:
+            stats[3] = seconds
+
+
+def summary() -> str:
+
+    """ Text Summary of All Recorded Metrics
+
+    Return:
+
+    str: Text tables of timers, counters, and histograms. Empty if nothing
+        has been recorded.
+    """
+
+    run_secs = time.time() - clintosaurous.datetime.start_time
+    tables = []
+
+    with _lock:
+        if _timers:
+            rows = [['Timer', 'Count', 'Total', 'Average', 'Min', 'Max']]
+            for name in sorted(_timers):
+                cnt, total, low, high = _timers[name]
+                rows.append([
+                    name, f'{cnt:,}', f'{total:.3f}s', f'{total / cnt:.3f}s',
+                    f'{low:.3f}s', f'{high:.3f}s'
+                ])
+            tables.append(clintosaurous.text.table(rows))
+
+        if _counters:
+            rows = [['Counter', 'Total', 'Per Second']]
+            for name in sorted(_counters):
+                value = _counters[name]
+                rate = value / run_secs if run_secs else 0
+                rows.append([name, f'{value:,}', f'{rate:,.1f}'])
+            tables.append(clintosaurous.text.table(rows))
+
+        if _histograms:
+            rows = [['Histogram', 'Count', 'Average', 'Sum']]
+            for name in sorted(_histograms):
+                cnt, total = _histograms[name][2:]
+                rows.append([
+                    name, f'{cnt:,}', f'{total / cnt:,.3f}', f'{total:,.3f}'
+                ])
+            tables.append(clintosaurous.text.table(rows))
+
+    return '\n'.join(tables)
+
+
+def textfile(path: str) -> None:
+
+    """ Write Metrics in the Prometheus Text Format
+
+    Writes all recorded metrics for the node_exporter textfile collector.
+    The file is written to a temporary file first and renamed into place so
+    the collector never reads a partial file.
+
+        clintosaurous.metrics.textfile('/var/lib/node_exporter/rpts.prom')
+
+    Parameters:
+
+    path (str): Output file path.
+
+    Raises:
+
+    TypeError: `path` is not a `str`.
+    """
+
+    # Type hints.
+    if not isinstance(path, str):
+        raise TypeError(f'`path` expected `str`, received {type(path)}')
+
+    script = _label(_script)
+    lines = [
+        '# HELP clintosaurous_run_seconds Script run time in seconds.',
+        '# TYPE clintosaurous_run_seconds gauge',
+        f'clintosaurous_run_seconds{{script="{script}"}} ' +
+        f'{time.time() - clintosaurous.datetime.start_time:.6f}',
+        '# HELP clintosaurous_last_run_timestamp_seconds ' +
+        'Unix time the script finished.',
+        '# TYPE clintosaurous_last_run_timestamp_seconds gauge',
+        f'clintosaurous_last_run_timestamp_seconds{{script="{script}"}} ' +
+        f'{time.time():.0f}',
+    ]
+
+    with _lock:
+        if _timers:
+            lines += [
+                '# HELP clintosaurous_timer_seconds Phase run time in ' +
+                'seconds.',
+                '# TYPE clintosaurous_timer_seconds summary',
+            ]
+            for name in sorted(_timers):
+                cnt, total = _timers[name][:2]
+                labels = f'script="{script}",name="{_label(name)}"'
+                lines.append(
+                    f'clintosaurous_timer_seconds_sum{{{labels}}} ' +
+                    f'{total:.6f}'
+                )
+                lines.append(
+                    f'clintosaurous_timer_seconds_count{{{labels}}} {cnt}')
+
+        if _counters:
+            lines += [
+                '# HELP clintosaurous_counter_total Script counters.',
+                '# TYPE clintosaurous_counter_total counter',
+            ]
+            for name in sorted(_counters):
+                labels = f'script="{script}",name="{_label(name)}"'
+                lines.append(
+                    f'clintosaurous_counter_total{{{labels}}} ' +
+                    f'{_counters[name]}'
+                )
+
+        if _histograms:
+            lines += [
+                '# HELP clintosaurous_histogram Script histograms.',
+                '# TYPE clintosaurous_histogram histogram',
+            ]
+            for name in sorted(_histograms):
+                bounds, counts, cnt, total = _histograms[name]
+                labels = f'script="{script}",name="{_label(name)}"'
+                cumulative = 0
+                for bound, bucket_cnt in zip(bounds, counts):
+                    cumulative += bucket_cnt
+                    lines.append(
+                        f'clintosaurous_histogram_bucket{{{labels},' +
+                        f'le="{bound}"}} {cumulative}'
+                    )
+                lines.append(
+                    f'clintosaurous_histogram_bucket{{{labels},' +
+                    f'le="+Inf"}} {cnt}'
+                )
+                lines.append(
+                    f'clintosaurous_histogram_sum{{{labels}}} {total}')
+                lines.append(
+                    f'clintosaurous_histogram_count{{{labels}}} {cnt}')
+
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+    os.replace(tmp_path, path)
+
+
+def _label(value: str) -> str:
+
+    """ Escape a Prometheus Label Value
+
+    Internal only function and should not be called directly.
+    """
+
+    return re.sub(r'(["\\])', r'\\\1', value).replace('\n', r'\n')
+
+
+def _register() -> None:
+
+    """ Register Exit Processing
+
+    Called with the first recorded metric so scripts that record nothing
+    pay nothing.
+
+    Internal only function and should not be called directly.
+    """
+
+    global _registered
+
+    _registered = True
+    atexit.register(_atexit)
+
+
+def _atexit() -> None:
+
+    """ Code To Execute on Script Exit
+
+    Log the metrics summary and write the textfile if requested.
+
+    Internal only function and should not be called directly.
+    """
+
+    log.log('Run metrics:\n' + summary())
+
+    opts = clintosaurous.opts.cli()
+    if opts.metrics_textfile:
+        log.log(f'Writing metrics to {opts.metrics_textfile}')
+        textfile(opts.metrics_textfile)
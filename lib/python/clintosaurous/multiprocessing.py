@@ -5,21 +5,94 @@ This module provides process multiprocessing operations for the Clintosaurous
 tools.
 
 It uses the multiprocessing module to create child processes.
+
+`start` launches long-lived child processes that talk to the parent over
+pipes. `pool` runs a function over a queue of work items on a set of worker
+processes:
+
+    with clintosaurous.multiprocessing.pool(8, retries=2) as workers:
+        for result in workers.imap_unordered(poll_host, hosts):
+            ...
+
+Large row batches can be returned from children through shared memory with
+`share_batch()` and `shared_batch` instead of being pickled through a pipe.
+
+`clintosaurous.threadpool` provides the same `start` and `pool` API with
+threads for I/O bound work.
+
+CPU time, peak RSS, and context switches of each child are collected from
+the kernel when it exits, and sampled from /proc while it runs. See
+`start.stats()`, `pool.stats()`, and stats_table(). With the `--proc-stats`
+CLI option, running children are sampled every `stats_interval` seconds
+and a table of all children is logged at exit.
 """
 
 
+import array
 import atexit
 import clintosaurous.log as log
+import clintosaurous.opts
+import collections
+import functools
+import heapq
+import itertools
 import multiprocessing as mp
+import multiprocessing.connection
+import os
+import resource
+import sys
+import threading
 import time
 
 
-VERSION = '1.1.0'
-LAST_UPDATE = '2022-11-29'
+VERSION = '1.8.4'
+LAST_UPDATE = '2026-10-17'
+
 
+# CLI options.
+_parser_mp_group = \
+    clintosaurous.opts.parser.add_argument_group('multiprocessing options')
+
+_parser_mp_group.add_argument(
+    '--proc-stats',
+    help="""
+        Log a table of the CPU time, peak memory, and context switches of
+        each child process at exit. Default: False
+    """,
+    action='store_true'
+)
 
 # Store all procs launched for _kill_on_exit()
 _all_procs = []
+# Resource usage records of all children for the --proc-stats exit report.
+_proc_stats = []
+_proc_stats_registered = False
+# Most resource usage records kept for the exit report and for each start()
+# or pool(). The oldest records of exited children are dropped past this.
+stats_keep = 1000
+# Forked children whose final usage has not been collected:
+# process -> record
+_stats_running = {}
+# Seconds between /proc samples of running children while waiting on them.
+# None samples only when stats() is called, unless --proc-stats is set.
+stats_interval = None
+# Clock ticks per second of the /proc CPU times.
+_clk_tck = os.sysconf('SC_CLK_TCK')
+# Shared memory segment name prefix for share_batch(). Followed by the
+# creating process ID so _kill_on_exit() can find segments left by children.
+shm_prefix = 'clintosaurous_'
+_shm_seq = itertools.count()
+# Batches opened with shared_batch() and not closed: name -> shared_batch
+_shm_attached = {}
+# Modules preloaded by the forkserver for warm workers, in addition to the
+# clintosaurous modules already imported. Example: ['pysnmp.hlapi']
+forkserver_preload = []
+# Forkserver context for warm workers. Created by warm_context().
+_warm_context = None
+# Return value of the start() or pool() `initializer` in a worker, read
+# through `worker_state`. Thread local so each clintosaurous.threadpool
+# worker thread has its own.
+_worker_local = threading.local()
 
 
 class start:
@@ -35,6 +108,10 @@ class start:
         names (str): String to prepend process names with. Default: Worker X
         timeout (int): Total run time allowed for the process to run.
             Default: 3600 (1 hour)
+        log_forward (bool): Child process log messages are forwarded to the
+            parent process.
+
+    Resource usage of each child is kept after it exits. See stats().
     """
 
     # Default number of child processes to launch if not specified.
@@ -42,7 +119,8 @@ class start:
 
     def __init__(
         self, target, proc_cnt: int = _def_cnt, names: str = None,
-        timeout: int = 3600
+        timeout: int = 3600, log_forward: bool = False, warm: bool = False,
+        initializer=None, initargs: tuple = ()
     ):
 
         """
@@ -68,6 +146,21 @@ class start:
             timeout (int): Amount of time in seconds a process is allowed to
                 run before clintosaurous.multiprocessing.check() will kill the
                 process. Set to 0 for no timeout. Default: 3600 (1 hour)
+            log_forward (bool): Forward child process log messages to a
+                single sink in the parent process instead of each child
+                writing to the log itself. Messages are written in batches
+                and prefixed with the child process name. Default: False
+            warm (bool): Start the child processes from a forkserver that
+                has the clintosaurous modules and `forkserver_preload`
+                already imported. See warm_context(). `target` must be
+                defined at the top level of a module. Default: False
+            initializer (obj): Function called in each child process before
+                `target`. The return value is stored in
+                `clintosaurous.multiprocessing.worker_state` for `target` to
+                use. Use it to build expensive state once per child, like a
+                database connection or SNMP engine. `worker_state` is None
+                outside of workers. Default: None
+            initargs (tuple|list): Arguments passed to `initializer`.
 
         Parameters Of Child Process:
 
@@ -104,6 +197,10 @@ class start:
             TypeError: proc_cnt not an int.
             TypeError: name not a str or list.
             TypeError: timeout not an int.
+            TypeError: log_forward not a bool.
+            TypeError: warm not a bool.
+            TypeError: initializer not callable.
+            TypeError: initargs not a tuple or list.
         """
 
         # Type hints.
@@ -120,8 +217,24 @@ class start:
         if not isinstance(timeout, int):
             raise TypeError(
                 f'proc_cnt expected `int`, received {type(timeout)}')
+        if not isinstance(log_forward, bool):
+            raise TypeError(
+                f'log_forward expected `bool`, received {type(log_forward)}')
+        if not isinstance(warm, bool):
+            raise TypeError(f'warm expected `bool`, received {type(warm)}')
+        if initializer is not None and not callable(initializer):
+            raise TypeError(
+                'initializer expected callable, ' +
+                f'received {type(initializer)}'
+            )
+        if not isinstance(initargs, (tuple, list)):
+            raise TypeError(
+                'initargs expected `tuple` or `list`, ' +
+                f'received {type(initargs)}'
+            )
 
         atexit.register(_kill_on_exit)
+        _stats_register()
 
         if names is None:
             names = []
@@ -141,21 +254,120 @@ class start:
         self.procs = []
         self.proc_cnt = len(names)
         self.timeout = timeout
+        # Timeout heap: [deadline, sequence, process]
+        self._deadlines = []
+        self._deadline_seq = itertools.count()
+        # Resource usage records: name -> record
+        self._stats = {}
+        self._sample_time = time.time()
+
+        if warm:
+            context = warm_context()
+            # Forkserver children don't inherit the parsed CLI options.
+            cli_opts = clintosaurous.opts.cli()
+        else:
+            context = mp
+            cli_opts = None
+
+        log_queue = None
+        if log_forward:
+            if warm:
+                log_queue = log.forward_start(context)
+            else:
+                log_queue = log.forward_start()
 
         for i in range(len(names)):
             log.log(f'Launching child process {names[i]} ...')
-            from_parent_pipe, to_child_pipe = mp.Pipe(False)
-            from_child_pipe, to_parent_pipe = mp.Pipe(False)
-            child_proc = mp.Process(
-                target=target, name=names[i], args=(
-                    names[i], from_parent_pipe, to_parent_pipe,
+            from_parent_pipe, to_child_pipe = context.Pipe(False)
+            from_child_pipe, to_parent_pipe = context.Pipe(False)
+            if log_forward or warm or initializer is not None:
+                child_proc = context.Process(
+                    target=_child_start, name=names[i], args=(
+                        target, log_queue, initializer, initargs, cli_opts,
+                        names[i], from_parent_pipe, to_parent_pipe,
+                    )
                 )
-            )
+            else:
+                child_proc = mp.Process(
+                    target=target, name=names[i], args=(
+                        names[i], from_parent_pipe, to_parent_pipe,
+                    )
+                )
+            _stats_collect_exited()
             child_proc.start()
+            start_time = time.time()
             self.procs.append([
-                child_proc, from_child_pipe, to_child_pipe, time.time()
+                child_proc, from_child_pipe, to_child_pipe, start_time
             ])
             _all_procs.append(child_proc)
+            self._stats[names[i]] = _stats_record(
+                names[i], child_proc.pid, start_time)
+            if not warm:
+                _stats_running[child_proc] = self._stats[names[i]]
+            if timeout:
+                heapq.heappush(self._deadlines, [
+                    start_time + timeout, next(self._deadline_seq),
+                    child_proc
+                ])
+
+        _stats_prune(self._stats)
+
+    def as_completed(self, timeout: int = None):
+
+        """
+        Generator returning child processes as they exit.
+
+            for proc_data in processes.as_completed():
+                log.log(f'{proc_data[0].name} done')
+
+        Blocks on the process sentinels, so each child is returned as soon
+        as it exits. Exited children are removed from `procs` the same as
+        check(). Children that send large results must have their pipes
+        read with wait_any() instead, or they can block before exiting.
+
+        Parameters:
+
+            timeout (int|float): Seconds to wait for all children to exit.
+                Default: None, wait forever.
+
+        Return:
+
+            generator: Process data lists from `procs` of exited children.
+
+        Raises:
+
+            TypeError: timeout not an int or float.
+            TimeoutError: Children still running after `timeout`.
+        """
+
+        # Type hints.
+        if timeout is not None and (
+            isinstance(timeout, bool) or
+            not isinstance(timeout, (int, float))
+        ):
+            raise TypeError(
+                f'timeout expected `int` or `float`, received {type(timeout)}')
+
+        if timeout is None:
+            deadline = None
+        else:
+            deadline = time.time() + timeout
+
+        while True:
+            yield from self._reap()
+            if not self.procs:
+                return
+            self._sample()
+
+            if deadline is not None and time.time() >= deadline:
+                raise TimeoutError(
+                    f'{len(self.procs)} child processes still running')
+
+            mp.connection.wait(
+                [proc_data[0].sentinel for proc_data in self.procs],
+                self._wait_time(deadline)
+            )
+            self._kill_timed_out()
 
     def check(self, wait: bool = False) -> int:
 
@@ -178,42 +390,25 @@ class start:
         if not isinstance(wait, bool):
             raise TypeError(f'wait expected `bool`, received {type(wait)}')
 
-        while len(self.procs):
-
-            for proc_num in reversed(range(len(self.procs))):
-                proc_data = self.procs[proc_num]
-                proc = proc_data[0]
-                if proc.is_alive():
-                    if (
-                        self.timeout and
-                        time.time() - proc_data[3] > self.timeout
-                    ):
-                        log.warn(f'{proc.name}: Timeout exceeded, killing!')
-                        proc.kill()
-                else:
-                    if proc.exitcode:
-                        log.warn(
-                            f'{proc.name}: Non-zero exit code: ' +
-                            f'{proc.exitcode}'
-                        )
-                    else:
-                        log.log(f'{proc.name}: Process exited.')
-
-                    del self.procs[proc_num]
+        while True:
+            self._kill_timed_out()
+            self._reap()
 
             proc_cnt = len(self.procs)
-            if not wait:
+            if not wait or not proc_cnt:
                 self.proc_cnt = proc_cnt
                 return self.proc_cnt
 
-            if proc_cnt > 0 and proc_cnt != self.proc_cnt:
+            if proc_cnt != self.proc_cnt:
                 log.log(f'Waiting on {proc_cnt} children to exit ...')
                 self.proc_cnt = proc_cnt
+            self._sample()
 
-            if proc_cnt < 0:
-                return 0
-
-            time.sleep(2)
+            # Wakes up when a child exits or the next timeout is reached.
+            mp.connection.wait(
+                [proc_data[0].sentinel for proc_data in self.procs],
+                self._wait_time()
+            )
 
     def get_proc_by_name(self, name: str) -> list:
 
@@ -244,15 +439,1841 @@ class start:
 
         return None
 
+    def stats(self) -> dict:
 
-def _kill_on_exit() -> None:
+        """
+        Resource usage of the child processes.
+
+            for name, usage in processes.stats().items():
+                log.log(f'{name}: {usage["max_rss_kb"]:,} KB')
+
+        Running children are sampled from /proc when this is called, and
+        every `stats_interval` seconds while waiting on them if it is set or
+        `--proc-stats` is used. Children that have exited and been seen by
+        check(), as_completed(), or a pool have their final usage from the
+        kernel. Children started from a forkserver, or reaped by something
+        else first, have no final usage, so their last /proc sample is used
+        and `rusage` is False.
+        Only the latest `stats_keep` exited children are kept.
+
+        Return:
+
+            dict: Child name -> usage dict with the keys:
+
+                pid (int): Process ID.
+                running (bool): Child has not been reaped yet.
+                exitcode (int): Exit code. None while running.
+                run_secs (float): Seconds since the child was started, or
+                    until it was reaped.
+                user_secs (float): User CPU seconds.
+                system_secs (float): System CPU seconds.
+                max_rss_kb (int): Peak resident memory in KB. The kernel
+                    only keeps the largest peak of all children, so this
+                    is the highest /proc sample unless the child set a new
+                    largest peak. None if neither is available.
+                voluntary_switches (int): Context switches waiting on I/O
+                    or locks.
+                involuntary_switches (int): Context switches from being
+                    preempted. High counts mean the child is CPU starved.
+                threads (int): Threads in the last sample.
+                max_threads (int): Most threads sampled.
+                tasks (int): Pool chunks run. None outside a pool.
+                items (int): Pool work items run. None outside a pool.
+                rusage (bool): Usage is the final usage from the kernel.
+                    False while running or if it was not available.
+        """
+
+        self._sample(True)
+
+        return {name: dict(record) for name, record in self._stats.items()}
+
+    def wait_any(self, timeout: int = None) -> list:
+
+        """
+        Wait for a child process to exit or send data.
+
+            for proc_data in processes.wait_any():
+                if proc_data[1].poll():
+                    result = proc_data[1].recv()
+
+        Blocks on the process sentinels and the pipes from the children, so
+        it returns as soon as any child exits or has data ready to receive.
+        Children past the timeout are killed while waiting. Exited children
+        are returned until they are removed with check().
+
+        Parameters:
+
+            timeout (int|float): Seconds to wait. Default: None, wait until
+                a child is ready.
+
+        Return:
+
+            list: Process data lists from `procs` of the ready children, in
+                `procs` order. Empty if `timeout` passed or there are no
+                children.
+
+        Raises:
+
+            TypeError: timeout not an int or float.
+        """
+
+        # Type hints.
+        if timeout is not None and (
+            isinstance(timeout, bool) or
+            not isinstance(timeout, (int, float))
+        ):
+            raise TypeError(
+                f'timeout expected `int` or `float`, received {type(timeout)}')
+
+        if timeout is None:
+            deadline = None
+        else:
+            deadline = time.time() + timeout
+
+        while self.procs:
+            self._kill_timed_out()
+            self._sample()
+
+            waiting = {}
+            for proc_data in self.procs:
+                waiting[proc_data[0].sentinel] = proc_data
+                waiting[proc_data[1]] = proc_data
+
+            ready = mp.connection.wait(
+                list(waiting), self._wait_time(deadline))
+            if ready:
+                ready_ids = set(id(waiting[obj]) for obj in ready)
+                return [
+                    proc_data for proc_data in self.procs
+                    if id(proc_data) in ready_ids
+                ]
+
+            if deadline is not None and time.time() >= deadline:
+                break
+
+        return []
+
+    def _collect(self, proc, block: bool = False) -> bool:
+
+        """
+        Record the exit and final resource usage of a child. See
+        _stats_collect(). Use the return value instead of is_alive(), which
+        can reap the child after it was checked.
+
+        Internal only function and should not be called directly.
+
+        Parameters:
+
+            proc (multiprocessing.Process): Child process.
+            block (bool): Wait for the child to exit.
+
+        Return:
+
+            bool: The child has exited.
+        """
+
+        record = self._stats.get(proc.name)
+        if record is None or not record['running']:
+            if block:
+                proc.join()
+            return not proc.is_alive()
+
+        return _stats_collect(proc, record, block)
+
+    def _kill_timed_out(self) -> None:
+
+        """
+        Kill children past the timeout.
+
+        Internal only function and should not be called directly.
+        """
+
+        now = time.time()
+        while self._deadlines and self._deadlines[0][0] <= now:
+            proc = heapq.heappop(self._deadlines)[2]
+            if not self._collect(proc):
+                log.wrn(f'{proc.name}: Timeout exceeded, killing!')
+                proc.kill()
+
+    def _reap(self, procs: list = None) -> list:
+
+        """
+        Remove exited children from `procs` and log their exit.
+
+        Internal only function and should not be called directly.
+
+        Parameters:
+
+            procs (list): Process data lists to check. Default: All of
+                `procs`.
+
+        Return:
+
+            list: Process data lists of the exited children.
+        """
+
+        exited = []
+        for proc_data in list(self.procs if procs is None else procs):
+            proc = proc_data[0]
+            if not self._collect(proc):
+                continue
+
+            if proc.exitcode:
+                log.wrn(f'{proc.name}: Non-zero exit code: {proc.exitcode}')
+            else:
+                log.log(f'{proc.name}: Process exited.')
+
+            self.procs.remove(proc_data)
+            exited.append(proc_data)
+
+        return exited
+
+    def _sample(self, force: bool = False) -> None:
+
+        """
+        Sample the resource usage of running children from /proc every
+        `stats_interval` seconds, if periodic samples are enabled.
+
+        Internal only function and should not be called directly.
+
+        Parameters:
+
+            force (bool): Sample now, regardless of `stats_interval`.
+        """
+
+        now = time.time()
+        if not force:
+            interval = _stats_interval()
+            if interval is None or now - self._sample_time < interval:
+                return
+        self._sample_time = now
+
+        for proc_data in self.procs:
+            record = self._stats.get(proc_data[0].name)
+            if record is not None and record['running']:
+                _stats_sample(record, f'/proc/{record["pid"]}')
+
+    def _wait_time(self, deadline: float = None) -> float:
+
+        """
+        Seconds to block before the next child timeout, resource usage
+        sample, or `deadline`.
+
+        Internal only function and should not be called directly.
+
+        Return:
+
+            float: Seconds to wait. None to wait forever.
+        """
+
+        deadlines = []
+        interval = _stats_interval()
+        if self.procs and interval is not None:
+            deadlines.append(self._sample_time + interval)
+        if self._deadlines:
+            deadlines.append(self._deadlines[0][0])
+        if deadline is not None:
+            deadlines.append(deadline)
+        if not deadlines:
+            return None
+
+        return max(0, min(deadlines) - time.time())
+
+
+class pool:
 
     """
-    Kill all running child processes on exit.
+    Worker process pool running a function over a queue of work items.
 
-    Internal only function and should not be called directly.
+        with clintosaurous.multiprocessing.pool(8, retries=2) as workers:
+            results = workers.map(parse_slice, slices)
+
+    Work items are sent to idle workers in chunks and results are streamed
+    back as each chunk finishes. Items are only read from the input when a
+    worker is free, so a generator or other unbounded queue of work is never
+    read ahead of the workers and memory use stays bounded. A slow consumer
+    of imap_unordered() holds back new work the same way.
+
+    Failed items are retried up to `retries` times. A worker that exits or
+    runs a chunk longer than `task_timeout` is replaced and the items of its
+    chunk are retried.
+
+    Functions, items, and results must be picklable. Functions are sent by
+    reference, so they must be defined at the top level of a module.
+
+    With `autoscale`, the number of workers is adjusted between `min_procs`
+    and `max_procs` while work runs, so `proc_cnt` doesn't need tuning for
+    CPU or I/O bound work:
+
+        Grow: Work is waiting, no worker is idle, the 1 minute load average
+            per processor is under `scale_load`, and per item latency has
+            not risen more than 50% since the last grow. I/O bound work
+            keeps growing, CPU bound work stops once the processors are
+            busy.
+        Shrink: The load average per processor is over `scale_load` and per
+            item latency has risen more than 50% since the last grow, or
+            workers have been idle for `idle_timeout` seconds.
+
+    Scaling decisions are logged.
+
+    Attributes:
+
+        workers (start): Worker processes.
+        proc_cnt (int): Number of worker processes.
+        retries (int): Times a failed item is retried.
+        task_timeout (int): Seconds a worker can run a chunk before it is
+            killed. 0 for no timeout.
     """
 
-    for proc in _all_procs:
-        if proc.is_alive():
-            proc.kill()
+    def __init__(
+        self, proc_cnt: int = start._def_cnt, names: str = 'Worker',
+        retries: int = 0, task_timeout: int = 0, log_forward: bool = False,
+        autoscale: bool = False, min_procs: int = 1,
+        max_procs: int = start._def_cnt, scale_interval: int = 2,
+        scale_load: float = 1.0, idle_timeout: int = 30, warm: bool = False,
+        initializer=None, initargs: tuple = ()
+    ):
+
+        """
+        Launch the worker processes.
+
+            workers = clintosaurous.multiprocessing.pool(16, retries=1)
+
+        Parameters:
+
+            proc_cnt (int): Number of worker processes.
+                Default: 4 worker processes per system processor.
+            names (str): String to prepend worker process names with.
+                Default: Worker
+            retries (int): Times a failed item is retried before the run
+                fails. Default: 0
+            task_timeout (int): Seconds a worker can run a chunk of items
+                before it is killed and replaced. Set to 0 for no timeout.
+                Default: 0
+            log_forward (bool): Forward worker log messages to the parent
+                process. Default: False
+            autoscale (bool): Adjust the number of workers while work runs.
+                `proc_cnt` is the starting number of workers, limited to
+                `min_procs` and `max_procs`. Default: False
+            min_procs (int): Fewest workers when autoscaling. Default: 1
+            max_procs (int): Most workers when autoscaling.
+                Default: 4 worker processes per system processor.
+            scale_interval (int|float): Seconds between autoscaling
+                decisions. Default: 2
+            scale_load (int|float): 1 minute load average per processor
+                above which workers are not added. Default: 1.0
+            idle_timeout (int|float): Seconds a worker is idle before it is
+                stopped when autoscaling. Default: 30
+            warm (bool): Start workers from a forkserver with the modules
+                preloaded. See start(). Default: False
+            initializer (obj): Function called once in each worker before
+                it runs any items. The return value is stored in
+                `clintosaurous.multiprocessing.worker_state` for the item
+                function to reuse. Default: None
+            initargs (tuple|list): Arguments passed to `initializer`.
+
+        Raises:
+
+            TypeError: proc_cnt, retries, task_timeout, min_procs, or
+                max_procs not an int.
+            TypeError: names not a str.
+            TypeError: log_forward, autoscale, or warm not a bool.
+            TypeError: initializer not callable.
+            TypeError: initargs not a tuple or list.
+            TypeError: scale_interval, scale_load, or idle_timeout not an int
+                or float.
+            ValueError: proc_cnt or min_procs less than 1, or max_procs less
+                than min_procs.
+        """
+
+        # Type hints.
+        for name, value in [
+            ['proc_cnt', proc_cnt], ['retries', retries],
+            ['task_timeout', task_timeout], ['min_procs', min_procs],
+            ['max_procs', max_procs]
+        ]:
+            if isinstance(value, bool) or not isinstance(value, int):
+                raise TypeError(
+                    f'{name} expected `int`, received {type(value)}')
+        for name, value in [
+            ['scale_interval', scale_interval], ['scale_load', scale_load],
+            ['idle_timeout', idle_timeout]
+        ]:
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise TypeError(
+                    f'{name} expected `int` or `float`, ' +
+                    f'received {type(value)}'
+                )
+        if not isinstance(names, str):
+            raise TypeError(f'names expected `str`, received {type(names)}')
+        if not isinstance(log_forward, bool):
+            raise TypeError(
+                f'log_forward expected `bool`, received {type(log_forward)}')
+        if not isinstance(autoscale, bool):
+            raise TypeError(
+                f'autoscale expected `bool`, received {type(autoscale)}')
+        if proc_cnt < 1 or min_procs < 1:
+            raise ValueError(
+                'proc_cnt and min_procs must be at least 1, received ' +
+                f'{proc_cnt} and {min_procs}'
+            )
+        if max_procs < min_procs:
+            raise ValueError(
+                f'max_procs must be at least min_procs, received {max_procs}')
+
+        if autoscale:
+            proc_cnt = max(min_procs, min(max_procs, proc_cnt))
+
+        self.proc_cnt = proc_cnt
+        self.names = names
+        self.retries = retries
+        self.task_timeout = task_timeout
+        self.log_forward = log_forward
+        self.autoscale = autoscale
+        self.min_procs = min_procs
+        self.max_procs = max_procs
+        self.scale_interval = scale_interval
+        self.scale_load = scale_load
+        self.idle_timeout = idle_timeout
+        self.warm = warm
+        self.initializer = initializer
+        self.initargs = initargs
+
+        # Worker name -> task ID of the chunk it is running.
+        self._busy = {}
+        # Worker name -> time it last finished a chunk or started.
+        self._idle_since = {}
+        # Names of workers told to stop by autoscaling.
+        self._retiring = set()
+        # Time of the last autoscaling decision.
+        self._scale_time = time.time()
+        # Per item latency moving average, and its value at the last grow.
+        self._latency = None
+        self._scale_latency = None
+        # Task ID -> [worker process data, chunk, send time]
+        # Chunk entries: [index, item, attempts]. None once the run that
+        # sent the chunk has ended.
+        self._tasks = {}
+        # Task timeout heap: [deadline, task ID]
+        self._deadlines = []
+        self._task_ids = itertools.count()
+        self._worker_ids = itertools.count()
+        self._closed = False
+
+        self.workers = None
+        self._add_workers(proc_cnt)
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, *exc) -> bool:
+
+        self.close()
+        return False
+
+    def close(self) -> None:
+
+        """
+        Stop the worker processes once they finish their current chunk and
+        wait for them to exit.
+        """
+
+        if self._closed:
+            return
+        self._closed = True
+
+        for proc_data in self.workers.procs:
+            try:
+                proc_data[2].send(None)
+            except OSError:
+                pass
+
+        # Results of abandoned chunks are read and discarded so workers
+        # don't block sending them.
+        while self.workers.procs:
+            for proc_data in self.workers.wait_any():
+                if not self.workers._collect(proc_data[0]):
+                    try:
+                        proc_data[1].recv()
+                    except EOFError:
+                        pass
+            self.workers.check()
+
+    def imap_unordered(self, func, items, chunk_size: int = None):
+
+        """
+        Generator returning the results of a function over work items as
+        they finish.
+
+            for rows in workers.imap_unordered(parse_slice, slices):
+                ...
+
+        Parameters:
+
+            func (obj): Function called with each item.
+            items (iterable): Work items. Read only as workers are free.
+            chunk_size (int): Items sent to a worker at a time. Default:
+                Items split into 4 chunks per worker if `items` has a
+                length, otherwise 1.
+
+        Return:
+
+            generator: `func` return values in completion order.
+
+        Raises:
+
+            TypeError: chunk_size not an int.
+            ValueError: chunk_size less than 1.
+            RuntimeError: An item failed after all retries, or the pool is
+                closed.
+        """
+
+        for index, result in self._run(func, items, chunk_size):
+            yield result
+
+    def map(self, func, items, chunk_size: int = None) -> list:
+
+        """
+        Run a function over work items and return the results in order.
+
+            results = workers.map(lookup_ptr, ips)
+
+        Parameters:
+
+            func (obj): Function called with each item.
+            items (iterable): Work items. Read only as workers are free.
+            chunk_size (int): Items sent to a worker at a time. Default:
+                Items split into 4 chunks per worker if `items` has a
+                length, otherwise 1.
+
+        Return:
+
+            list: `func` return values in `items` order.
+
+        Raises:
+
+            TypeError: chunk_size not an int.
+            ValueError: chunk_size less than 1.
+            RuntimeError: An item failed after all retries, or the pool is
+                closed.
+        """
+
+        results = dict(self._run(func, items, chunk_size))
+
+        return [results[i] for i in range(len(results))]
+
+    def stats(self) -> dict:
+
+        """
+        Resource usage of the worker processes, including workers that
+        have been replaced or retired. Only the latest `stats_keep` exited
+        workers are kept.
+
+            log.log(clintosaurous.multiprocessing.stats_table(
+                workers.stats()))
+
+        Return:
+
+            dict: Worker name -> usage dict. See `start.stats()`. `tasks` and
+                `items` are the chunks and work items each worker ran.
+        """
+
+        return self.workers.stats()
+
+    def _add_workers(self, proc_cnt: int) -> None:
+
+        """
+        Launch more worker processes.
+
+        Internal only function and should not be called directly.
+        """
+
+        workers = start(
+            _pool_worker, proc_cnt,
+            names=[self._worker_name() for i in range(proc_cnt)],
+            timeout=0, log_forward=self.log_forward, warm=self.warm,
+            initializer=self.initializer, initargs=self.initargs
+        )
+
+        now = time.time()
+        for proc_data in workers.procs:
+            self._idle_since[proc_data[0].name] = now
+
+        for record in workers._stats.values():
+            record['tasks'] = 0
+            record['items'] = 0
+
+        if self.workers is None:
+            self.workers = workers
+        else:
+            self.workers.procs += workers.procs
+            self.workers._stats.update(workers._stats)
+            _stats_prune(self.workers._stats)
+
+    def _failed(self, name: str, entry: list, error: str, retry) -> None:
+
+        """
+        Queue a failed item for retry, or fail the run when it is out of
+        retries.
+
+        Internal only function and should not be called directly.
+        """
+
+        if entry[2] >= self.retries:
+            raise RuntimeError(
+                f'{name}: Task failed after {entry[2] + 1} attempts:\n{error}')
+
+        entry[2] += 1
+        log.wrn(
+            f'{name}: Task failed, retry {entry[2]} of {self.retries}:\n' +
+            error
+        )
+        retry.append(entry)
+
+    def _kill_timed_out(self) -> None:
+
+        """
+        Kill workers running a chunk longer than `task_timeout`. The chunk is
+        retried when the worker exit is seen.
+
+        Internal only function and should not be called directly.
+        """
+
+        now = time.time()
+        while self._deadlines and self._deadlines[0][0] <= now:
+            task = self._tasks.get(heapq.heappop(self._deadlines)[1])
+            if task is not None and not self.workers._collect(task[0][0]):
+                log.wrn(f'{task[0][0].name}: Task timeout exceeded, killing!')
+                task[0][0].kill()
+
+    def _replace(self, proc_data: list, retry) -> int:
+
+        """
+        Replace an exited worker and retry the chunk it was running.
+
+        Internal only function and should not be called directly.
+
+        Return:
+
+            int: Task ID of the chunk the worker was running. None if idle.
+        """
+
+        proc = proc_data[0]
+        self.workers._collect(proc, True)
+        # Only this worker. Other exited workers are replaced when their
+        # pipes are read, or their chunks would never be retried.
+        self.workers._reap([proc_data])
+        self._idle_since.pop(proc.name, None)
+
+        if proc.name in self._retiring:
+            self._retiring.discard(proc.name)
+        elif not self._closed:
+            self._add_workers(1)
+
+        task_id = self._busy.pop(proc.name, None)
+        if task_id is None:
+            return None
+
+        chunk = self._tasks.pop(task_id)[1]
+        for entry in chunk or []:
+            self._failed(
+                proc.name, entry,
+                f'Worker exited with exit code {proc.exitcode}', retry
+            )
+
+        return task_id
+
+    def _results(self, proc_data: list, reply: list, retry) -> list:
+
+        """
+        Process the results of a chunk from a worker.
+
+        Internal only function and should not be called directly.
+
+        Return:
+
+            list: [index, result] of each successful item.
+        """
+
+        task_id, results = reply
+        self._busy.pop(proc_data[0].name, None)
+        chunk, send_time = self._tasks.pop(task_id)[1:]
+
+        record = self.workers._stats.get(proc_data[0].name)
+        if record is not None:
+            record['tasks'] += 1
+            record['items'] += len(results)
+
+        now = time.time()
+        self._idle_since[proc_data[0].name] = now
+        latency = (now - send_time) / max(1, len(results))
+        if self._latency is None:
+            self._latency = latency
+        else:
+            self._latency = self._latency * 0.8 + latency * 0.2
+
+        # Chunk from an ended run.
+        if chunk is None:
+            return []
+
+        done = []
+        for entry, [status, value] in zip(chunk, results):
+            if status == 'ok':
+                done.append([entry[0], value])
+            else:
+                self._failed(proc_data[0].name, entry, value, retry)
+
+        return done
+
+    def _run(self, func, items, chunk_size: int):
+
+        """
+        Generator running a function over work items on the workers.
+
+        Internal only function and should not be called directly.
+
+        Return:
+
+            generator: [index, result] of each item in completion order.
+        """
+
+        # Type hints.
+        if chunk_size is not None and (
+            isinstance(chunk_size, bool) or not isinstance(chunk_size, int)
+        ):
+            raise TypeError(
+                f'chunk_size expected `int`, received {type(chunk_size)}')
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError(
+                f'chunk_size must be at least 1, received {chunk_size}')
+        if self._closed:
+            raise RuntimeError('Worker pool is closed')
+
+        if chunk_size is None:
+            try:
+                chunk_size = max(
+                    1, -(-len(items) // (len(self.workers.procs) * 4)))
+            except TypeError:
+                chunk_size = 1
+
+        items = enumerate(items)
+        exhausted = False
+        # Failed items waiting for a worker: [index, item, attempts]
+        retry = collections.deque()
+        # Task IDs of chunks sent by this run that have not returned.
+        running = set()
+
+        try:
+            while True:
+                # Send chunks to idle workers.
+                for proc_data in list(self.workers.procs):
+                    if (
+                        proc_data[0].name in self._busy or
+                        proc_data[0].name in self._retiring
+                    ):
+                        continue
+
+                    chunk = []
+                    while retry and len(chunk) < chunk_size:
+                        chunk.append(retry.popleft())
+                    while not exhausted and len(chunk) < chunk_size:
+                        try:
+                            index, item = next(items)
+                        except StopIteration:
+                            exhausted = True
+                            break
+                        chunk.append([index, item, 0])
+                    if not chunk:
+                        break
+
+                    task_id = self._send(proc_data, func, chunk, retry)
+                    if task_id is not None:
+                        running.add(task_id)
+
+                if exhausted and not retry and not running:
+                    return
+
+                # Scaled after sending so idle workers are only those
+                # without work to run.
+                if self.autoscale:
+                    self._scale(bool(retry) or not exhausted)
+
+                # Wait for results, a worker exit, or a task timeout.
+                wait = self._task_wait_time()
+                if self.autoscale:
+                    wait = min(
+                        wait or self.scale_interval, self.scale_interval)
+                ready = self.workers.wait_any(wait)
+                self._kill_timed_out()
+
+                for proc_data in ready:
+                    try:
+                        reply = proc_data[1].recv()
+                    except EOFError:
+                        running.discard(self._replace(proc_data, retry))
+                        continue
+                    running.discard(reply[0])
+                    yield from self._results(proc_data, reply, retry)
+
+        finally:
+            # Results still to come from this run are discarded.
+            for task_id in running:
+                if task_id in self._tasks:
+                    self._tasks[task_id][1] = None
+
+    def _retire(self, proc_data: list) -> None:
+
+        """
+        Stop a worker once it finishes its current chunk.
+
+        Internal only function and should not be called directly.
+        """
+
+        self._retiring.add(proc_data[0].name)
+        try:
+            proc_data[2].send(None)
+        except OSError:
+            pass
+
+    def _scale(self, waiting: bool) -> None:
+
+        """
+        Grow or shrink the workers for autoscale.
+
+        Internal only function and should not be called directly.
+
+        Parameters:
+
+            waiting (bool): Work is waiting for a worker.
+        """
+
+        now = time.time()
+        if now - self._scale_time < self.scale_interval:
+            return
+        self._scale_time = now
+
+        active = [
+            proc_data for proc_data in self.workers.procs
+            if proc_data[0].name not in self._retiring
+        ]
+        idle = [
+            proc_data for proc_data in active
+            if proc_data[0].name not in self._busy
+        ]
+        proc_cnt = len(active)
+        load = os.getloadavg()[0] / mp.cpu_count()
+        latency = self._latency
+        slower = (
+            latency is not None and self._scale_latency is not None and
+            latency > self._scale_latency * 1.5
+        )
+        if latency is None:
+            stats = f'load {load:.2f}/cpu, latency -'
+        else:
+            stats = f'load {load:.2f}/cpu, latency {latency:.3f}s'
+
+        if waiting and not idle and proc_cnt < self.max_procs:
+            if load >= self.scale_load or slower:
+                log.dbg(
+                    f'{self.names} pool: Holding at {proc_cnt} workers, ' +
+                    stats
+                )
+                return
+            add_cnt = min(max(1, proc_cnt // 2), self.max_procs - proc_cnt)
+            log.log(
+                f'{self.names} pool: Growing {proc_cnt} -> ' +
+                f'{proc_cnt + add_cnt} workers, work waiting, {stats}'
+            )
+            self._scale_latency = latency
+            self._add_workers(add_cnt)
+            return
+
+        if load >= self.scale_load and slower and proc_cnt > self.min_procs:
+            # Idle workers first.
+            proc_data = (idle or active)[-1]
+            log.log(
+                f'{self.names} pool: Shrinking {proc_cnt} -> ' +
+                f'{proc_cnt - 1} workers, overloaded, {stats}'
+            )
+            self._scale_latency = latency
+            self._retire(proc_data)
+            return
+
+        if waiting:
+            return
+
+        expired = [
+            proc_data for proc_data in idle
+            if now - self._idle_since.get(proc_data[0].name, now) >=
+            self.idle_timeout
+        ][:proc_cnt - self.min_procs]
+        if expired:
+            log.log(
+                f'{self.names} pool: Shrinking {proc_cnt} -> ' +
+                f'{proc_cnt - len(expired)} workers, idle, {stats}'
+            )
+            for proc_data in expired:
+                self._retire(proc_data)
+
+    def _send(self, proc_data: list, func, chunk: list, retry) -> int:
+
+        """
+        Send a chunk of items to an idle worker.
+
+        Internal only function and should not be called directly.
+
+        Return:
+
+            int: Task ID of the chunk. None if the worker has exited, in
+                which case the chunk is put back on the retry queue.
+        """
+
+        task_id = next(self._task_ids)
+        try:
+            proc_data[2].send([task_id, func, [entry[1] for entry in chunk]])
+        except OSError:
+            retry.extendleft(reversed(chunk))
+            return None
+
+        self._busy[proc_data[0].name] = task_id
+        self._tasks[task_id] = [proc_data, chunk, time.time()]
+        if self.task_timeout:
+            heapq.heappush(
+                self._deadlines, [time.time() + self.task_timeout, task_id])
+
+        return task_id
+
+    def _task_wait_time(self) -> float:
+
+        """
+        Seconds until the next task timeout. None if no task has a timeout.
+
+        Internal only function and should not be called directly.
+        """
+
+        if not self._deadlines:
+            return None
+
+        return max(0, self._deadlines[0][0] - time.time())
+
+    def _worker_name(self) -> str:
+
+        """
+        Next worker process name.
+
+        Internal only function and should not be called directly.
+        """
+
+        return f'{self.names} {next(self._worker_ids)}'
+
+
+def run_partitions(
+    target, partitions: list, timeout: int = 3600, log_forward: bool = False
+) -> list:
+
+    """
+    Run a function on each partition of the work in its own child process and
+    return the results to the parent process.
+
+        slices = clintosaurous.datetime.time_slices(start, end, 4)
+        results = clintosaurous.multiprocessing.run_partitions(
+            query_slice, slices)
+
+    Unlike `start()` targets, `target` is called with only the partition and
+    its return value is sent back to the parent. Child processes must open
+    their own database connections and other resources. Return values must
+    be picklable.
+
+    Parameters:
+
+        target (obj): Function called with a single partition.
+        partitions (list): Partitions of the work. One child process is
+            launched per partition.
+        timeout (int): Amount of time in seconds to wait for all results
+            before the remaining child processes are killed. Set to 0 for no
+            timeout. Default: 3600 (1 hour)
+        log_forward (bool): Forward child process log messages to the parent
+            process. Default: False
+
+    Return:
+
+        list: `target` return values in `partitions` order.
+
+    Raises:
+
+        TypeError: partitions not a list.
+        TypeError: timeout not an int.
+        RuntimeError: A child process raised an exception or exited without
+            returning a result.
+        TimeoutError: Results not received within `timeout`.
+    """
+
+    # Type hints.
+    if not isinstance(partitions, list):
+        raise TypeError(
+            f'partitions expected `list`, received {type(partitions)}')
+    if not isinstance(timeout, int):
+        raise TypeError(f'timeout expected `int`, received {type(timeout)}')
+
+    if not partitions:
+        return []
+
+    procs = start(
+        functools.partial(_partition_child, target),
+        proc_cnt=len(partitions),
+        names=[f'Partition {i}' for i in range(len(partitions))],
+        timeout=timeout, log_forward=log_forward
+    )
+
+    for proc_data, partition in zip(procs.procs, partitions):
+        proc_data[2].send(partition)
+
+    results = []
+    try:
+        for proc_data in procs.procs:
+            proc, from_child_pipe = proc_data[:2]
+
+            if timeout:
+                wait = max(0, proc_data[3] + timeout - time.time())
+            else:
+                wait = None
+            if not from_child_pipe.poll(wait):
+                raise TimeoutError(f'{proc.name}: Timeout exceeded')
+
+            try:
+                status, result = from_child_pipe.recv()
+            except EOFError:
+                procs._collect(proc, True)
+                raise RuntimeError(
+                    f'{proc.name}: Exited without a result, exit code ' +
+                    f'{proc.exitcode}'
+                )
+            if status == 'error':
+                raise RuntimeError(f'{proc.name}: Failed:\n{result}')
+
+            results.append(result)
+
+    except BaseException:
+        for proc_data in procs.procs:
+            if not procs._collect(proc_data[0]):
+                proc_data[0].kill()
+        raise
+
+    finally:
+        procs.check(True)
+
+    return results
+
+
+def share_batch(rows: list, columns: list = None) -> dict:
+
+    """
+    Write a batch of rows to a shared memory segment for the parent process.
+
+    The rows are stored by column. Columns of only integers or only floats
+    are stored as 64 bit arrays and string columns as an index into a table
+    of the unique strings, so each string is only stored once. Other
+    columns are pickled, including integers too large for 64 bits and
+    columns mixing integers and floats, so each value keeps its type. Only
+    the small handle returned is sent over the pipe.
+
+        # Child process.
+        to_parent_pipe.send(
+            clintosaurous.multiprocessing.share_batch(rows, columns))
+
+        # Parent process.
+        with clintosaurous.multiprocessing.shared_batch(
+            from_child_pipe.recv()
+        ) as batch:
+            for row in batch.rows():
+                ...
+
+    The parent process owns the segment once the handle is sent and removes
+    it when the batch is closed. Segments of child processes that are still
+    left at exit are removed by the parent.
+
+    Parameters:
+
+        rows (list): Rows as lists, tuples, or dicts. All rows must have the
+            same columns.
+        columns (list): Column names. Default: The keys of the first row for
+            dict rows, otherwise the column numbers as `str`.
+
+    Return:
+
+        dict: Picklable shared batch handle.
+
+    Raises:
+
+        TypeError: rows not a list.
+        TypeError: columns not a list.
+    """
+
+    # Type hints.
+    if not isinstance(rows, list):
+        raise TypeError(f'rows expected `list`, received {type(rows)}')
+    if columns is not None and not isinstance(columns, list):
+        raise TypeError(f'columns expected `list`, received {type(columns)}')
+
+    # Only imported by scripts that share batches, to keep the module
+    # import time down.
+    from multiprocessing import resource_tracker, shared_memory
+
+    if rows and isinstance(rows[0], dict):
+        if columns is None:
+            columns = list(rows[0])
+        values = [[row[column] for row in rows] for column in columns]
+    else:
+        if rows:
+            values = [list(column_values) for column_values in zip(*rows)]
+        else:
+            values = []
+        if columns is None:
+            columns = [str(i) for i in range(len(values))]
+    if not values:
+        values = [[] for column in columns]
+
+    # Column buffers: [name, kind, data bytes, string table bytes]
+    buffers = []
+    for name, column_values in zip(columns, values):
+        buffers.append([name, *_shm_column(column_values)])
+
+    size = 0
+    for buffer in buffers:
+        for data in buffer[2:]:
+            size += _shm_aligned(len(data))
+
+    shm = shared_memory.SharedMemory(
+        name=f'{shm_prefix}{os.getpid()}_{next(_shm_seq)}', create=True,
+        size=max(1, size)
+    )
+    # The parent process owns the segment once the handle is sent, so it
+    # is not removed when this process exits. POSIX segments are tracked by
+    # their name with the leading slash SharedMemory.name leaves off.
+    if os.name == 'posix':
+        resource_tracker.unregister(f'/{shm.name}', 'shared_memory')
+
+    handle = {"name": shm.name, "rows": len(rows), "columns": []}
+    offset = 0
+    for name, kind, data, table in buffers:
+        column = [name, kind]
+        for buffer in [data, table]:
+            shm.buf[offset:offset + len(buffer)] = buffer
+            column += [offset, len(buffer)]
+            offset += _shm_aligned(len(buffer))
+        handle["columns"].append(column)
+
+    shm.close()
+
+    return handle
+
+
+class shared_batch:
+
+    """
+    Batch of rows in a shared memory segment written by share_batch().
+
+        with clintosaurous.multiprocessing.shared_batch(handle) as batch:
+            total = sum(batch.columns["count"])
+
+    Integer and float columns are `memoryview`s of the shared memory, so
+    they are not copied. String columns are lists of references to a
+    single copy of each unique string. Copy any values kept after the
+    batch is closed.
+
+    Attributes:
+
+        name (str): Shared memory segment name.
+        row_cnt (int): Number of rows.
+        columns (dict): Column name -> column values.
+    """
+
+    def __init__(self, handle: dict):
+
+        """
+        Open a shared batch from its handle.
+
+        Parameters:
+
+            handle (dict): Handle returned by share_batch().
+
+        Raises:
+
+            TypeError: handle not a dict.
+        """
+
+        # Type hints.
+        if not isinstance(handle, dict):
+            raise TypeError(f'handle expected `dict`, received {type(handle)}')
+
+        self.name = handle["name"]
+        self.row_cnt = handle["rows"]
+        self.columns = {}
+
+        # Only imported by scripts that share batches.
+        from multiprocessing import shared_memory
+        import pickle
+
+        self._shm = shared_memory.SharedMemory(name=self.name)
+        _shm_attached[self.name] = self
+
+        buf = self._shm.buf
+        for name, kind, offset, size, table_offset, table_size in \
+                handle["columns"]:
+            data = buf[offset:offset + size]
+            if kind in ['q', 'd']:
+                self.columns[name] = data.cast(kind)
+                continue
+
+            table = pickle.loads(buf[table_offset:table_offset + table_size])
+            if kind == 's':
+                indexes = data.cast('I')
+                self.columns[name] = [table[i] for i in indexes]
+                indexes.release()
+            else:
+                self.columns[name] = table
+            data.release()
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, *exc) -> bool:
+
+        self.close()
+        return False
+
+    def close(self) -> None:
+
+        """
+        Release the batch and remove its shared memory segment.
+
+        Raises:
+
+            BufferError: Views of the integer or float columns are still in
+                use.
+        """
+
+        if self._shm is None:
+            return
+
+        for values in self.columns.values():
+            if isinstance(values, memoryview):
+                values.release()
+        self.columns = {}
+
+        self._shm.close()
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+        _shm_attached.pop(self.name, None)
+        self._shm = None
+
+    def rows(self, dicts: bool = False):
+
+        """
+        Generator returning the rows of the batch.
+
+        Parameters:
+
+            dicts (bool): Return rows as dicts instead of tuples.
+                Default: False
+
+        Return:
+
+            generator: Rows.
+        """
+
+        names = list(self.columns)
+        for row in zip(*self.columns.values()):
+            if dicts:
+                yield dict(zip(names, row))
+            else:
+                yield row
+
+
+def stats_table(stats: dict = None) -> str:
+
+    """
+    Text table of child resource usage.
+
+        log.log('Worker usage:\n' + clintosaurous.multiprocessing.stats_table(
+            processes.stats()))
+
+    CPU % is the CPU time of the child over its run time. A low CPU % with
+    many involuntary context switches means the child was waiting on a
+    processor. A low CPU % with many voluntary context switches means it
+    was waiting on I/O. Usage is `final` for the final usage from the
+    kernel, or `sampled` for the last /proc sample.
+
+    Parameters:
+
+        stats (dict): Child name -> usage dict from `start.stats()` or
+            `pool.stats()`. Default: All children started by this process,
+            up to the latest `stats_keep` exited children.
+
+    Return:
+
+        str: Text table. Empty if there are no children.
+
+    Raises:
+
+        TypeError: stats not a dict.
+    """
+
+    # Type hints.
+    if stats is not None and not isinstance(stats, dict):
+        raise TypeError(f'stats expected `dict`, received {type(stats)}')
+
+    # Only needed for the report, so not imported with the module.
+    import clintosaurous.text
+
+    if stats is None:
+        records = _proc_stats
+    else:
+        records = stats.values()
+    if not records:
+        return ''
+
+    rows = [[
+        'Name', 'PID', 'Run', 'User', 'System', 'CPU %', 'Max RSS',
+        'Vol CS', 'Invol CS', 'Threads', 'Tasks', 'Items', 'Exit', 'Usage'
+    ]]
+    for record in records:
+        cpu_secs = record['user_secs'] + record['system_secs']
+        if record['run_secs']:
+            cpu_pct = f'{cpu_secs / record["run_secs"] * 100:.1f}'
+        else:
+            cpu_pct = '-'
+        row = [
+            record['name'], str(record['pid']),
+            f'{record["run_secs"]:.1f}s', f'{record["user_secs"]:.2f}s',
+            f'{record["system_secs"]:.2f}s', cpu_pct
+        ]
+        for key in [
+            'max_rss_kb', 'voluntary_switches', 'involuntary_switches',
+            'max_threads', 'tasks', 'items', 'exitcode'
+        ]:
+            if record[key] is None:
+                row.append('-')
+            elif key == 'max_rss_kb':
+                row.append(f'{record[key]:,} KB')
+            else:
+                row.append(f'{record[key]:,}')
+        row.append('final' if record['rusage'] else 'sampled')
+        rows.append(row)
+
+    return clintosaurous.text.table(rows)
+
+
+def warm_context(preload: list = None):
+
+    """
+    Forkserver context for warm worker processes.
+
+    Child processes are forked from a server process that has already
+    imported the clintosaurous modules imported by the parent,
+    `forkserver_preload`, and `preload`. They start without paying the
+    import time again and without the parent memory a fork copies.
+
+        context = clintosaurous.multiprocessing.warm_context(['pysnmp.hlapi'])
+
+    The modules are only preloaded when the forkserver starts with the first
+    warm child process. Later `preload` modules are ignored.
+
+    Parameters:
+
+        preload (list): More module names to preload.
+
+    Return:
+
+        multiprocessing.context.ForkServerContext: Forkserver context. The
+            default context if the forkserver is not available.
+
+    Raises:
+
+        TypeError: preload not a list.
+    """
+
+    # Type hints.
+    if preload is not None and not isinstance(preload, list):
+        raise TypeError(f'preload expected `list`, received {type(preload)}')
+
+    global _warm_context
+
+    if _warm_context is not None:
+        return _warm_context
+
+    if 'forkserver' not in mp.get_all_start_methods():
+        log.wrn('forkserver start method not available, using default')
+        _warm_context = mp.get_context()
+        return _warm_context
+
+    modules = sorted(
+        name for name in sys.modules if name.startswith('clintosaurous.'))
+    modules += forkserver_preload + (preload or [])
+    log.dbg(f'clintosaurous.multiprocessing: forkserver preload: {modules}')
+
+    _warm_context = mp.get_context('forkserver')
+    _warm_context.set_forkserver_preload(modules)
+
+    return _warm_context
+
+
+def _partition_child(
+    target, name: str, from_parent_pipe, to_parent_pipe
+) -> None:
+
+    """
+    Child process entry point for run_partitions().
+
+    Internal only function and should not be called directly.
+    """
+
+    partition = from_parent_pipe.recv()
+    try:
+        result = ['ok', target(partition)]
+    except Exception:
+        # Only imported on failure to keep the module import time down.
+        import traceback
+        result = ['error', traceback.format_exc()]
+    to_parent_pipe.send(result)
+
+
+def _pool_worker(name: str, from_parent_pipe, to_parent_pipe) -> None:
+
+    """
+    Worker process entry point for pool.
+
+    Runs chunks of items until told to stop or the parent exits. Each item
+    result is returned as ['ok', result] or ['error', traceback].
+
+    Internal only function and should not be called directly.
+    """
+
+    while True:
+        try:
+            task = from_parent_pipe.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+
+        task_id, func, items = task
+        results = []
+        for item in items:
+            try:
+                results.append(['ok', func(item)])
+            except Exception:
+                import traceback
+                results.append(['error', traceback.format_exc()])
+        to_parent_pipe.send([task_id, results])
+
+
+def _shm_aligned(size: int) -> int:
+
+    """
+    Size rounded up to 8 bytes so each column buffer is aligned.
+
+    Internal only function and should not be called directly.
+    """
+
+    return (size + 7) // 8 * 8
+
+
+def _shm_column(values: list) -> list:
+
+    """
+    Encode a column for share_batch().
+
+    Internal only function and should not be called directly.
+
+    Return:
+
+        list: Kind, data bytes, and string table bytes. Kind is `q` for
+            64 bit integer, `d` for 64 bit float, `s` for string indexes
+            into the pickled string table, or `o` for a pickled list.
+    """
+
+    import pickle
+
+    types = set(map(type, values))
+
+    if types <= {int}:
+        try:
+            return ['q', array.array('q', values).tobytes(), b'']
+        except OverflowError:
+            pass
+
+    # Mixed with integers, which a float array would convert.
+    elif types == {float}:
+        return ['d', array.array('d', values).tobytes(), b'']
+
+    elif types == {str}:
+        # Unique strings in first seen order.
+        table = {}
+        for value in values:
+            if value not in table:
+                table[value] = len(table)
+        if len(table) < 2 ** 32:
+            return [
+                's',
+                array.array('I', map(table.__getitem__, values)).tobytes(),
+                pickle.dumps(list(table), pickle.HIGHEST_PROTOCOL)
+            ]
+
+    return ['o', b'', pickle.dumps(values, pickle.HIGHEST_PROTOCOL)]
+
+
+def __getattr__(name: str):
+
+    """
+    Module attributes looked up on access.
+
+    `worker_state` is the `initializer` return value of the calling worker
+    process or clintosaurous.threadpool worker thread, or None.
+
+    Internal only function and should not be called directly.
+    """
+
+    if name == 'worker_state':
+        return getattr(_worker_local, 'worker_state', None)
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def _child_start(
+    target, log_queue: mp.Queue, initializer, initargs: tuple, cli_opts,
+    *args
+) -> None:
+
+    """
+    Child process entry point when log forwarding, warm workers, or an
+    initializer are used.
+
+    Internal only function and should not be called directly.
+
+    Parameters:
+
+        target (obj): Function or class the child process will execute.
+        log_queue (multiprocessing.Queue): Parent process log sink queue.
+            None if log messages are not forwarded.
+        initializer (obj): Function building the worker state. None for no
+            initializer.
+        initargs (tuple|list): Arguments passed to `initializer`.
+        cli_opts (argparse.Namespace): Parent process CLI options. None if
+            inherited.
+        args: Arguments passed on to `target`.
+    """
+
+    if cli_opts is not None:
+        # Saves reparsing the CLI options in forkserver children.
+        clintosaurous.opts._cli_opts = cli_opts
+    if log_queue is not None:
+        log.forward_to(log_queue)
+    if initializer is not None:
+        _worker_local.worker_state = initializer(*initargs)
+
+    target(*args)
+
+
+def _stats_atexit() -> None:
+
+    """
+    Log the resource usage of all children on exit for `--proc-stats`.
+
+    Internal only function and should not be called directly.
+    """
+
+    for record in _proc_stats:
+        if record['running']:
+            _stats_sample(record, f'/proc/{record["pid"]}')
+
+    log.log('Child process resource usage:\n' + stats_table())
+
+
+def _stats_collect(proc, record: dict, block: bool = False) -> bool:
+
+    """
+    Record the exit and final resource usage of a child.
+
+    os.waitid() with WNOWAIT checks for the exit without reaping the child,
+    so multiprocessing still reaps it with join(). The growth of the
+    RUSAGE_CHILDREN totals across the join() is the usage of the child.
+    This has to run before anything else reaps the child, such as
+    is_alive(), or Process.start(), which reaps all exited children. See
+    _stats_collect_exited().
+
+    Internal only function and should not be called directly.
+
+    Parameters:
+
+        proc (multiprocessing.Process): Child process.
+        record (dict): Resource usage record of the child.
+        block (bool): Wait for the child to exit.
+
+    Return:
+
+        bool: The child has exited.
+    """
+
+    flags = os.WEXITED | os.WNOWAIT
+    if not block:
+        flags |= os.WNOHANG
+    try:
+        exited = os.waitid(os.P_PID, proc.pid, flags)
+    # Already reaped, or a forkserver child, which the forkserver reaps.
+    except ChildProcessError:
+        exited = False
+
+    # The sentinel closes as the child exits, just before it can be waited
+    # on. Waiting then keeps callers woken by the sentinel from spinning.
+    if exited is None:
+        if not mp.connection.wait([proc.sentinel], 0):
+            return False
+        exited = os.waitid(os.P_PID, proc.pid, os.WEXITED | os.WNOWAIT)
+
+    if exited:
+        before = resource.getrusage(resource.RUSAGE_CHILDREN)
+        proc.join()
+        _stats_rusage(
+            record, before, resource.getrusage(resource.RUSAGE_CHILDREN))
+
+    else:
+        if block:
+            proc.join()
+        if proc.is_alive():
+            return False
+
+    _stats_running.pop(proc, None)
+    record['running'] = False
+    record['exitcode'] = proc.exitcode
+    record['run_secs'] = time.time() - record['start_time']
+
+    return True
+
+
+def _stats_collect_exited() -> None:
+
+    """
+    Collect the final usage of forked children that have exited, before
+    Process.start() reaps them.
+
+    A child that has exited has closed its sentinel, so the ones to wait on
+    are found without a system call per child.
+
+    Internal only function and should not be called directly.
+    """
+
+    if not _stats_running:
+        return
+
+    procs = {proc.sentinel: proc for proc in _stats_running}
+    for sentinel in mp.connection.wait(list(procs), 0):
+        proc = procs[sentinel]
+        _stats_collect(proc, _stats_running[proc], True)
+
+
+def _stats_record(name: str, pid: int, start_time: float) -> dict:
+
+    """
+    Create the resource usage record of a child.
+
+    Internal only function and should not be called directly.
+    """
+
+    record = {
+        'name': name,
+        'pid': pid,
+        'running': True,
+        'exitcode': None,
+        'start_time': start_time,
+        'run_secs': 0.0,
+        'user_secs': 0.0,
+        'system_secs': 0.0,
+        'max_rss_kb': None,
+        'voluntary_switches': None,
+        'involuntary_switches': None,
+        'threads': None,
+        'max_threads': None,
+        'tasks': None,
+        'items': None,
+        'rusage': False,
+    }
+    _proc_stats.append(record)
+
+    return record
+
+
+def _stats_register() -> None:
+
+    """
+    Register the `--proc-stats` exit report with the first child started.
+
+    Internal only function and should not be called directly.
+    """
+
+    global _proc_stats_registered
+
+    if _proc_stats_registered:
+        return
+    _proc_stats_registered = True
+
+    if getattr(clintosaurous.opts.cli(), 'proc_stats', False):
+        atexit.register(_stats_atexit)
+
+
+def _stats_interval() -> float:
+
+    """
+    Seconds between periodic /proc samples of running children. None if
+    they are only sampled when stats() is called.
+
+    Internal only function and should not be called directly.
+    """
+
+    if stats_interval is not None:
+        return stats_interval
+    if getattr(clintosaurous.opts.cli(), 'proc_stats', False):
+        return 1.0
+
+    return None
+
+
+def _stats_prune(stats: dict) -> None:
+
+    """
+    Drop the oldest records of exited children past `stats_keep` from the
+    records of a start() or pool(), and from the exit report.
+
+    Internal only function and should not be called directly.
+
+    Parameters:
+
+        stats (dict): Child name -> usage record.
+    """
+
+    if len(stats) > stats_keep:
+        exited = [
+            name for name, record in stats.items() if not record['running']
+        ]
+        for name in exited[:len(stats) - stats_keep]:
+            del stats[name]
+
+    if len(_proc_stats) > stats_keep:
+        exited = [record for record in _proc_stats if not record['running']]
+        drop = {
+            id(record) for record in exited[:len(_proc_stats) - stats_keep]
+        }
+        _proc_stats[:] = [
+            record for record in _proc_stats if id(record) not in drop
+        ]
+
+
+def _stats_rusage(record: dict, before, after) -> None:
+
+    """
+    Update a resource usage record with the RUSAGE_CHILDREN growth across
+    reaping the child.
+
+    Internal only function and should not be called directly.
+    """
+
+    record['user_secs'] = after.ru_utime - before.ru_utime
+    record['system_secs'] = after.ru_stime - before.ru_stime
+    record['voluntary_switches'] = after.ru_nvcsw - before.ru_nvcsw
+    record['involuntary_switches'] = after.ru_nivcsw - before.ru_nivcsw
+    # ru_maxrss is the peak of the largest child reaped, so it is only the
+    # peak of this child if it grew. Otherwise the sampled peak is kept.
+    # Linux reports it in KB.
+    if after.ru_maxrss > before.ru_maxrss:
+        record['max_rss_kb'] = after.ru_maxrss
+    record['rusage'] = True
+
+
+def _stats_sample(record: dict, path: str, thread: bool = False) -> bool:
+
+    """
+    Update a resource usage record from /proc.
+
+    Internal only function and should not be called directly.
+
+    Parameters:
+
+        record (dict): Resource usage record.
+        path (str): /proc directory of the process or thread.
+        thread (bool): `path` is a thread directory. The peak RSS and thread
+            count are of the whole process, so they are not recorded.
+
+    Return:
+
+        bool: False if the process or thread is gone.
+    """
+
+    try:
+        with open(f'{path}/stat') as f:
+            stat = f.read()
+        with open(f'{path}/status') as f:
+            status = f.read()
+    except OSError:
+        return False
+
+    # Fields after the command name, which can contain spaces. utime,
+    # stime, and num_threads are fields 14, 15, and 20.
+    fields = stat[stat.rindex(')') + 2:].split()
+    record['user_secs'] = int(fields[11]) / _clk_tck
+    record['system_secs'] = int(fields[12]) / _clk_tck
+    if not thread:
+        record['threads'] = int(fields[17])
+        record['max_threads'] = max(
+            record['max_threads'] or 0, record['threads'])
+    record['run_secs'] = time.time() - record['start_time']
+
+    for line in status.splitlines():
+        key, _, value = line.partition(':')
+        if key == 'VmHWM' and not thread:
+            record['max_rss_kb'] = max(
+                record['max_rss_kb'] or 0, int(value.split()[0]))
+        elif key == 'voluntary_ctxt_switches':
+            record['voluntary_switches'] = int(value)
+        elif key == 'nonvoluntary_ctxt_switches':
+            record['involuntary_switches'] = int(value)
+
+    return True
+
+
+def _kill_on_exit() -> None:
+
+    """
+    Kill all running child processes on exit.
+
+    Internal only function and should not be called directly.
+    """
+
+    import glob
+
+    for proc in _all_procs:
+        if proc.is_alive():
+            proc.kill()
+
+    # Shared batches not closed by the parent, and those children wrote but
+    # never handed to the parent.
+    for batch in list(_shm_attached.values()):
+        try:
+            batch.close()
+        # Views still in use. The segment is still removed.
+        except BufferError:
+            try:
+                batch._shm.unlink()
+            except FileNotFoundError:
+                pass
+    _shm_attached.clear()
+
+    for proc in _all_procs:
+        for path in glob.glob(f'/dev/shm/{shm_prefix}{proc.pid}_*'):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
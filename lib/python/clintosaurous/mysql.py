@@ -5,23 +5,94 @@
 This is intended as an internal module for the Clintosaurous DDI tools.
 
     import clintosaurous.db
+
+Connections can be pooled and reused within a process:
+
+    db_pool = clintosaurous.mysql.get_pool(username=user, passwd=passwd)
+    with db_pool.connection('librenms') as db:
+        cursor = db.cursor()
+
+Queries can be instrumented with the `--db-profile` CLI option or the
+`instrument` connection parameter. Slow queries are logged with their
+`EXPLAIN` output and a summary of the top queries is logged at exit.
 """
 
 
+import array
 import atexit
 import clintosaurous.file
 import clintosaurous.log as log
 import clintosaurous.opts
+import clintosaurous.text
+import collections
+import contextlib
+import csv
+import datetime
+import decimal
+import functools
+import itertools
 import os
-import pymysql
 import re
+import tempfile
+import threading
+import time
 
 
-VERSION = '1.0.0'
-LAST_UPDATE = '2023-01-18'
+VERSION = '1.5.3'
+LAST_UPDATE = '2026-10-17'
 
 
 _connections = []
+# Shared connection pools for get_pool().
+_pools = {}
+_pools_lock = threading.Lock()
+# Largest multi-row INSERT statement bulk_load() sends when LOAD DATA LOCAL
+# INFILE can not be used. Also limited by the server max_allowed_packet.
+bulk_insert_bytes = 16 * 1024 * 1024
+# Name suffixes for shadow_table() tables.
+shadow_suffix = '__shadow'
+shadow_old_suffix = '__old'
+# Keys per delete statement for sync_rows().
+sync_delete_batch = 500
+# Instrumented query statistics.
+# Fingerprint -> [count, total seconds, max seconds, rows returned,
+#                 rows affected]
+_query_stats = {}
+# Fingerprints of slow queries already explained.
+_query_explained = set()
+_query_lock = threading.Lock()
+# Instrumented pymysql cursor classes: base class -> subclass.
+_instrumented_classes = {}
+# Exit query summary is registered with the first instrumented connection.
+_query_registered = False
+# Statement fingerprint regular expressions and replacements.
+_fingerprint_subs = [
+    # Quoted strings.
+    [re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.)*\""), '?'],
+    # Placeholders.
+    [re.compile(r'%(?:\(\w+\))?s'), '?'],
+    # Numbers not part of a name.
+    [re.compile(r'(?<![\w`])-?\d+(?:\.\d+)?(?:e[-+]?\d+)?\b', re.I), '?'],
+    # IN lists and VALUES rows.
+    [re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)'), '(?+)'],
+    # Multi-row VALUES.
+    [re.compile(r'\(\?\+\)(?:\s*,\s*\(\?\+\))+'), '(?+)'],
+    [re.compile(r'\s+'), ' ']
+]
+# Raw CSV fields, quoted or not, for _csv_rows().
+_csv_field = re.compile(r'(?:^|,)("(?:[^"]|"")*"|[^,]*)')
+# Table for get_watermark() and set_watermark() in the connection database.
+watermark_table = 'report_watermarks'
+# Instrumented queries at or over this many seconds are logged with their
+# EXPLAIN output. Overridden by --db-slow-query.
+slow_query_secs = 1.0
+# Statements listed in the exit query summary. Overridden by
+# --db-profile-top.
+query_report_top = 20
+# Longest statement text logged for a slow query.
+slow_query_chars = 4096
+# NumPy for fetch_columns(). Imported on first use, False if not installed.
+_numpy_module = None
 
 
 # CLI options.
@@ -62,6 +133,28 @@ _parser_db_group.add_argument(
     type=str
 )
 
+_parser_db_group.add_argument(
+    '--db-profile',
+    help="""
+        Instrument database queries. Queries over the --db-slow-query
+        threshold are logged with their EXPLAIN output, and a summary of the
+        top queries by total time is logged at exit. Default: False
+    """,
+    action="store_true"
+)
+_parser_db_group.add_argument(
+    '--db-slow-query',
+    help="""
+        Seconds an instrumented query can run before it is logged as a slow
+        query. Default: 1
+    """,
+    type=float
+)
+_parser_db_group.add_argument(
+    '--db-profile-top',
+    help='Queries listed in the --db-profile exit summary. Default: 20',
+    type=int
+)
 _parser_db_group.add_argument(
     '--db-ssl',
     help="""
@@ -106,11 +199,640 @@ def _atexit() -> None:
     Close all database connections.
     """
 
+    for db_pool in list(_pools.values()):
+        db_pool.close()
+
     for db in _connections:
         if db.open:
             db.close()
 
 
+def _column_array(type_code: str, values: list):
+
+    """ Typed Column Array for fetch_columns()
+
+    Parameters:
+
+    type_code (str): `q` for integer, `d` for float, or None for objects.
+    values (list): Column values.
+
+    Return:
+
+    numpy.ndarray|array.array|list: Column array.
+
+    Internal only function and should not be called directly.
+    """
+
+    numpy = _numpy()
+
+    if type_code is None:
+        if numpy is None:
+            return values
+        column = numpy.empty(len(values), dtype=object)
+        column[:] = values
+        return column
+
+    # Integers can not hold NULL.
+    if None in values:
+        type_code = 'd'
+        values = [float('nan') if v is None else v for v in values]
+
+    # DECIMAL values are converted through Python to keep full precision
+    # for integers.
+    convert = int if type_code == 'q' else float
+
+    if numpy is None:
+        return array.array(type_code, map(convert, values))
+
+    if type_code == 'q':
+        dtype = numpy.int64
+    else:
+        dtype = numpy.float64
+    return numpy.fromiter(map(convert, values), dtype=dtype, count=len(values))
+
+
+def _column_join(type_code: str, batches: list):
+
+    """ Join the Batch Arrays of a fetch_columns() Column
+
+    Parameters:
+
+    type_code (str): `q` for integer, `d` for float, or None for objects.
+    batches (list): Column arrays from `_column_array()` for each batch.
+
+    Return:
+
+    numpy.ndarray|array.array|list: Column array. An integer column is
+        float if any batch held `NULL`.
+
+    Internal only function and should not be called directly.
+    """
+
+    if not batches:
+        return _column_array(type_code, [])
+    if len(batches) == 1:
+        return batches[0]
+
+    numpy = _numpy()
+    if numpy is not None:
+        return numpy.concatenate(batches)
+
+    if type_code is None:
+        column = []
+        for batch in batches:
+            column.extend(batch)
+        return column
+
+    if any(batch.typecode == 'd' for batch in batches):
+        column = array.array('d')
+    else:
+        column = array.array('q')
+    for batch in batches:
+        if batch.typecode == column.typecode:
+            column.extend(batch)
+        else:
+            column.fromlist(batch.tolist())
+
+    return column
+
+
+def _column_type(field_type, column: tuple) -> str:
+
+    """ Array Type Code of a Result Set Column for fetch_columns()
+
+    Parameters:
+
+    field_type: pymysql.constants.FIELD_TYPE
+    column (tuple): Cursor description entry for the column.
+
+    Return:
+
+    str: `q` for integer, `d` for float, or None for objects.
+
+    Internal only function and should not be called directly.
+    """
+
+    type_code = column[1]
+    if type_code in [
+        field_type.TINY, field_type.SHORT, field_type.LONG,
+        field_type.LONGLONG, field_type.INT24, field_type.YEAR
+    ]:
+        return 'q'
+    if type_code in [field_type.DECIMAL, field_type.NEWDECIMAL]:
+        # Description scale.
+        if column[5] == 0:
+            return 'q'
+        return 'd'
+    if type_code in [field_type.FLOAT, field_type.DOUBLE]:
+        return 'd'
+
+    return None
+
+
+def _csv_rows(f):
+
+    """ Rows of a CSV File Read the Way LOAD DATA Reads Them
+
+    Fields are split by `csv.reader()`. An unquoted `NULL` field is `None`,
+    as `LOAD DATA` loads it as `NULL`. A quoted `"NULL"` is the string.
+
+    Internal only function and should not be called directly.
+    """
+
+    def records():
+        record = ''
+        for line in f:
+            record += line
+            # A quoted field with a line break continues on the next line.
+            if record.count('"') % 2:
+                continue
+            yield record
+            record = ''
+        if record:
+            yield record
+
+    raw_records, reader_records = itertools.tee(records())
+    for record, row in zip(raw_records, csv.reader(reader_records)):
+        if 'NULL' in record:
+            fields = _csv_field.findall(record.rstrip('\r\n'))
+            row = [
+                None if field == 'NULL' else value
+                for field, value in zip(fields, row)
+            ]
+        yield row
+
+
+@functools.lru_cache(maxsize=1024)
+def _fingerprint(sql: str) -> str:
+
+    """ Normalized Statement Fingerprint
+
+    Replaces literals and placeholders with `?`, collapses `IN` lists and
+    multi-row `VALUES` to one entry, and collapses white space, so the same
+    statement with different values has one fingerprint.
+
+    Internal only function and should not be called directly.
+    """
+
+    for regex, replacement in _fingerprint_subs:
+        sql = regex.sub(replacement, sql)
+
+    return sql.strip().lower()
+
+
+def _infile_value(value) -> str:
+
+    """ Format a Value for a LOAD DATA CSV File
+
+    Internal only function and should not be called directly.
+    """
+
+    if value is None:
+        return 'NULL'
+    if isinstance(value, bool):
+        value = int(value)
+    elif isinstance(value, (bytes, bytearray)):
+        value = value.decode()
+
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def _instrumented(cursor_class):
+
+    """ Instrumented Subclass of a pymysql Cursor Class
+
+    Internal only function and should not be called directly.
+    """
+
+    if issubclass(cursor_class, _query_timer):
+        return cursor_class
+
+    with _query_lock:
+        try:
+            return _instrumented_classes[cursor_class]
+        except KeyError:
+            pass
+
+        instrumented = type(
+            f'Instrumented{cursor_class.__name__}',
+            (_query_timer, cursor_class), {}
+        )
+        _instrumented_classes[cursor_class] = instrumented
+
+    return instrumented
+
+
+def _line_end(path: str) -> str:
+
+    """ Detect the Line Terminator of a Text File
+
+    Internal only function and should not be called directly.
+    """
+
+    with open(path, 'rb') as f:
+        line = f.readline()
+
+    return '\r\n' if line.endswith(b'\r\n') else '\n'
+
+
+def _secondary_indexes(create_sql: str) -> list[list]:
+
+    """ Secondary Indexes From SHOW CREATE TABLE Output
+
+    Return:
+
+    list[list]: [quoted index name, index definition] for each index other
+        than the primary key. Foreign key constraints are not included.
+
+    Internal only function and should not be called directly.
+    """
+
+    indexes = []
+    for line in create_sql.splitlines():
+        match = re.match(
+            r'\s*((?:UNIQUE |FULLTEXT |SPATIAL )?KEY (`(?:[^`]|``)+`).*?),?$',
+            line
+        )
+        if match:
+            indexes.append([match.group(2), match.group(1)])
+
+    return indexes
+
+
+def _sync_keyed(
+    existing: list, rows, key_idx: list, counts: dict, upsert: bool = True
+) -> tuple[list, list]:
+
+    """ Compare Keyed Rows for connect.sync_rows()
+
+    Without `upsert`, changed rows are deleted and inserted again, for
+    tables without a unique key on the key columns.
+
+    Return:
+
+    tuple[list, list]: Keys to delete and rows to insert or update.
+
+    Internal only function and should not be called directly.
+    """
+
+    # Normalized key -> existing row.
+    current = {}
+    for row in existing:
+        current[tuple(_sync_value(row[i]) for i in key_idx)] = row
+
+    new = {}
+    for row in rows:
+        new[tuple(_sync_value(row[i]) for i in key_idx)] = row
+
+    deletes = []
+    upserts = []
+    for key, row in new.items():
+        current_row = current.pop(key, None)
+        if current_row is None:
+            counts["inserted"] += 1
+            upserts.append(row)
+        elif (
+            [_sync_value(value) for value in current_row] ==
+            [_sync_value(value) for value in row]
+        ):
+            counts["unchanged"] += 1
+        else:
+            counts["updated"] += 1
+            # Unique keys do not match NULL, so those rows are replaced.
+            if None in key or not upsert:
+                deletes.append([row[i] for i in key_idx])
+            upserts.append(row)
+
+    for key in current:
+        deletes.append([current[key][i] for i in key_idx])
+    counts["deleted"] += len(current)
+
+    return deletes, upserts
+
+
+def _sync_rows(existing: list, rows, counts: dict) -> tuple[list, list]:
+
+    """ Compare Whole Rows for connect.sync_rows()
+
+    Rows are compared as multisets. Rows whose number of copies changed are
+    deleted and inserted again with the new number of copies.
+
+    Return:
+
+    tuple[list, list]: Rows to delete and rows to insert.
+
+    Internal only function and should not be called directly.
+    """
+
+    # Normalized row -> copies, and an original row.
+    current = collections.Counter()
+    current_rows = {}
+    for row in existing:
+        key = tuple(_sync_value(value) for value in row)
+        current[key] += 1
+        current_rows.setdefault(key, row)
+    new = collections.Counter()
+    new_rows = {}
+    for row in rows:
+        key = tuple(_sync_value(value) for value in row)
+        new[key] += 1
+        new_rows.setdefault(key, row)
+
+    deletes = []
+    inserts = []
+    for key in current.keys() | new.keys():
+        current_cnt = current[key]
+        new_cnt = new[key]
+        counts["unchanged"] += min(current_cnt, new_cnt)
+        if current_cnt == new_cnt:
+            continue
+        if current_cnt > new_cnt:
+            counts["deleted"] += current_cnt - new_cnt
+        else:
+            counts["inserted"] += new_cnt - current_cnt
+        if current_cnt:
+            deletes.append(list(current_rows[key]))
+        if new_cnt:
+            inserts += [new_rows[key]] * new_cnt
+
+    return deletes, inserts
+
+
+def _sync_value(value):
+
+    """ Normalize a Value for Comparison in connect.sync_rows()
+
+    Database and Python values of the same data compare equal, such as
+    `Decimal('7.50')` and `7.5` or `date(2023, 1, 4)` and `'2023-01-04'`.
+
+    Internal only function and should not be called directly.
+    """
+
+    if value is None or isinstance(value, (str, bytes)):
+        return value
+    if isinstance(value, bool):
+        value = int(value)
+    if isinstance(value, (int, float, decimal.Decimal)):
+        return decimal.Decimal(str(value)).normalize()
+
+    return str(value)
+
+
+def _numpy():
+
+    """ NumPy Module if Installed
+
+    Imported on first use so scripts that don't use it don't pay the
+    import time.
+
+    Return:
+
+    module: numpy, or None if not installed.
+
+    Internal only function and should not be called directly.
+    """
+
+    global _numpy_module
+
+    if _numpy_module is None:
+        try:
+            import numpy
+            _numpy_module = numpy
+        except ImportError:
+            _numpy_module = False
+
+    return _numpy_module or None
+
+
+def _partition_bound(method: str, description: str) -> datetime.date:
+
+    """ Exclusive Upper Bound Date of a Daily RANGE Partition
+
+    Internal only function and should not be called directly.
+    """
+
+    if method == 'RANGE COLUMNS':
+        return datetime.date.fromisoformat(description.strip("'")[:10])
+
+    # TO_DAYS() day numbers start a year before Python ordinals.
+    return datetime.date.fromordinal(int(description) - 365)
+
+
+def _partition_bound_sql(partitions: list, column: str) -> str:
+
+    """ Partition Bound SQL for a Daily RANGE Partitioned Table
+
+    Return:
+
+    str: `VALUES LESS THAN` value with a `{}` placeholder for the bound
+        date. None if the table is not partitioned by `RANGE COLUMNS
+        (column)` or `RANGE (TO_DAYS(column))`.
+
+    Internal only function and should not be called directly.
+    """
+
+    if not partitions:
+        return None
+
+    method, expression = partitions[0][1:3]
+    expression = expression.replace('`', '').replace(' ', '').lower()
+
+    if method == 'RANGE COLUMNS' and expression == column.lower():
+        return "('{}')"
+    if method == 'RANGE' and expression == f'to_days({column.lower()})':
+        return "(to_days('{}'))"
+
+    log.wrn(
+        f'clintosaurous.mysql: Partitioning {method} ({expression}) ' +
+        'not supported for retention, deleting rows instead'
+    )
+    return None
+
+
+def _query_atexit() -> None:
+
+    """ Code To Execute on Script Exit
+
+    Log the instrumented query summary.
+
+    Internal only function and should not be called directly.
+    """
+
+    if _query_stats:
+        log.log('Database query profile:\n' + query_summary())
+
+
+def _query_record(
+    cursor, sql: str, params, elapsed: float, explain: bool = True
+) -> None:
+
+    """ Record an Instrumented Query
+
+    Internal only function and should not be called directly.
+    """
+
+    rowcount = cursor.rowcount
+    # Unbuffered cursors don't know the row count until all rows are read.
+    if rowcount is None or rowcount < 0 or rowcount >= 2 ** 63:
+        rowcount = 0
+    if cursor.description is None:
+        returned, affected = 0, rowcount
+    else:
+        returned, affected = rowcount, 0
+
+    fingerprint = _fingerprint(sql)
+    slow = elapsed >= slow_query_secs
+
+    with _query_lock:
+        try:
+            stats = _query_stats[fingerprint]
+        except KeyError:
+            stats = [0, 0, 0, 0, 0]
+            _query_stats[fingerprint] = stats
+        stats[0] += 1
+        stats[1] += elapsed
+        if elapsed > stats[2]:
+            stats[2] = elapsed
+        stats[3] += returned
+        stats[4] += affected
+
+        # Each statement is only explained once.
+        if slow and explain:
+            explain = fingerprint not in _query_explained
+            _query_explained.add(fingerprint)
+
+    if slow:
+        _slow_query(cursor, sql, params, elapsed, returned, affected, explain)
+
+
+def _query_register() -> None:
+
+    """ Register the Exit Query Summary
+
+    Called with the first instrumented connection. CLI options override
+    the module settings.
+
+    Internal only function and should not be called directly.
+    """
+
+    global _query_registered, query_report_top, slow_query_secs
+
+    with _query_lock:
+        if _query_registered:
+            return
+        _query_registered = True
+
+    opts = clintosaurous.opts.cli()
+    if opts.db_slow_query is not None:
+        slow_query_secs = opts.db_slow_query
+    if opts.db_profile_top is not None:
+        query_report_top = opts.db_profile_top
+
+    atexit.register(_query_atexit)
+
+
+def _quote_name(name: str) -> str:
+
+    """ Quote a Possibly Database Qualified Table or Column Name
+
+    Internal only function and should not be called directly.
+    """
+
+    return '.'.join(
+        '`' + part.replace('`', '``') + '`' for part in name.split('.'))
+
+
+def _slow_query(
+    cursor, sql: str, params, elapsed: float, returned: int, affected: int,
+    explain: bool
+) -> None:
+
+    """ Log a Slow Query With its EXPLAIN Output
+
+    Internal only function and should not be called directly.
+    """
+
+    import pymysql
+
+    if params is not None:
+        sql = cursor.mogrify(sql, params)
+    if len(sql) > slow_query_chars:
+        log_sql = sql[:slow_query_chars] + ' ...'
+    else:
+        log_sql = sql
+
+    log.wrn(
+        f'Slow query: {elapsed:.3f}s, {returned:,} rows returned, ' +
+        f'{affected:,} rows affected:\n{log_sql}'
+    )
+
+    if not explain or not re.match(
+        r'\s*(select|insert|update|delete|replace|with)\b', sql, re.I
+    ):
+        return
+
+    # The results of an unbuffered query have to be read before another
+    # query can run on the connection.
+    if isinstance(cursor, pymysql.cursors.SSCursor):
+        log.dbg('clintosaurous.mysql: EXPLAIN skipped for unbuffered cursor')
+        return
+
+    # Plain cursor so the EXPLAIN isn't recorded.
+    explain_cursor = cursor.connection.cursor(pymysql.cursors.Cursor)
+    try:
+        explain_cursor.execute(f'explain {sql}')
+        rows = [[column[0] for column in explain_cursor.description]]
+        for row in explain_cursor.fetchall():
+            rows.append(['NULL' if v is None else str(v) for v in row])
+        log.wrn('Slow query EXPLAIN:\n' + clintosaurous.text.table(rows))
+
+    except pymysql.MySQLError as err:
+        log.dbg(f'clintosaurous.mysql: EXPLAIN failed: {err}')
+
+    finally:
+        explain_cursor.close()
+
+
+class _query_timer:
+
+    """ Instrumented Cursor Mixin
+
+    Mixed in ahead of a pymysql cursor class to record the run time and
+    rows of each query.
+
+    Internal only class and should not be called directly.
+    """
+
+    # Set while executemany() runs so the statements it executes are
+    # recorded once as a whole.
+    _executemany = False
+
+    def execute(self, query, args=None):
+
+        if self._executemany:
+            return super().execute(query, args)
+
+        start = time.perf_counter()
+        result = super().execute(query, args)
+        _query_record(self, query, args, time.perf_counter() - start)
+
+        return result
+
+    def executemany(self, query, args):
+
+        self._executemany = True
+        start = time.perf_counter()
+        try:
+            result = super().executemany(query, args)
+        finally:
+            self._executemany = False
+        # Placeholders can't be explained.
+        _query_record(
+            self, query, None, time.perf_counter() - start, explain=False)
+
+        return result
+
+
 class connect:
 
     """ Database Connection Class """
@@ -118,7 +840,8 @@ class connect:
     def __init__(
         self, host: str = None, username: str = None, passwd: str = None,
         database: str = None, ssl: bool = False, ssl_ca: str = None,
-        ssl_cert: str = None, ssl_key: str = None, connect_timeout: int = 10
+        ssl_cert: str = None, ssl_key: str = None, connect_timeout: int = 10,
+        local_infile: bool = False, instrument: bool = False
     ):
 
         """ MySQL Database Connection
@@ -151,6 +874,11 @@ class connect:
         ssl_key (str): Path to SSL key to use for connection. This is
             required if ssl_cert is specified.
         connect_timeout (int): Connection timeout in seconds.
+        local_infile (bool): Allow `LOAD DATA LOCAL INFILE` on the
+            connection. Used by `bulk_load()`. Default: False
+        instrument (bool): Record the run time and rows of every query,
+            log slow queries, and log a summary at exit. Also enabled by
+            the --db-profile CLI option. Default: False
 
         Return:
 
@@ -167,6 +895,8 @@ class connect:
         TypeError: `ssl_cert` not a str.
         TypeError: `ssl_key` not a str.
         TypeError: `connect_timeout` not an int.
+        TypeError: `local_infile` not a bool.
+        TypeError: `instrument` not a bool.
         """
 
         # Type hints.
@@ -197,6 +927,14 @@ class connect:
                 '`connect_timeout` expected `int`, ' +
                 f'received {type(connect_timeout)}'
             )
+        if not isinstance(local_infile, bool):
+            raise TypeError(
+                '`local_infile` expected `bool`, ' +
+                f'received {type(local_infile)}'
+            )
+        if not isinstance(instrument, bool):
+            raise TypeError(
+                f'`instrument` expected `bool`, received {type(instrument)}')
 
         dbg_prefix = 'clintosaurous.mysql.connect()'
 
@@ -238,7 +976,8 @@ class connect:
             "user": self.options["username"],
             "password": self.options["passwd"],
             "database": self.options["database"],
-            "connect_timeout": self.options["connect-timeout"]
+            "connect_timeout": self.options["connect-timeout"],
+            "local_infile": local_infile
         }
         if self.options["ssl"]:
             self.connect_opts["ssl"] = {"ssl": {
@@ -258,11 +997,27 @@ class connect:
                 disp = self.connect_opts[key]
             log.dbg(f'{dbg_prefix}: self.connect_opts[{key}]: {disp}')
 
-        self.connection = pymysql.connect(**self.connect_opts)
+        # pymysql is only imported when a connection is made.
+        import pymysql
+
+        self.instrument = instrument or opts.db_profile
+        if self.instrument:
+            _query_register()
+            # Cursors created directly from the pymysql connection are
+            # also instrumented.
+            self.connection = pymysql.connect(
+                cursorclass=_instrumented(pymysql.cursors.Cursor),
+                **self.connect_opts
+            )
+            self.cursor = self._instrumented_cursor
+        else:
+            self.connection = pymysql.connect(**self.connect_opts)
+            self.cursor = self.connection.cursor
         self.commit = self.connection.commit
-        self.cursor = self.connection.cursor
         self.DictCursor = pymysql.cursors.DictCursor
         self.pymysql = pymysql
+        # Server local_infile setting. Checked on first bulk_load().
+        self._server_local_infile = None
         _connections.append(self.connection)
 
     def _check_opts(self, options: list[list], conf: dict) -> None:
@@ -359,6 +1114,1683 @@ class connect:
         )
         self.connection.close()
 
+    def stream(
+        self, sql: str, params: list = None, batch_size: int = 1000,
+        dict_rows: bool = True, batches: bool = False
+    ):
+
+        """ Stream Query Results
+
+        Generator returning the rows of a query as the server sends them,
+        using an unbuffered server side cursor. Rows are fetched in batches
+        of `batch_size`, so memory use stays bounded no matter how many rows
+        are returned and processing starts before the query completes.
+
+            for row in db.stream(sql, [start_time, end_time]):
+                ...
+
+        No other query can be run on this connection until the generator
+        is exhausted or closed. Closing the generator early reads and
+        discards the remaining rows.
+
+        Parameters:
+
+        sql (str): SQL query.
+        params (list|tuple|dict): Query parameters.
+        batch_size (int): Rows fetched from the server at a time.
+            Default: 1000
+        dict_rows (bool): Return each row as a `dict`. If `False`, rows are
+            returned as `tuple`s, which is faster and uses less memory.
+            Default: True
+        batches (bool): Yield lists of up to `batch_size` rows instead of
+            single rows. Default: False
+
+        Return:
+
+        generator: Query rows, or lists of rows if `batches` is set.
+
+        Raises:
+
+        TypeError: `sql` not a `str`.
+        TypeError: `batch_size` not an `int`.
+        TypeError: `dict_rows` not a `bool`.
+        TypeError: `batches` not a `bool`.
+        ValueError: `batch_size` less than 1.
+        """
+
+        # Type hints.
+        if not isinstance(sql, str):
+            raise TypeError(f'`sql` expected `str`, received {type(sql)}')
+        if isinstance(batch_size, bool) or not isinstance(batch_size, int):
+            raise TypeError(
+                f'`batch_size` expected `int`, received {type(batch_size)}')
+        if not isinstance(dict_rows, bool):
+            raise TypeError(
+                f'`dict_rows` expected `bool`, received {type(dict_rows)}')
+        if not isinstance(batches, bool):
+            raise TypeError(
+                f'`batches` expected `bool`, received {type(batches)}')
+        if batch_size < 1:
+            raise ValueError(
+                f'`batch_size` must be at least 1, received {batch_size}')
+
+        if dict_rows:
+            cursor_class = self.pymysql.cursors.SSDictCursor
+        else:
+            cursor_class = self.pymysql.cursors.SSCursor
+
+        cursor = self.cursor(cursor_class)
+        try:
+            cursor.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                if batches:
+                    yield rows
+                else:
+                    yield from rows
+
+        # Closing an unbuffered cursor reads any remaining rows so the
+        # connection can be used again.
+        finally:
+            cursor.close()
+
+    def fetch_arrays(
+        self, sql: str, params: list = None, batch_size: int = 1000
+    ) -> list:
+
+        """ Fetch Query Results as Column Arrays
+
+        Same as fetch_columns(), but returns the column arrays in `select`
+        order so they can be unpacked.
+
+            dates, totals = db.fetch_arrays(sql, [start_date])
+            deltas = totals[1:] - totals[:-1]     # With NumPy.
+
+        Parameters:
+
+        sql (str): SQL query.
+        params (list|tuple|dict): Query parameters.
+        batch_size (int): Rows fetched from the server at a time.
+            Default: 1000
+
+        Return:
+
+        list: Column arrays in `select` order.
+
+        Raises:
+
+        TypeError: `sql` not a `str`.
+        TypeError: `batch_size` not an `int`.
+        ValueError: `batch_size` less than 1.
+        ValueError: Duplicate column names in the result set.
+        """
+
+        return list(self.fetch_columns(sql, params, batch_size).values())
+
+    def fetch_columns(
+        self, sql: str, params: list = None, batch_size: int = 1000
+    ) -> dict:
+
+        """ Fetch Query Results as Typed Columns
+
+        Runs a query and returns each result column as a single typed array
+        instead of a Python object per row and value, so totals,
+        percentages, and deltas can be computed vectorized.
+
+            columns = db.fetch_columns(sql, [opts.date])
+            counts = columns["count"]
+            percent = counts / counts.sum() * 100    # With NumPy.
+
+        Column types come from the result set metadata:
+
+            Integer and `DECIMAL(n, 0)` columns, including `SUM()` and
+            `COUNT()` of integer columns: 64 bit integer.
+            Floating point and other `DECIMAL` columns: 64 bit float.
+            Integer columns containing `NULL`: 64 bit float with `NULL` as
+                NaN.
+            All other columns: Python objects.
+
+        NumPy arrays are returned when NumPy is installed. Otherwise,
+        numeric columns are `array.array` arrays (`q` and `d` type codes) and
+        other columns are `list`s.
+
+        Rows are read from the server in batches of `batch_size` using an
+        unbuffered cursor. Each batch is converted to typed arrays as it is
+        read, so the result is never held as a Python object per value.
+        Column names must be unique, so use `as` aliases for columns with the
+        same name.
+
+        Parameters:
+
+        sql (str): SQL query.
+        params (list|tuple|dict): Query parameters.
+        batch_size (int): Rows fetched from the server at a time.
+            Default: 1000
+
+        Return:
+
+        dict: Column name -> column array, in `select` order.
+
+        Raises:
+
+        TypeError: `sql` not a `str`.
+        TypeError: `batch_size` not an `int`.
+        ValueError: `batch_size` less than 1.
+        ValueError: Duplicate column names in the result set.
+        """
+
+        # Type hints.
+        if not isinstance(sql, str):
+            raise TypeError(f'`sql` expected `str`, received {type(sql)}')
+        if isinstance(batch_size, bool) or not isinstance(batch_size, int):
+            raise TypeError(
+                f'`batch_size` expected `int`, received {type(batch_size)}')
+        if batch_size < 1:
+            raise ValueError(
+                f'`batch_size` must be at least 1, received {batch_size}')
+
+        field_type = self.pymysql.constants.FIELD_TYPE
+
+        cursor = self.cursor(self.pymysql.cursors.SSCursor)
+        try:
+            cursor.execute(sql, params)
+            names = [column[0] for column in cursor.description]
+            duplicates = sorted({
+                name for name in names if names.count(name) > 1})
+            if duplicates:
+                raise ValueError(
+                    'Duplicate column names in the result set: ' +
+                    ', '.join(duplicates)
+                )
+            type_codes = [
+                _column_type(field_type, column)
+                for column in cursor.description
+            ]
+
+            # Typed array per batch for each column.
+            batches = [[] for name in names]
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for type_code, column, values in zip(
+                    type_codes, batches, zip(*rows)
+                ):
+                    column.append(_column_array(type_code, list(values)))
+
+        finally:
+            cursor.close()
+
+        columns = {}
+        for name, type_code, column in zip(names, type_codes, batches):
+            columns[name] = _column_join(type_code, column)
+
+        return columns
+
+    def bulk_load(
+        self, table: str, columns: list = None, rows=None,
+        csv_path: str = None, skip_header: bool = False,
+        disable_keys: bool = False, commit: bool = True
+    ) -> int:
+
+        """ Bulk Load Rows Into a Table
+
+        Loads rows from any iterable, or a CSV file, as fast as the server
+        allows. Rows are consumed as they are read, so a generator or
+        `csv.reader()` can be passed without holding the data in memory.
+
+            db.bulk_load(
+                'ip2location_db11', columns, csv_path=csv_path,
+                disable_keys=True
+            )
+
+        If the connection was made with `local_infile=True` and the server
+        has `local_infile` enabled, the data is loaded with `LOAD DATA LOCAL
+        INFILE`. A CSV file is sent as is. Other rows are first written to a
+        temporary CSV file. Otherwise, rows are inserted with multi-row
+        `INSERT` statements as large as `max_allowed_packet` allows, up to
+        `bulk_insert_bytes`.
+
+        Parameters:
+
+        table (str): Table name.
+        columns (list): Column names in row order. Default: All table
+            columns in table order.
+        rows (iterable): Rows to load. Each row is a sequence of values.
+            `None` is loaded as `NULL`.
+        csv_path (str): Path to a CSV file to load instead of `rows`. Fields
+            are comma separated and optionally enclosed in double quotes.
+            Values are loaded as strings. An unquoted `NULL` field is loaded
+            as `NULL` by either method.
+        skip_header (bool): Skip the first line of `csv_path`.
+            Default: False
+        disable_keys (bool): Drop the non-unique secondary indexes and
+            disable unique and foreign key checks during the load. The
+            indexes are built again once the load completes, or fails.
+            InnoDB ignores `ALTER TABLE ... DISABLE KEYS`, so the indexes
+            are dropped the same way `shadow_table()` does. `ALTER TABLE`
+            commits implicitly, so the load is always committed when this is
+            set. Default: False
+        commit (bool): Commit once the load completes. Set `False` to commit
+            later with other changes. Default: True
+
+        A failed load is rolled back, along with any other uncommitted
+        changes on the connection, and the session `unique_checks` and
+        `foreign_key_checks` values are always restored.
+
+        Return:
+
+        int: Rows loaded.
+
+        Raises:
+
+        TypeError: `table` not a `str`.
+        TypeError: `columns` not a `list`.
+        TypeError: `csv_path` not a `str`.
+        TypeError: `skip_header`, `disable_keys`, or `commit` not a `bool`.
+        ValueError: Neither or both of `rows` and `csv_path` supplied.
+        """
+
+        # Type hints.
+        if not isinstance(table, str):
+            raise TypeError(f'`table` expected `str`, received {type(table)}')
+        if columns is not None and not isinstance(columns, list):
+            raise TypeError(
+                f'`columns` expected `list`, received {type(columns)}')
+        if csv_path is not None and not isinstance(csv_path, str):
+            raise TypeError(
+                f'`csv_path` expected `str`, received {type(csv_path)}')
+        for name, value in [
+            ['skip_header', skip_header], ['disable_keys', disable_keys],
+            ['commit', commit]
+        ]:
+            if not isinstance(value, bool):
+                raise TypeError(
+                    f'`{name}` expected `bool`, received {type(value)}')
+        if (rows is None) == (csv_path is None):
+            raise ValueError('One of `rows` or `csv_path` must be supplied')
+
+        dbg_prefix = 'clintosaurous.mysql.connect.bulk_load()'
+
+        table_sql = _quote_name(table)
+        if columns:
+            columns_sql = \
+                ' (' + ', '.join(_quote_name(col) for col in columns) + ')'
+        else:
+            columns_sql = ''
+
+        load_start = time.time()
+        checks = None
+        indexes = []
+        cursor = self.cursor()
+        try:
+            if disable_keys:
+                cursor.execute('select @@unique_checks, @@foreign_key_checks')
+                checks = cursor.fetchone()
+                cursor.execute(
+                    'set unique_checks = 0, foreign_key_checks = 0')
+                cursor.execute(f'show create table {table_sql}')
+                # Unique indexes are kept so duplicates are still rejected
+                # by the load rather than when the index is rebuilt.
+                indexes = [
+                    [name, sql]
+                    for name, sql in _secondary_indexes(cursor.fetchone()[1])
+                    if not sql.startswith('UNIQUE ')
+                ]
+
+            if indexes:
+                log.dbg(f'{dbg_prefix}: {table}: Deferred indexes: {indexes}')
+                cursor.execute(
+                    f'alter table {table_sql} ' +
+                    ', '.join(f'drop index {name}' for name, sql in indexes)
+                )
+
+            try:
+                if self._local_infile(cursor):
+                    method = 'LOAD DATA LOCAL INFILE'
+                    log.dbg(f'{dbg_prefix}: {table}: Using {method}')
+                    if csv_path is None:
+                        loaded = self._load_rows_infile(
+                            cursor, table_sql, columns_sql, rows)
+                    else:
+                        loaded = self._load_infile(
+                            cursor, table_sql, columns_sql, csv_path,
+                            _line_end(csv_path), skip_header
+                        )
+
+                else:
+                    method = 'multi-row INSERT'
+                    log.dbg(f'{dbg_prefix}: {table}: Using {method}')
+                    if csv_path is None:
+                        loaded = self._load_insert(
+                            cursor, table_sql, columns_sql, rows)
+                    else:
+                        with open(
+                            csv_path, newline='', encoding='utf-8'
+                        ) as f:
+                            reader = _csv_rows(f)
+                            if skip_header:
+                                next(reader, None)
+                            loaded = self._load_insert(
+                                cursor, table_sql, columns_sql, reader)
+
+                if commit or indexes:
+                    self.commit()
+
+            except BaseException:
+                log.log(f'Rolling back failed load into {table}')
+                self.connection.rollback()
+                raise
+
+            finally:
+                if indexes:
+                    log.log(f'Rebuilding {table} indexes')
+                    cursor.execute(
+                        f'alter table {table_sql} ' +
+                        ', '.join(f'add {sql}' for name, sql in indexes)
+                    )
+
+        finally:
+            try:
+                if checks is not None:
+                    cursor.execute(
+                        'set unique_checks = %s, foreign_key_checks = %s',
+                        checks
+                    )
+            finally:
+                cursor.close()
+
+        load_secs = time.time() - load_start
+        log.log(
+            f'Loaded {loaded:,} rows into {table} using {method} in ' +
+            f'{load_secs:.1f} seconds'
+        )
+
+        return loaded
+
+    @contextlib.contextmanager
+    def shadow_table(self, table: str, defer_indexes: bool = True):
+
+        """ Load a Table Through a Shadow Table
+
+        Context manager for reloading a table without readers seeing an
+        empty or partial table. An empty copy of `table` is created with
+        `CREATE TABLE ... LIKE` and its name is returned to load into. When
+        the block exits, the shadow table replaces `table` with one atomic
+        `RENAME TABLE` and the old table is dropped. If the block raises an
+        exception, the shadow table is dropped and `table` is untouched.
+
+            with db.shadow_table('ip2location_db11') as shadow:
+                db.bulk_load(shadow, columns, csv_path=csv_path)
+
+        Triggers and foreign keys are not copied by `CREATE TABLE ... LIKE`,
+        so tables with either should not be loaded this way.
+
+        Parameters:
+
+        table (str): Table name. Can be database qualified.
+        defer_indexes (bool): Drop the secondary indexes from the shadow
+            table and build them after the block completes, which is much
+            faster than maintaining them row by row. Default: True
+
+        Return:
+
+        str: Shadow table name.
+
+        Raises:
+
+        TypeError: `table` not a `str`.
+        TypeError: `defer_indexes` not a `bool`.
+        """
+
+        # Type hints.
+        if not isinstance(table, str):
+            raise TypeError(f'`table` expected `str`, received {type(table)}')
+        if not isinstance(defer_indexes, bool):
+            raise TypeError(
+                '`defer_indexes` expected `bool`, ' +
+                f'received {type(defer_indexes)}'
+            )
+
+        dbg_prefix = 'clintosaurous.mysql.connect.shadow_table()'
+
+        shadow = f'{table}{shadow_suffix}'
+        old = f'{table}{shadow_old_suffix}'
+        table_sql = _quote_name(table)
+        shadow_sql = _quote_name(shadow)
+        old_sql = _quote_name(old)
+
+        cursor = self.cursor()
+        try:
+            # Left over from a failed run.
+            cursor.execute(f'drop table if exists {shadow_sql}, {old_sql}')
+
+            log.log(f'Creating shadow table {shadow}')
+            cursor.execute(f'create table {shadow_sql} like {table_sql}')
+
+            indexes = []
+            if defer_indexes:
+                cursor.execute(f'show create table {shadow_sql}')
+                indexes = _secondary_indexes(cursor.fetchone()[1])
+
+            if indexes:
+                log.dbg(f'{dbg_prefix}: {shadow}: Deferred indexes: {indexes}')
+                cursor.execute(
+                    f'alter table {shadow_sql} ' +
+                    ', '.join(f'drop index {name}' for name, sql in indexes)
+                )
+
+        finally:
+            cursor.close()
+
+        try:
+            yield shadow
+
+            cursor = self.cursor()
+            try:
+                if indexes:
+                    log.log(f'Building {shadow} indexes')
+                    index_start = time.time()
+                    cursor.execute(
+                        f'alter table {shadow_sql} ' +
+                        ', '.join(f'add {sql}' for name, sql in indexes)
+                    )
+                    log.log(
+                        f'Built {len(indexes)} {shadow} indexes in ' +
+                        f'{time.time() - index_start:.1f} seconds'
+                    )
+
+                log.log(f'Swapping {shadow} in for {table}')
+                cursor.execute(
+                    f'rename table {table_sql} to {old_sql}, ' +
+                    f'{shadow_sql} to {table_sql}'
+                )
+                cursor.execute(f'drop table {old_sql}')
+
+            finally:
+                cursor.close()
+
+        except BaseException:
+            log.log(f'Dropping shadow table {shadow}')
+            cursor = self.cursor()
+            try:
+                self.connection.rollback()
+                cursor.execute(f'drop table if exists {shadow_sql}')
+            finally:
+                cursor.close()
+            raise
+
+    def swap_load(
+        self, table: str, columns: list = None, rows=None,
+        csv_path: str = None, skip_header: bool = False
+    ) -> int:
+
+        """ Reload a Table Without Blocking Readers
+
+        Loads the rows into a shadow table with `bulk_load()`, builds its
+        indexes, and swaps it in for `table`. Readers see the old data until
+        the swap and the new data after it, never an empty or partial table.
+
+            db.swap_load('ip2location_db11', columns, csv_path=csv_path)
+
+        Parameters:
+
+        table (str): Table name. Can be database qualified.
+        columns (list): Column names in row order. Default: All table
+            columns in table order.
+        rows (iterable): Rows to load.
+        csv_path (str): Path to a CSV file to load instead of `rows`.
+        skip_header (bool): Skip the first line of `csv_path`.
+            Default: False
+
+        Return:
+
+        int: Rows loaded.
+
+        Raises:
+
+        Same as `bulk_load()` and `shadow_table()`.
+        """
+
+        with self.shadow_table(table) as shadow:
+            return self.bulk_load(
+                shadow, columns, rows=rows, csv_path=csv_path,
+                skip_header=skip_header
+            )
+
+    def sync_rows(
+        self, table: str, columns: list, rows, key_columns: list = None,
+        where: str = None, params: list = None, commit: bool = True
+    ) -> dict:
+
+        """ Synchronize a Table With a Row Set
+
+        Makes the rows of `table` matching `where` equal to `rows`, touching
+        only the rows that changed. The existing rows are read and compared
+        with `rows`. New rows are inserted and changed rows are updated
+        with batched `INSERT ... ON DUPLICATE KEY UPDATE` statements. Rows
+        no longer present are deleted. All changes are made in a single
+        transaction.
+
+            counts = db.sync_rows(
+                'syslog_priority_summary',
+                ['datestamp', 'priority', 'count', 'percentage'], rows,
+                key_columns=['datestamp', 'priority'],
+                where='datestamp = %s', params=[report_date]
+            )
+
+        With `key_columns`, changed rows are only updated in place if the
+        table has a primary or unique key on exactly those columns. If it
+        does not, changed rows are deleted and inserted again. Without
+        `key_columns`, whole rows are compared. Rows are only inserted and
+        deleted, and no unique key is needed.
+
+        Parameters:
+
+        table (str): Table name.
+        columns (list): Column names in row order.
+        rows (iterable): New rows. Rows with the same key replace earlier
+            ones.
+        key_columns (list): Columns identifying a row. Must be in `columns`.
+            Default: All columns.
+        where (str): SQL condition selecting the existing rows `rows`
+            replaces, such as the report date. Default: All rows.
+        params (list): `where` parameters.
+        commit (bool): Commit once complete. Set `False` to commit later
+            with other changes. Default: True
+
+        Return:
+
+        dict: Row counts with the keys `inserted`, `updated`, `deleted`,
+            and `unchanged`.
+
+        Raises:
+
+        TypeError: `table` or `where` not a `str`.
+        TypeError: `columns` or `key_columns` not a `list`.
+        TypeError: `commit` not a `bool`.
+        ValueError: `key_columns` not all in `columns`.
+        """
+
+        # Type hints.
+        if not isinstance(table, str):
+            raise TypeError(f'`table` expected `str`, received {type(table)}')
+        if not isinstance(columns, list):
+            raise TypeError(
+                f'`columns` expected `list`, received {type(columns)}')
+        if key_columns is not None and not isinstance(key_columns, list):
+            raise TypeError(
+                f'`key_columns` expected `list`, received {type(key_columns)}'
+            )
+        if where is not None and not isinstance(where, str):
+            raise TypeError(f'`where` expected `str`, received {type(where)}')
+        if not isinstance(commit, bool):
+            raise TypeError(
+                f'`commit` expected `bool`, received {type(commit)}')
+        if key_columns is not None and not set(key_columns) <= set(columns):
+            raise ValueError('`key_columns` must all be in `columns`')
+
+        table_sql = _quote_name(table)
+        columns_sql = ', '.join(_quote_name(col) for col in columns)
+        counts = {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+
+        dbg_prefix = 'clintosaurous.mysql.connect.sync_rows()'
+        sync_start = time.time()
+        cursor = self.cursor()
+        try:
+            sql = f'select {columns_sql} from {table_sql}'
+            if where:
+                sql += f' where {where}'
+            cursor.execute(sql, params)
+            existing = cursor.fetchall()
+
+            upsert = False
+            if key_columns:
+                upsert = self._unique_key(cursor, table_sql, key_columns)
+                if not upsert:
+                    log.dbg(
+                        f'{dbg_prefix}: {table}: No unique key on ' +
+                        f'{key_columns}, replacing changed rows'
+                    )
+                key_idx = [columns.index(col) for col in key_columns]
+                deletes, upserts = _sync_keyed(
+                    existing, rows, key_idx, counts, upsert)
+            else:
+                key_idx = list(range(len(columns)))
+                deletes, upserts = _sync_rows(existing, rows, counts)
+
+            # Deletes go first so a re-inserted row can not hit the old key.
+            self._delete_keys(
+                cursor, table_sql, [columns[i] for i in key_idx], deletes)
+
+            if upsert:
+                suffix = '\non duplicate key update ' + ', '.join(
+                    f'{_quote_name(col)} = values({_quote_name(col)})'
+                    for col in columns if col not in key_columns
+                )
+            else:
+                suffix = ''
+            if upserts:
+                self._load_insert(
+                    cursor, table_sql, f' ({columns_sql})', upserts, suffix)
+
+            if commit:
+                self.commit()
+
+        finally:
+            cursor.close()
+
+        log.log(
+            f'{table}: {counts["inserted"]:,} rows inserted, ' +
+            f'{counts["updated"]:,} updated, {counts["deleted"]:,} deleted, ' +
+            f'{counts["unchanged"]:,} unchanged in ' +
+            f'{time.time() - sync_start:.1f} seconds'
+        )
+
+        return counts
+
+    def retention(
+        self, table: str, column: str, days: int, future_days: int = 3,
+        batch_size: int = 5000, pause: float = 0.1
+    ) -> dict:
+
+        """ Remove Expired Rows From a Table
+
+        Removes rows with `column` dated more than `days` days before the
+        current database server date.
+
+            db.retention('firewall_messages', 'timestamp', 30)
+
+        Tables with daily `RANGE COLUMNS (column)` or `RANGE (TO_DAYS(column))`
+        partitions are managed by partition. Partitions for today and the
+        next `future_days` days are created if missing, and partitions
+        holding only expired rows are dropped, which is instant no matter
+        how many rows they hold. New partitions are named `pYYYYMMDD` for
+        the day they hold.
+
+        Other tables fall back to deleting the expired rows in chunks of
+        `batch_size` rows in `column` order, committing and pausing
+        `pause` seconds between chunks so locks are held briefly. An index
+        on `column` is needed for the chunks to be index range scans.
+
+        Parameters:
+
+        table (str): Table name. Can be database qualified.
+        column (str): `DATE`, `DATETIME`, or `TIMESTAMP` column the rows are
+            dated by.
+        days (int): Days of rows to keep before the current date.
+        future_days (int): Days of partitions to create ahead of the current
+            date. Default: 3
+        batch_size (int): Rows per delete for tables that are not
+            partitioned. Default: 5000
+        pause (int|float): Seconds to pause between deletes. Default: 0.1
+
+        Return:
+
+        dict: Counts with the keys `partitions_added`,
+            `partitions_dropped`, and `rows_deleted`.
+
+        Raises:
+
+        TypeError: `table` or `column` not a `str`.
+        TypeError: `days`, `future_days`, or `batch_size` not an `int`.
+        TypeError: `pause` not an `int` or `float`.
+        ValueError: `days` or `future_days` less than 0, or `batch_size`
+            less than 1.
+        """
+
+        # Type hints.
+        if not isinstance(table, str):
+            raise TypeError(f'`table` expected `str`, received {type(table)}')
+        if not isinstance(column, str):
+            raise TypeError(
+                f'`column` expected `str`, received {type(column)}')
+        for name, value in [
+            ['days', days], ['future_days', future_days],
+            ['batch_size', batch_size]
+        ]:
+            if isinstance(value, bool) or not isinstance(value, int):
+                raise TypeError(
+                    f'`{name}` expected `int`, received {type(value)}')
+        if isinstance(pause, bool) or not isinstance(pause, (int, float)):
+            raise TypeError(
+                f'`pause` expected `int` or `float`, received {type(pause)}')
+        if days < 0 or future_days < 0:
+            raise ValueError('`days` and `future_days` can not be negative')
+        if batch_size < 1:
+            raise ValueError(
+                f'`batch_size` must be at least 1, received {batch_size}')
+
+        dbg_prefix = 'clintosaurous.mysql.connect.retention()'
+
+        table_sql = _quote_name(table)
+        counts = {
+            "partitions_added": 0, "partitions_dropped": 0, "rows_deleted": 0
+        }
+
+        cursor = self.cursor()
+        try:
+            cursor.execute('select curdate()')
+            today = cursor.fetchone()[0]
+            cutoff = today - datetime.timedelta(days=days)
+            log.dbg(f'{dbg_prefix}: {table}: cutoff: {cutoff}')
+
+            if '.' in table:
+                schema, table_name = table.split('.', 1)
+            else:
+                schema, table_name = None, table
+            cursor.execute(
+                """
+                    select
+                        partition_name, partition_method,
+                        partition_expression, partition_description
+                    from information_schema.partitions
+                    where
+                        table_schema = coalesce(%s, database())
+                        and table_name = %s
+                        and partition_name is not null
+                    order by partition_ordinal_position
+                """,
+                [schema, table_name]
+            )
+            partitions = cursor.fetchall()
+
+            bound_sql = _partition_bound_sql(partitions, column)
+
+            if bound_sql is None:
+                log.log(
+                    f'Deleting rows from {table} with {column} before ' +
+                    f'{cutoff} in chunks of {batch_size:,}'
+                )
+                column_sql = _quote_name(column)
+                sql = (
+                    f'delete from {table_sql} where {column_sql} < %s ' +
+                    f'order by {column_sql} limit {batch_size}'
+                )
+                while True:
+                    row_cnt = cursor.execute(sql, [str(cutoff)])
+                    self.commit()
+                    counts["rows_deleted"] += row_cnt
+                    if row_cnt < batch_size:
+                        break
+                    time.sleep(pause)
+
+            else:
+                self._retention_partitions(
+                    cursor, table, partitions, bound_sql, today, cutoff,
+                    future_days, counts
+                )
+
+        finally:
+            cursor.close()
+
+        log.log(
+            f'{table}: {counts["partitions_added"]} partitions added, ' +
+            f'{counts["partitions_dropped"]} partitions dropped, ' +
+            f'{counts["rows_deleted"]:,} rows deleted'
+        )
+
+        return counts
+
+    def get_watermark(self, name: str) -> str:
+
+        """ Retrieve a High-Water Mark
+
+        Returns the last value saved with `set_watermark()` for `name`, such
+        as the last processed row ID of an incremental report. The watermark
+        table is created in the current database if it does not exist.
+
+            last_seq = int(db.get_watermark('syslog-reports') or 0)
+
+        Parameters:
+
+        name (str): Watermark name.
+
+        Return:
+
+        str: Saved value. None if no value has been saved.
+
+        Raises:
+
+        TypeError: `name` not a `str`.
+        """
+
+        # Type hints.
+        if not isinstance(name, str):
+            raise TypeError(f'`name` expected `str`, received {type(name)}')
+
+        table_sql = _quote_name(watermark_table)
+
+        cursor = self.cursor()
+        try:
+            # Creating the table commits implicitly, so it is only done here
+            # and never in the middle of a caller's transaction in
+            # set_watermark().
+            cursor.execute(f"""
+                create table if not exists {table_sql} (
+                    name varchar(191) not null primary key,
+                    value varchar(255) not null,
+                    updated timestamp not null
+                        default current_timestamp
+                        on update current_timestamp
+                )
+            """)
+            cursor.execute(
+                f'select value from {table_sql} where name = %s', [name])
+            row = cursor.fetchone()
+
+        finally:
+            cursor.close()
+
+        value = row[0] if row else None
+        log.dbg(
+            f'clintosaurous.mysql.connect.get_watermark(): {name}: {value}')
+
+        return value
+
+    def set_watermark(self, name: str, value, commit: bool = False) -> None:
+
+        """ Save a High-Water Mark
+
+        Saves the value `get_watermark()` returns for `name`. The value is
+        not committed by default so it can be committed in the same
+        transaction as the data processed up to it.
+
+            db.set_watermark('syslog-reports', max_seq)
+            db.commit()
+
+        `get_watermark()` must be called first on the connection so the
+        watermark table exists.
+
+        Parameters:
+
+        name (str): Watermark name.
+        value (str|int): Value to save. Saved as a string.
+        commit (bool): Commit the change. Default: False
+
+        Raises:
+
+        TypeError: `name` not a `str`.
+        TypeError: `commit` not a `bool`.
+        """
+
+        # Type hints.
+        if not isinstance(name, str):
+            raise TypeError(f'`name` expected `str`, received {type(name)}')
+        if not isinstance(commit, bool):
+            raise TypeError(
+                f'`commit` expected `bool`, received {type(commit)}')
+
+        log.dbg(
+            f'clintosaurous.mysql.connect.set_watermark(): {name}: {value}')
+
+        cursor = self.cursor()
+        try:
+            cursor.execute(
+                f'insert into {_quote_name(watermark_table)} (name, value) ' +
+                'values (%s, %s) ' +
+                'on duplicate key update value = values(value)',
+                [name, str(value)]
+            )
+
+        finally:
+            cursor.close()
+
+        if commit:
+            self.commit()
+
+    def _local_infile(self, cursor) -> bool:
+
+        """
+        Check if `LOAD DATA LOCAL INFILE` can be used on the connection.
+
+        Internal only function and should not be called directly.
+        """
+
+        if not self.connect_opts["local_infile"]:
+            return False
+
+        if self._server_local_infile is None:
+            cursor.execute('select @@local_infile')
+            self._server_local_infile = bool(cursor.fetchone()[0])
+
+        return self._server_local_infile
+
+    def _instrumented_cursor(self, cursor=None):
+
+        """ Create an Instrumented Cursor
+
+        Replaces `cursor()` on instrumented connections.
+
+        Internal only function and should not be called directly.
+        """
+
+        if cursor is None:
+            return self.connection.cursor()
+
+        return self.connection.cursor(_instrumented(cursor))
+
+    def _delete_keys(
+        self, cursor, table_sql: str, key_columns: list, keys: list
+    ) -> None:
+
+        """
+        Delete rows by key in batches. Keys are matched with `<=>` so `NULL`
+        key values match.
+
+        Internal only function and should not be called directly.
+        """
+
+        match_sql = '(' + ' and '.join(
+            f'{_quote_name(col)} <=> %s' for col in key_columns) + ')'
+
+        for i in range(0, len(keys), sync_delete_batch):
+            batch = keys[i:i + sync_delete_batch]
+            cursor.execute(
+                f'delete from {table_sql} where ' +
+                ' or '.join([match_sql] * len(batch)),
+                [value for key in batch for value in key]
+            )
+
+    def _unique_key(
+        self, cursor, table_sql: str, key_columns: list
+    ) -> bool:
+
+        """
+        Whether the table has a primary or unique key on exactly
+        `key_columns`, in any order.
+
+        Internal only function and should not be called directly.
+        """
+
+        cursor.execute(f'show index from {table_sql}')
+        # Index name -> columns. Fields 1, 2, and 4 are Non_unique,
+        # Key_name, and Column_name.
+        unique = collections.defaultdict(set)
+        for row in cursor.fetchall():
+            if not int(row[1]):
+                unique[row[2]].add(row[4])
+
+        return set(key_columns) in unique.values()
+
+    def _retention_partitions(
+        self, cursor, table: str, partitions: list, bound_sql: str,
+        today: datetime.date, cutoff: datetime.date, future_days: int,
+        counts: dict
+    ) -> None:
+
+        """
+        Create future daily partitions and drop expired ones for
+        retention().
+
+        Internal only function and should not be called directly.
+        """
+
+        table_sql = _quote_name(table)
+        max_partition = None
+        # Partition name -> exclusive upper bound date.
+        bounds = {}
+        for name, method, expression, description in partitions:
+            if description == 'MAXVALUE':
+                max_partition = name
+            else:
+                bounds[name] = _partition_bound(method, description)
+
+        # New partitions are added first so a table is never left without
+        # a partition for today.
+        if bounds:
+            day = max(bounds.values())
+        else:
+            day = cutoff
+        new_partitions = []
+        while day <= today + datetime.timedelta(days=future_days):
+            next_day = day + datetime.timedelta(days=1)
+            new_partitions.append(
+                f'partition p{day:%Y%m%d} values less than ' +
+                bound_sql.format(next_day)
+            )
+            day = next_day
+
+        if new_partitions:
+            log.log(f'Adding {len(new_partitions)} partitions to {table}')
+            if max_partition is None:
+                sql = f'alter table {table_sql} add partition (\n    '
+            else:
+                # Partitions can only be added below a MAXVALUE partition
+                # by reorganizing it.
+                new_partitions.append(
+                    f'partition {_quote_name(max_partition)} ' +
+                    'values less than maxvalue'
+                )
+                sql = (
+                    f'alter table {table_sql} reorganize partition ' +
+                    f'{_quote_name(max_partition)} into (\n    '
+                )
+            sql += ',\n    '.join(new_partitions) + '\n)'
+            log.dbg(
+                f'clintosaurous.mysql.connect.retention(): sql:\n{sql}')
+            cursor.execute(sql)
+            counts["partitions_added"] = len(new_partitions)
+            if max_partition is not None:
+                counts["partitions_added"] -= 1
+
+        expired = [name for name, bound in bounds.items() if bound <= cutoff]
+        if expired:
+            log.log(f'Dropping {len(expired)} expired partitions from {table}')
+            cursor.execute(
+                f'alter table {table_sql} drop partition ' +
+                ', '.join(_quote_name(name) for name in expired)
+            )
+            counts["partitions_dropped"] = len(expired)
+
+    def _load_infile(
+        self, cursor, table_sql: str, columns_sql: str, path: str,
+        line_end: str, skip_header: bool
+    ) -> int:
+
+        """
+        Load a CSV file with `LOAD DATA LOCAL INFILE`.
+
+        Internal only function and should not be called directly.
+        """
+
+        # An empty escape character leaves backslashes in the data alone.
+        # Unquoted NULL is loaded as NULL.
+        sql = f'load data local infile %s into table {table_sql}\n'
+        sql += '    character set utf8mb4\n'
+        sql += '    fields terminated by \',\' optionally enclosed by \'"\' '
+        sql += 'escaped by \'\'\n'
+        sql += '    lines terminated by %s\n'
+        if skip_header:
+            sql += '    ignore 1 lines\n'
+        sql += columns_sql
+
+        return cursor.execute(sql, [path, line_end])
+
+    def _load_rows_infile(
+        self, cursor, table_sql: str, columns_sql: str, rows
+    ) -> int:
+
+        """
+        Write rows to a temporary CSV file and load it with `LOAD DATA LOCAL
+        INFILE`.
+
+        Internal only function and should not be called directly.
+        """
+
+        with tempfile.NamedTemporaryFile(
+            'w', encoding='utf-8', newline='', prefix='clintosaurous.mysql.',
+            suffix='.csv'
+        ) as f:
+            f.writelines(
+                ','.join(map(_infile_value, row)) + '\n' for row in rows)
+            f.flush()
+
+            return self._load_infile(
+                cursor, table_sql, columns_sql, f.name, '\n', False)
+
+    def _load_insert(
+        self, cursor, table_sql: str, columns_sql: str, rows,
+        suffix: str = ''
+    ) -> int:
+
+        """
+        Load rows with multi-row `INSERT` statements sized by
+        `max_allowed_packet`. `suffix` is appended to each statement.
+
+        Internal only function and should not be called directly.
+        """
+
+        cursor.execute('select @@max_allowed_packet')
+        # Leave room for the protocol overhead.
+        max_bytes = min(cursor.fetchone()[0], bulk_insert_bytes) - 1024
+
+        sql = f'insert into {table_sql}{columns_sql} values\n'
+        escape = self.connection.escape
+        loaded = 0
+        values = []
+        size = len(sql) + len(suffix)
+
+        for row in rows:
+            # Each row escapes to `(value, ...)`.
+            row_sql = escape(tuple(row))
+            row_size = len(row_sql.encode()) + 2
+            if values and size + row_size > max_bytes:
+                cursor.execute(sql + ',\n'.join(values) + suffix)
+                loaded += len(values)
+                values = []
+                size = len(sql) + len(suffix)
+            values.append(row_sql)
+            size += row_size
+
+        if values:
+            cursor.execute(sql + ',\n'.join(values) + suffix)
+            loaded += len(values)
+
+        return loaded
+
+
+class pool:
+
+    """ Database Connection Pool
+
+    Keeps open database connections for reuse so connection and SSL setup
+    is only paid once per connection instead of once per use.
+
+    Connections are checked out with `connection()`. A connection left idle
+    longer than `check_interval` is pinged on checkout and reconnected if
+    the server closed it. Connections idle longer than `idle_timeout` are
+    closed, down to `min_size`.
+
+    Connections in a pool share the same server and credentials. A different
+    database can be requested per checkout. The connection is switched with
+    `USE` instead of opening a new connection.
+
+    Attributes:
+
+        size (int): Number of open connections, idle and checked out.
+    """
+
+    def __init__(
+        self, host: str = None, username: str = None, passwd: str = None,
+        database: str = None, ssl: bool = False, ssl_ca: str = None,
+        ssl_cert: str = None, ssl_key: str = None, connect_timeout: int = 10,
+        local_infile: bool = False, instrument: bool = False,
+        min_size: int = 0, max_size: int = 5,
+        idle_timeout: int = 300, check_interval: int = 30,
+        wait_timeout: int = 30
+    ):
+
+        """ Create a Database Connection Pool
+
+            db_pool = clintosaurous.mysql.pool(username=user, passwd=passwd)
+
+        Connection parameters are the same as `connect()` and are resolved
+        the same way, including CLI options and the configuration file.
+
+        Parameters:
+
+        host (str): Database server DNS name or IP.
+        username (str): Username for connecting to the database.
+        passwd (str): Password for above username.
+        database (str): Default database for checked out connections.
+        ssl (bool): Enable/disable MySQL connection encryption.
+        ssl_ca (str): Path to the SSL connection CA certification.
+        ssl_cert (str): Path to SSL certificate to use for connection.
+        ssl_key (str): Path to SSL key to use for connection.
+        connect_timeout (int): Connection timeout in seconds.
+        local_infile (bool): Allow `LOAD DATA LOCAL INFILE` on the
+            connections. Default: False
+        instrument (bool): Instrument queries on the connections. See
+            `connect()`. Default: False
+        min_size (int): Connections kept open when idle. Opened when the pool
+            is created. Default: 0
+        max_size (int): Maximum open connections. Default: 5
+        idle_timeout (int): Seconds before an idle connection above
+            `min_size` is closed. Default: 300
+        check_interval (int): Seconds idle before a connection is pinged on
+            checkout. Default: 30
+        wait_timeout (int): Seconds to wait for a connection when all
+            `max_size` connections are checked out. Default: 30
+
+        Raises:
+
+        TypeError: `min_size`, `max_size`, `idle_timeout`, `check_interval`,
+            or `wait_timeout` not an `int`.
+        ValueError: `max_size` less than 1 or less than `min_size`.
+
+        Connection parameters raise the same exceptions as `connect()`.
+        """
+
+        # Type hints. Connection parameters are checked by connect().
+        for name, value in [
+            ['min_size', min_size], ['max_size', max_size],
+            ['idle_timeout', idle_timeout],
+            ['check_interval', check_interval],
+            ['wait_timeout', wait_timeout]
+        ]:
+            if isinstance(value, bool) or not isinstance(value, int):
+                raise TypeError(
+                    f'`{name}` expected `int`, received {type(value)}')
+        if max_size < 1 or max_size < min_size:
+            raise ValueError(
+                '`max_size` must be at least 1 and at least `min_size`, ' +
+                f'received {max_size}'
+            )
+
+        self.connect_args = {
+            "host": host,
+            "username": username,
+            "passwd": passwd,
+            "ssl": ssl,
+            "ssl_ca": ssl_ca,
+            "ssl_cert": ssl_cert,
+            "ssl_key": ssl_key,
+            "connect_timeout": connect_timeout,
+            "local_infile": local_infile,
+            "instrument": instrument
+        }
+        self.database = database
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.check_interval = check_interval
+        self.wait_timeout = wait_timeout
+        self.size = 0
+
+        # Idle connections: [connect object, last checkin monotonic time]
+        self._idle = []
+        self._cond = threading.Condition()
+        self._closed = False
+
+        for i in range(min_size):
+            self._idle.append([self._new(database), time.monotonic()])
+            self.size += 1
+
+    @contextlib.contextmanager
+    def connection(self, database: str = None):
+
+        """ Check Out a Connection
+
+        Context manager returning a `connect` object that is returned to the
+        pool when the block exits. Uncommitted changes are rolled back when
+        the connection is returned, so commit before the block exits.
+
+            with db_pool.connection() as db:
+                cursor = db.cursor()
+
+        Parameters:
+
+        database (str): Database to use. Default: Pool default database.
+
+        Raises:
+
+        TimeoutError: No connection available within `wait_timeout`.
+        """
+
+        db = self.checkout(database)
+        try:
+            yield db
+        finally:
+            self.checkin(db)
+
+    def checkout(self, database: str = None) -> connect:
+
+        """ Check Out a Connection
+
+        Prefer `connection()`. Connections checked out with this method must
+        be returned with `checkin()`.
+
+        Parameters:
+
+        database (str): Database to use. Default: Pool default database.
+
+        Return:
+
+        connect: Database connection object.
+
+        Raises:
+
+        TypeError: `database` not a `str`.
+        RuntimeError: Pool has been closed.
+        TimeoutError: No connection available within `wait_timeout`.
+        """
+
+        # Type hints.
+        if database is not None and not isinstance(database, str):
+            raise TypeError(
+                f'`database` expected `str`, received {type(database)}')
+
+        if database is None:
+            database = self.database
+
+        deadline = time.monotonic() + self.wait_timeout
+        entry = None
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError('Database connection pool is closed')
+
+                self._evict()
+
+                if self._idle:
+                    # Prefer the most recently used connection already on
+                    # the requested database.
+                    index = len(self._idle) - 1
+                    for i in reversed(range(len(self._idle))):
+                        if (
+                            database is None or
+                            self._idle[i][0].options["database"] == database
+                        ):
+                            index = i
+                            break
+                    entry = self._idle.pop(index)
+                    break
+
+                if self.size < self.max_size:
+                    self.size += 1
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(
+                        'No database connection available within ' +
+                        f'{self.wait_timeout} seconds'
+                    )
+                self._cond.wait(remaining)
+
+        # New connections are opened outside the lock.
+        if entry is None:
+            try:
+                return self._new(database)
+            except BaseException:
+                self._release()
+                raise
+
+        db, last_used = entry
+
+        try:
+            # Reconnect connections the server may have closed while idle.
+            if time.monotonic() - last_used > self.check_interval:
+                db.connection.ping(reconnect=True)
+
+            if (
+                database is not None and
+                db.options["database"] != database
+            ):
+                log.dbg(
+                    'clintosaurous.mysql.pool.checkout(): Switching to ' +
+                    f'database {database}'
+                )
+                db.connection.select_db(database)
+                db.options["database"] = database
+
+        except BaseException:
+            db.connection.close()
+            self._release()
+            raise
+
+        return db
+
+    def checkin(self, db: connect) -> None:
+
+        """ Return a Checked Out Connection to the Pool
+
+        Parameters:
+
+        db (connect): Connection returned by `checkout()`.
+
+        Raises:
+
+        TypeError: `db` not a `connect` object.
+        """
+
+        # Type hints.
+        if not isinstance(db, connect):
+            raise TypeError(f'`db` expected `connect`, received {type(db)}')
+
+        # End any open transaction so the next user does not see its
+        # changes or its snapshot.
+        if db.connection.open:
+            try:
+                db.connection.rollback()
+            except db.pymysql.err.Error:
+                db.connection.close()
+
+        with self._cond:
+            if db.connection.open and not self._closed:
+                self._idle.append([db, time.monotonic()])
+                self._cond.notify()
+                return
+
+        if db.connection.open:
+            db.close()
+        self._release()
+
+    def close(self) -> None:
+
+        """ Close All Idle Connections and the Pool
+
+        Connections still checked out are closed when they are returned.
+        """
+
+        with self._cond:
+            self._closed = True
+            idle = self._idle
+            self._idle = []
+            self.size -= len(idle)
+            self._cond.notify_all()
+
+        for db, last_used in idle:
+            if db.connection.open:
+                db.close()
+
+    def run_concurrent(
+        self, tasks: list, database: str = None, concurrency: int = None
+    ) -> list:
+
+        """ Run Independent Queries Concurrently
+
+        Runs each task in a thread with its own connection checked out from
+        the pool. Wall clock time is close to that of the slowest task
+        instead of the sum of all of them.
+
+            results = db_pool.run_concurrent(
+                [priority_summary, [host_summary, 'syslog']],
+                concurrency=4
+            )
+
+        Each task is called with a `connect` object as its first argument.
+        Tasks must not share connections or cursors with each other.
+
+        Parameters:
+
+        tasks (list): Callables, or lists of a callable followed by extra
+            arguments to pass after the connection.
+        database (str): Database to use. Default: Pool default database.
+        concurrency (int): Maximum tasks running at a time, to limit the
+            load on the server. Never more than `max_size`.
+            Default: `max_size`
+
+        Return:
+
+        list: Task return values in `tasks` order.
+
+        Raises:
+
+        TypeError: `tasks` not a `list`.
+        TypeError: `concurrency` not an `int`.
+        ValueError: `concurrency` less than 1.
+
+        The first exception raised by a task is raised once all started tasks
+        complete. Tasks not yet started are cancelled.
+        """
+
+        # Type hints.
+        if not isinstance(tasks, list):
+            raise TypeError(f'`tasks` expected `list`, received {type(tasks)}')
+        if concurrency is not None and (
+            isinstance(concurrency, bool) or not isinstance(concurrency, int)
+        ):
+            raise TypeError(
+                '`concurrency` expected `int`, ' +
+                f'received {type(concurrency)}'
+            )
+        if concurrency is not None and concurrency < 1:
+            raise ValueError(
+                f'`concurrency` must be at least 1, received {concurrency}')
+
+        # concurrent.futures is only imported when used.
+        import concurrent.futures
+
+        workers = min(concurrency or self.max_size, self.max_size, len(tasks))
+        if not workers:
+            return []
+
+        def run_task(task):
+            if isinstance(task, (list, tuple)):
+                func, args = task[0], task[1:]
+            else:
+                func, args = task, []
+            with self.connection(database) as db:
+                return func(db, *args)
+
+        log.dbg(
+            f'clintosaurous.mysql.pool.run_concurrent(): {len(tasks)} ' +
+            f'tasks, {workers} workers'
+        )
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix='clintosaurous.mysql'
+        ) as executor:
+            futures = [executor.submit(run_task, task) for task in tasks]
+            concurrent.futures.wait(
+                futures, return_when=concurrent.futures.FIRST_EXCEPTION)
+            for future in futures:
+                future.cancel()
+
+        return [future.result() for future in futures]
+
+    def _evict(self) -> None:
+
+        """ Close Connections Idle Longer Than `idle_timeout`
+
+        Must be called with the pool lock held.
+
+        Internal only function and should not be called directly.
+        """
+
+        if self.size <= self.min_size:
+            return
+
+        now = time.monotonic()
+        # Oldest connections are at the start of the idle list.
+        while (
+            self._idle and self.size > self.min_size
+            and now - self._idle[0][1] > self.idle_timeout
+        ):
+            db, last_used = self._idle.pop(0)
+            self.size -= 1
+            if db.connection.open:
+                db.close()
+
+    def _new(self, database: str) -> connect:
+
+        """ Open a New Connection
+
+        Internal only function and should not be called directly.
+        """
+
+        return connect(database=database, **self.connect_args)
+
+    def _release(self) -> None:
+
+        """ Release a Connection Slot
+
+        Internal only function and should not be called directly.
+        """
+
+        with self._cond:
+            self.size -= 1
+            self._cond.notify()
+
+
+def get_pool(
+    host: str = None, username: str = None, passwd: str = None,
+    database: str = None, ssl: bool = False, ssl_ca: str = None,
+    ssl_cert: str = None, ssl_key: str = None, **kwargs
+) -> pool:
+
+    """ Retrieve a Shared Connection Pool
+
+    Returns the process wide pool for the server and credentials, creating
+    it on first use. Scripts that connect to several databases on the same
+    server with the same credentials share one pool and switch databases
+    with `USE`.
+
+        db_pool = clintosaurous.mysql.get_pool(username=user, passwd=passwd)
+        with db_pool.connection('reports') as db:
+            ...
+
+    Parameters:
+
+    Same as `pool()`. `database` is the pool default database when the pool
+    is created. Other pool options in `kwargs` only apply when the pool is
+    created.
+
+    Return:
+
+    pool: Shared connection pool.
+    """
+
+    key = (host, username, passwd, ssl, ssl_ca, ssl_cert, ssl_key)
+
+    with _pools_lock:
+        db_pool = _pools.get(key)
+        if db_pool is None or db_pool._closed:
+            db_pool = pool(
+                host=host, username=username, passwd=passwd,
+                database=database, ssl=ssl, ssl_ca=ssl_ca, ssl_cert=ssl_cert,
+                ssl_key=ssl_key, **kwargs
+            )
+            _pools[key] = db_pool
+
+    return db_pool
+
+
+def query_summary(top: int = None) -> str:
+
+    """ Text Summary of Instrumented Queries
+
+    Statements are grouped by fingerprint, with literal values replaced by
+    `?`, and sorted by total run time.
+
+    Parameters:
+
+    top (int): Number of statements listed.
+        Default: clintosaurous.mysql.query_report_top
+
+    Return:
+
+    str: Text table of the top statements. Empty if no queries have been
+        instrumented.
+
+    Raises:
+
+    TypeError: `top` not an `int`.
+    """
+
+    # Type hints.
+    if top is not None and (isinstance(top, bool) or not isinstance(top, int)):
+        raise TypeError(f'`top` expected `int`, received {type(top)}')
+
+    if top is None:
+        top = query_report_top
+
+    with _query_lock:
+        stats = sorted(
+            _query_stats.items(), key=lambda item: item[1][1], reverse=True)
+
+    if not stats:
+        return ''
+
+    rows = [[
+        'Total', 'Count', 'Average', 'Max', 'Rows Returned', 'Rows Affected',
+        'Statement'
+    ]]
+    for fingerprint, [cnt, total, high, returned, affected] in stats[:top]:
+        if len(fingerprint) > 100:
+            fingerprint = fingerprint[:97] + '...'
+        rows.append([
+            f'{total:.3f}s', f'{cnt:,}', f'{total / cnt:.3f}s',
+            f'{high:.3f}s', f'{returned:,}', f'{affected:,}', fingerprint
+        ])
+
+    return clintosaurous.text.table(rows)
+
 
 # Register to run commands on exit.
 atexit.register(_atexit)
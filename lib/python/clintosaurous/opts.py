@@ -16,6 +16,10 @@ https://docs.python.org/3/library/argparse.html
     opts = clintosaurous.opts.cli()
 
 `argparse` parser object for adding script specific options.
+
+Every script gets the `--profile` and `--profile-mode` options. When
+`--profile` is set, the rest of the script run after the CLI options are
+parsed is profiled. See `clintosaurous.profiler`.
 """
 
 
@@ -23,12 +27,43 @@ import argparse
 import sys
 
 
-VERSION = '1.0.0'
-LAST_UPDATE = '2023-01-08'
+VERSION = '1.1.1'
+LAST_UPDATE = '2026-10-17'
 
 
 # Parser object for calling scripts to use.
 parser = argparse.ArgumentParser()
+
+# CLI options.
+_parser_profile_group = parser.add_argument_group('profiling')
+
+_parser_profile_group.add_argument(
+    '--profile',
+    action='store_true',
+    help="""
+        Profile the script run. Reports are written next to the log file, or
+        to /tmp, on exit.
+    """
+)
+_parser_profile_group.add_argument(
+    '--profile-mode',
+    choices=['cprofile', 'sample'],
+    default='cprofile',
+    help="""
+        Profiler used by --profile. `cprofile` records every function call.
+        `sample` samples the call stack with low overhead and is safe to use
+        in production. Default: cprofile
+    """
+)
+_parser_profile_group.add_argument(
+    '--profile-interval',
+    type=float,
+    default=0.01,
+    help="""
+        Seconds between stack samples for --profile-mode sample.
+        Default: 0.01
+    """
+)
 # Previously parsed information.
 _cli_opts = None
 _uknown_args = None
@@ -95,10 +130,31 @@ def cli(known: bool = False, reparse: bool = False) -> argparse.Namespace:
     # If `known` set, parse only known CLI arguments.
     if known:
         _cli_opts, _uknown_args = parser.parse_known_args(orig_args)
+        _profile(_cli_opts)
         return _cli_opts, _uknown_args
 
     # Parse all CLI arguments. If a CLI argument is unknown, `arparse` will
     # throw an exception.
     else:
         _cli_opts = parser.parse_args(orig_args)
+        _profile(_cli_opts)
         return _cli_opts
+
+
+def _profile(opts: argparse.Namespace) -> None:
+
+    """ Start Profiling If Requested
+
+    The profiler module is only imported when `--profile` is set.
+
+    Internal only function and should not be called directly.
+
+    Parameters:
+
+    opts (argparse.Namespace): Parsed CLI options.
+    """
+
+    if opts.profile:
+        import clintosaurous.profiler
+        clintosaurous.profiler.start(
+            opts.profile_mode, opts.profile_interval)
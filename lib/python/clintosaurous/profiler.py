@@ -0,0 +1,285 @@
+#!/opt/clintosaurous/venv/bin/python3 -Bu
+
+""" Clintosaurous Tools Script Profiler
+
+This is intended as an internal module for the Clintosaurous tools.
+
+Started by `clintosaurous.opts.cli()` when the `--profile` CLI option is
+set. The rest of the script run is profiled and the reports are written on
+exit.
+
+    script --profile                        # cProfile, deterministic.
+    script --profile --profile-mode sample  # Statistical sampling.
+
+Reports are written next to the `--log-file` log file, or to /tmp if no
+log file is used:
+
+    <log file>.prof.txt     Sorted hot function report.
+    <log file>.pstats       Raw cProfile stats. Load with `pstats.Stats`.
+    <log file>.stacks       Raw sampled stacks in collapsed stack format.
+                            Usable with flamegraph.pl or speedscope.
+"""
+
+
+import atexit
+import clintosaurous.datetime
+import clintosaurous.log as log
+import clintosaurous.opts
+import collections
+import io
+import os
+import sys
+import threading
+import time
+
+
+VERSION = '1.0.2'
+LAST_UPDATE = '2026-10-17'
+
+
+# Number of functions listed in the report.
+report_lines = 50
+# Running profiler.
+_profiler = None
+
+
+def start(mode: str = 'cprofile', interval: float = 0.01) -> None:
+
+    """ Start Profiling the Script
+
+    Profiles the current thread until exit, when the reports are written.
+    Does nothing if profiling was already started.
+
+        clintosaurous.profiler.start('sample')
+
+    Parameters:
+
+    mode (str): `cprofile` for deterministic profiling of every function
+        call, or `sample` for statistical sampling of the call stack.
+        Sampling overhead is low enough to leave on in production.
+        Default: cprofile
+    interval (int|float): Seconds between stack samples in `sample` mode.
+        Default: 0.01
+
+    Raises:
+
+    TypeError: `mode` is not a `str`.
+    TypeError: `interval` is not an `int` or `float`.
+    ValueError: `mode` is not `cprofile` or `sample`.
+    """
+
+    # Type hints.
+    if not isinstance(mode, str):
+        raise TypeError(f'`mode` expected `str`, received {type(mode)}')
+    if isinstance(interval, bool) or not isinstance(interval, (int, float)):
+        raise TypeError(
+            '`interval` expected `int` or `float`, ' +
+            f'received {type(interval)}'
+        )
+    if mode not in ['cprofile', 'sample']:
+        raise ValueError(
+            f'`mode` expected `cprofile` or `sample`, received {mode}')
+
+    global _profiler
+
+    if _profiler is not None:
+        return
+
+    if mode == 'sample':
+        _profiler = _sampler(interval)
+    else:
+        # Imported for the profiler in use only.
+        import cProfile
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+
+    atexit.register(_atexit)
+
+
+def report_base() -> str:
+
+    """ Base Path for Profile Report Files
+
+    Return:
+
+    str: `--log-file` path if set, otherwise a path in /tmp named after the
+        script and start time.
+    """
+
+    # Binds the clintosaurous name for the whole function.
+    import clintosaurous.file
+
+    if _log_options() and clintosaurous.opts.cli().log_file:
+        return clintosaurous.opts.cli().log_file
+
+    script = os.path.basename(sys.argv[0])
+    stamp = clintosaurous.file.timestamp(
+        clintosaurous.datetime.start_time, tz=False)
+
+    return f'/tmp/{script}.{stamp}'
+
+
+class _sampler:
+
+    """ Statistical Stack Sampler
+
+    Samples the call stack of the thread that created it from a background
+    thread.
+
+    Internal only class and should not be called directly.
+    """
+
+    def __init__(self, interval: float):
+
+        """ Start Sampling
+
+        Parameters:
+
+        interval (float): Seconds between samples.
+        """
+
+        self.interval = interval
+        self.samples = 0
+        self.stacks = collections.Counter()
+        self._target = threading.get_ident()
+        self._stop = threading.Event()
+        self.thread = threading.Thread(
+            target=self._run, name='clintosaurous.profiler', daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+
+        """ Stop Sampling """
+
+        self._stop.set()
+        self.thread.join()
+
+    def _run(self) -> None:
+
+        """ Sampler Thread Main Loop """
+
+        while not self._stop.is_set():
+            time.sleep(self.interval)
+            frame = sys._current_frames().get(self._target)
+            if frame is None:
+                continue
+
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(
+                    (code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+
+            self.stacks[tuple(reversed(stack))] += 1
+            self.samples += 1
+
+    def report(self) -> str:
+
+        """ Hot Function Report Sorted by Self Samples """
+
+        own = collections.Counter()
+        total = collections.Counter()
+        for stack, cnt in self.stacks.items():
+            own[stack[-1]] += cnt
+            for func in set(stack):
+                total[func] += cnt
+
+        samples = self.samples or 1
+        lines = [
+            f'{self.samples:,} samples, ' +
+            f'{self.interval * 1000:g} ms interval',
+            '',
+            f'{"self %":>7} {"total %":>7} {"samples":>9}  function'
+        ]
+        for func, cnt in own.most_common(report_lines):
+            filename, lineno, name = func
+            lines.append(
+                f'{cnt / samples * 100:7.2f} ' +
+                f'{total[func] / samples * 100:7.2f} ' +
+                f'{cnt:9,}  {filename}:{lineno}({name})'
+            )
+
+        return '\n'.join(lines) + '\n'
+
+    def dump_stacks(self, path: str) -> None:
+
+        """ Write Raw Samples in Collapsed Stack Format """
+
+        with open(path, 'w') as f:
+            for stack, cnt in self.stacks.items():
+                funcs = ';'.join(
+                    f'{os.path.basename(filename)}:{name}'
+                    for filename, lineno, name in stack
+                )
+                f.write(f'{funcs} {cnt}\n')
+
+
+def _atexit() -> None:
+
+    """ Code To Execute on Script Exit
+
+    Stop profiling and write the reports.
+
+    Internal only function and should not be called directly.
+    """
+
+    global _profiler
+
+    profiler = _profiler
+    _profiler = None
+    base = report_base()
+
+    if isinstance(profiler, _sampler):
+        profiler.stop()
+        report = profiler.report()
+        raw_path = f'{base}.stacks'
+        profiler.dump_stacks(raw_path)
+
+    else:
+        profiler.disable()
+        raw_path = f'{base}.pstats'
+        profiler.dump_stats(raw_path)
+        import pstats
+        report = io.StringIO()
+        stats = pstats.Stats(profiler, stream=report)
+        stats.sort_stats('cumulative').print_stats(report_lines)
+        stats.sort_stats('tottime').print_stats(report_lines)
+        report = report.getvalue()
+
+    with open(f'{base}.prof.txt', 'w') as f:
+        f.write(report)
+
+    _report(f'Profile report written to {base}.prof.txt')
+    _report(f'Raw profile data written to {raw_path}')
+
+
+def _log_options() -> bool:
+
+    """ Whether the Log CLI Options Were Parsed
+
+    The log options only exist if `clintosaurous.log` was imported before
+    the CLI options were parsed. Scripts that don't log parse without them,
+    and `clintosaurous.log` can't be used.
+
+    Internal only function and should not be called directly.
+    """
+
+    return hasattr(clintosaurous.opts.cli(), 'log_module')
+
+
+def _report(msg: str) -> None:
+
+    """ Log a Message
+
+    Written to STDERR in the log format if the log CLI options were not
+    parsed.
+
+    Internal only function and should not be called directly.
+    """
+
+    if _log_options():
+        log.log(msg)
+    else:
+        sys.stderr.write(
+            f'{clintosaurous.datetime.timestamp()}: LOG: {msg}\n')
@@ -2,18 +2,19 @@
 
 """
 Functions for SNMP services.
+
+pysnmp and dnspython are imported on first use. Importing this module only
+registers the SNMP CLI options.
 """
 
 
-import dns.resolver as pyresolv
 from ipaddress import ip_address
 import clintosaurous.opts
-from pysnmp.hlapi import *
 import re
 
 
-VERSION = '1.1.3'
-LAST_UPDATE = '2022-11-19'
+VERSION = '1.2.0'
+LAST_UPDATE = '2026-10-17'
 
 
 # CLI options.
@@ -61,6 +62,8 @@ def _snmp_resp_value(r_value):
     Converted SNMP data types to standard data types.
     """
 
+    from pysnmp.hlapi import Integer, IpAddress, TimeTicks
+
     if (
         isinstance(r_value.subtype(), Integer)
         or isinstance(r_value.subtype(), TimeTicks)
@@ -107,6 +110,7 @@ class sesssion:
         try:
             self.ip = str(ip_address(self.host))
         except ValueError:
+            import dns.resolver as pyresolv
             try:
                 self.ip = str(pyresolv.query(self.host)[0])
             except (
@@ -145,6 +149,11 @@ class sesssion:
         Perform SNMP subtree query for the OID supplied.
         """
 
+        from pysnmp.hlapi import (
+            bulkCmd, CommunityData, ContextData, ObjectIdentity, ObjectType,
+            SnmpEngine, UdpTransportTarget
+        )
+
         # Type hints.
         if not isinstance(oid, str):
             raise TypeError(f'oid expected `str`, received {type(oid)}')
@@ -198,6 +207,11 @@ class sesssion:
         Perform SNMP get against supplied list of OIDs.
         """
 
+        from pysnmp.hlapi import (
+            CommunityData, ContextData, getCmd, ObjectIdentity, ObjectType,
+            SnmpEngine, UdpTransportTarget
+        )
+
         # Type hints.
         if not isinstance(oid, str):
             raise TypeError(f'oid expected `str`, received {type(oid)}')
@@ -0,0 +1,777 @@
+#!/opt/clintosaurous/venv/bin/python3 -Bu
+
+"""
+This module provides thread based equivalents of the
+`clintosaurous.multiprocessing` `start` and `pool` classes for I/O bound
+work like SNMP polling, DNS lookups, and database queries.
+
+    import clintosaurous.threadpool
+
+    with clintosaurous.threadpool.pool(32, retries=1) as workers:
+        for result in workers.imap_unordered(poll_host, hosts):
+            ...
+
+The naming, timeout, check, and pipe messaging semantics are the same as
+`clintosaurous.multiprocessing`, so a script can switch between them by
+changing the module. Threads share the process memory, so in-process caches
+like DNS and GEO lookups are shared, and each worker costs a few hundred KB
+instead of a process.
+
+Differences from processes:
+
+    Objects sent through pipes are passed by reference, not copied. Don't
+        change an object after sending it.
+    Threads can't be killed. A thread past its timeout is abandoned. Its
+        pipes are closed and it is removed from `procs`, but it keeps
+        running until its target returns.
+    CPU bound work is limited to one processor by the interpreter lock.
+    stats() has no peak RSS or thread count per thread.
+    `log_forward` and `warm` have no effect. Threads log directly to the
+        process log and start in the running interpreter, so there is
+        nothing to forward or warm up.
+
+The `initializer` return value is read in worker threads through
+`clintosaurous.multiprocessing.worker_state`, as in worker processes, so
+item functions work with either module.
+"""
+
+
+import atexit
+import clintosaurous.log as log
+import clintosaurous.multiprocessing
+import collections
+import heapq
+import itertools
+import os
+import threading
+import time
+
+
+VERSION = '1.1.4'
+LAST_UPDATE = '2026-10-17'
+
+
+# Per thread worker state. The return value of the start() or pool()
+# `initializer` is stored in `local.worker_state` in each thread, and read
+# with `clintosaurous.multiprocessing.worker_state`.
+local = clintosaurous.multiprocessing._worker_local
+
+
+class start:
+
+    """
+    Class to start child threads.
+
+    Same as `clintosaurous.multiprocessing.start`, with threads instead of
+    processes.
+
+    Attributes:
+
+        procs (list): Running child threads. Each element is a list of the
+            thread, the pipe to receive data from the thread, the pipe to
+            send data to the thread, and the thread start time.
+        proc_cnt (int): Number of child threads.
+        timeout (int): Total run time allowed for a thread to run.
+            Default: 3600 (1 hour)
+    """
+
+    # Default number of child threads to launch if not specified.
+    _def_cnt = (os.cpu_count() or 1) * 4
+
+    def __init__(
+        self, target, proc_cnt: int = _def_cnt, names: str = None,
+        timeout: int = 3600, log_forward: bool = False, warm: bool = False,
+        initializer=None, initargs: tuple = ()
+    ):
+
+        """
+        Launch the child threads.
+
+            threads = clintosaurous.threadpool.start(target)
+
+        Parameters:
+
+            target (obj): Function the child threads will execute. Called
+                with the thread name, the pipe to receive data from the
+                parent, and the pipe to send data to the parent, the same as
+                `clintosaurous.multiprocessing.start`.
+            proc_cnt (int): Number of child threads to launch.
+                Default: 4 child threads per system processor.
+            names (str|list): Child thread names. If omitted, the threads
+                will be named 'Worker X', where X is the child thread
+                number. If a list is supplied and is not long enough, the
+                remaining threads are called 'Worker X' again.
+            timeout (int): Amount of time in seconds a thread is allowed to
+                run before check() abandons it. Set to 0 for no timeout.
+                Default: 3600 (1 hour)
+            log_forward (bool): No effect. Threads log directly to the
+                process log. Accepted so calls written for
+                `clintosaurous.multiprocessing` work unchanged.
+                Default: False
+            warm (bool): No effect. Threads start in the running
+                interpreter with its modules already imported. Accepted so
+                calls written for `clintosaurous.multiprocessing` work
+                unchanged. Default: False
+            initializer (obj): Function called in each child thread before
+                `target`. The return value is read in the thread with
+                `clintosaurous.multiprocessing.worker_state`. Default: None
+            initargs (tuple|list): Arguments passed to `initializer`.
+
+        Raises:
+
+            TypeError: proc_cnt not an int.
+            TypeError: name not a str or list.
+            TypeError: timeout not an int.
+            TypeError: log_forward or warm not a bool.
+            TypeError: initializer not callable.
+            TypeError: initargs not a tuple or list.
+        """
+
+        # Type hints.
+        if not isinstance(proc_cnt, int):
+            raise TypeError(
+                f'proc_cnt expected `int`, received {type(proc_cnt)}')
+        if (
+            names is not None and
+            not isinstance(names, str) and
+            not isinstance(names, list)
+        ):
+            raise TypeError(
+                f'names expected `str` or `list`, received {type(names)}')
+        if not isinstance(timeout, int):
+            raise TypeError(
+                f'timeout expected `int`, received {type(timeout)}')
+        if not isinstance(log_forward, bool):
+            raise TypeError(
+                f'log_forward expected `bool`, received {type(log_forward)}')
+        if not isinstance(warm, bool):
+            raise TypeError(f'warm expected `bool`, received {type(warm)}')
+        if initializer is not None and not callable(initializer):
+            raise TypeError(
+                'initializer expected callable, ' +
+                f'received {type(initializer)}'
+            )
+        if not isinstance(initargs, (tuple, list)):
+            raise TypeError(
+                'initargs expected `tuple` or `list`, ' +
+                f'received {type(initargs)}'
+            )
+        if log_forward or warm:
+            log.dbg(
+                'clintosaurous.threadpool: log_forward and warm have no ' +
+                'effect on threads'
+            )
+
+        if names is None or isinstance(names, str):
+            names = []
+        else:
+            names = list(names)
+        for i in range(len(names), proc_cnt):
+            names.append(f'Worker {i}')
+
+        self.procs = []
+        self.proc_cnt = len(names)
+        self.timeout = timeout
+        self._target = target
+        self._initializer = initializer
+        self._initargs = initargs
+        # Notified when a child sends data or exits.
+        self._cond = threading.Condition()
+        # Timeout heap: [deadline, sequence, thread]
+        self._deadlines = []
+        self._deadline_seq = itertools.count()
+        # Resource usage records: name -> record
+        self._stats = {}
+        self._sample_time = time.time()
+
+        clintosaurous.multiprocessing._stats_register()
+        for name in names:
+            self._launch(name)
+
+    def as_completed(self, timeout: int = None):
+
+        """
+        Generator returning child threads as they exit.
+
+        See `clintosaurous.multiprocessing.start.as_completed()`.
+
+        Parameters:
+
+            timeout (int|float): Seconds to wait for all children to exit.
+                Default: None, wait forever.
+
+        Return:
+
+            generator: Thread data lists from `procs` of exited children.
+
+        Raises:
+
+            TypeError: timeout not an int or float.
+            TimeoutError: Children still running after `timeout`.
+        """
+
+        # Type hints.
+        if timeout is not None and (
+            isinstance(timeout, bool) or
+            not isinstance(timeout, (int, float))
+        ):
+            raise TypeError(
+                f'timeout expected `int` or `float`, received {type(timeout)}')
+
+        if timeout is None:
+            deadline = None
+        else:
+            deadline = time.time() + timeout
+
+        while True:
+            yield from self._reap()
+            if not self.procs:
+                return
+            self._sample()
+
+            if deadline is not None and time.time() >= deadline:
+                raise TimeoutError(
+                    f'{len(self.procs)} child threads still running')
+
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: any(
+                        proc_data[0].done for proc_data in self.procs),
+                    self._wait_time(deadline)
+                )
+            self._kill_timed_out()
+
+    def check(self, wait: bool = False) -> int:
+
+        """
+        Check the status of child threads.
+
+        Parameters:
+
+            wait (bool): Wait for all threads to exit before returning.
+
+        Return:
+
+            int: The number of still running child threads is returned.
+
+        Raises:
+
+            TypeError: wait not a bool.
+        """
+
+        if not isinstance(wait, bool):
+            raise TypeError(f'wait expected `bool`, received {type(wait)}')
+
+        while True:
+            self._kill_timed_out()
+            self._reap()
+
+            proc_cnt = len(self.procs)
+            if not wait or not proc_cnt:
+                self.proc_cnt = proc_cnt
+                return self.proc_cnt
+
+            if proc_cnt != self.proc_cnt:
+                log.log(f'Waiting on {proc_cnt} children to exit ...')
+                self.proc_cnt = proc_cnt
+            self._sample()
+
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: any(
+                        proc_data[0].done for proc_data in self.procs),
+                    self._wait_time()
+                )
+
+    def get_proc_by_name(self, name: str) -> list:
+
+        """
+        Retrieve a specific thread from the thread list based on name.
+
+        Parameters:
+
+            name: Thread name to search for.
+
+        Return:
+
+            list: Thread data from `procs` for the thread. None if thread is
+                not found.
+
+        Raises:
+
+            TypeError: name not a str.
+        """
+
+        if not isinstance(name, str):
+            raise TypeError(f'name expected `str`, received {type(name)}')
+
+        for proc in self.procs:
+            if proc[0].name == name:
+                return proc
+
+        return None
+
+    def stats(self) -> dict:
+
+        """
+        Resource usage of the child threads, sampled from
+        /proc/self/task. Each thread takes a final sample when its target
+        returns.
+
+        Return:
+
+            dict: Child name -> usage dict. See
+                `clintosaurous.multiprocessing.start.stats()`. `pid` is the
+                kernel thread ID. The RSS and thread counts are always None,
+                and `rusage` is always False.
+        """
+
+        self._sample(True)
+
+        return {name: dict(record) for name, record in self._stats.items()}
+
+    def wait_any(self, timeout: int = None) -> list:
+
+        """
+        Wait for a child thread to exit or send data.
+
+        See `clintosaurous.multiprocessing.start.wait_any()`.
+
+        Parameters:
+
+            timeout (int|float): Seconds to wait. Default: None, wait until
+                a child is ready.
+
+        Return:
+
+            list: Thread data lists from `procs` of the ready children, in
+                `procs` order. Empty if `timeout` passed or there are no
+                children.
+
+        Raises:
+
+            TypeError: timeout not an int or float.
+        """
+
+        # Type hints.
+        if timeout is not None and (
+            isinstance(timeout, bool) or
+            not isinstance(timeout, (int, float))
+        ):
+            raise TypeError(
+                f'timeout expected `int` or `float`, received {type(timeout)}')
+
+        if timeout is None:
+            deadline = None
+        else:
+            deadline = time.time() + timeout
+
+        while self.procs:
+            self._kill_timed_out()
+            self._sample()
+
+            with self._cond:
+                ready = self._cond.wait_for(
+                    self._ready, self._wait_time(deadline))
+            if ready:
+                return ready
+
+            if deadline is not None and time.time() >= deadline:
+                break
+
+        return []
+
+    def _collect(self, child, block: bool = False) -> bool:
+
+        """
+        Record the exit of a child thread.
+
+        Internal only function and should not be called directly.
+
+        Parameters:
+
+            child (_thread): Child thread.
+            block (bool): Wait for the child to exit.
+
+        Return:
+
+            bool: The child has exited.
+        """
+
+        if block:
+            child.join()
+
+        record = self._stats.get(child.name)
+        if record is None or not record['running'] or not child.done:
+            return child.done
+
+        record['running'] = False
+        record['exitcode'] = child.exitcode
+        record['run_secs'] = time.time() - record['start_time']
+
+        return True
+
+    def _kill_timed_out(self) -> None:
+
+        """
+        Abandon children past the timeout.
+
+        Internal only function and should not be called directly.
+        """
+
+        now = time.time()
+        while self._deadlines and self._deadlines[0][0] <= now:
+            child = heapq.heappop(self._deadlines)[2]
+            if child.is_alive():
+                log.wrn(f'{child.name}: Timeout exceeded, abandoning!')
+                child.kill()
+
+    def _launch(self, name: str) -> list:
+
+        """
+        Launch a child thread and add it to `procs`.
+
+        Internal only function and should not be called directly.
+
+        Return:
+
+            list: Thread data list added to `procs`.
+        """
+
+        log.log(f'Launching child thread {name} ...')
+        to_child_pipe = _pipe(threading.Condition())
+        to_parent_pipe = _pipe(self._cond)
+        start_time = time.time()
+        record = clintosaurous.multiprocessing._stats_record(
+            name, None, start_time)
+        child = _thread(
+            self._cond, self._target, name, self._initializer,
+            self._initargs, to_child_pipe, to_parent_pipe, record
+        )
+        child.start()
+        record['pid'] = child.native_id
+        proc_data = [child, to_parent_pipe, to_child_pipe, start_time]
+        self.procs.append(proc_data)
+        self._stats[name] = record
+        clintosaurous.multiprocessing._stats_prune(self._stats)
+        if self.timeout:
+            heapq.heappush(self._deadlines, [
+                start_time + self.timeout, next(self._deadline_seq), child
+            ])
+
+        return proc_data
+
+    def _ready(self) -> list:
+
+        """
+        Children that have exited or have data to receive. Called with the
+        condition held.
+
+        Internal only function and should not be called directly.
+        """
+
+        return [
+            proc_data for proc_data in self.procs
+            if proc_data[0].done or proc_data[1].ready()
+        ]
+
+    def _reap(self, procs: list = None) -> list:
+
+        """
+        Remove exited children from `procs` and log their exit.
+
+        Internal only function and should not be called directly.
+
+        Parameters:
+
+            procs (list): Thread data lists to check. Default: All of
+                `procs`.
+
+        Return:
+
+            list: Thread data lists of the exited children.
+        """
+
+        exited = []
+        for proc_data in list(self.procs if procs is None else procs):
+            child = proc_data[0]
+            if not child.done:
+                continue
+            self._collect(child)
+
+            if child.exitcode:
+                log.wrn(f'{child.name}: Non-zero exit code: {child.exitcode}')
+            else:
+                log.log(f'{child.name}: Thread exited.')
+
+            self.procs.remove(proc_data)
+            exited.append(proc_data)
+
+        return exited
+
+    def _sample(self, force: bool = False) -> None:
+
+        """
+        Sample the resource usage of running children from /proc every
+        `clintosaurous.multiprocessing.stats_interval` seconds, if periodic
+        samples are enabled.
+
+        Internal only function and should not be called directly.
+        """
+
+        now = time.time()
+        if not force:
+            interval = clintosaurous.multiprocessing._stats_interval()
+            if interval is None or now - self._sample_time < interval:
+                return
+        self._sample_time = now
+
+        for proc_data in self.procs:
+            child = proc_data[0]
+            if not child.done:
+                child.sample()
+
+    def _wait_time(self, deadline: float = None) -> float:
+
+        """
+        Seconds to block before the next child timeout, resource usage
+        sample, or `deadline`.
+
+        Internal only function and should not be called directly.
+
+        Return:
+
+            float: Seconds to wait. None to wait forever.
+        """
+
+        deadlines = []
+        interval = clintosaurous.multiprocessing._stats_interval()
+        if self.procs and interval is not None:
+            deadlines.append(self._sample_time + interval)
+        if self._deadlines:
+            deadlines.append(self._deadlines[0][0])
+        if deadline is not None:
+            deadlines.append(deadline)
+        if not deadlines:
+            return None
+
+        return max(0, min(deadlines) - time.time())
+
+
+class pool(clintosaurous.multiprocessing.pool):
+
+    """
+    Worker thread pool running a function over a queue of work items.
+
+        with clintosaurous.threadpool.pool(32) as workers:
+            names = workers.map(lookup_ptr, ips)
+
+    Same as `clintosaurous.multiprocessing.pool`, including chunking,
+    retries, task timeouts, and autoscaling, with threads instead of
+    processes. Functions and items don't need to be picklable. A worker
+    past `task_timeout` is abandoned and replaced, and its items retried.
+    """
+
+    def __init__(self, proc_cnt: int = start._def_cnt, *args, **kwargs):
+
+        """
+        Launch the worker threads. Parameters are the same as
+        `clintosaurous.multiprocessing.pool`, except `proc_cnt` defaults to
+        4 worker threads per system processor. `log_forward` and `warm` have
+        no effect, as in start().
+        """
+
+        super().__init__(proc_cnt, *args, **kwargs)
+
+    def _add_workers(self, proc_cnt: int) -> None:
+
+        """
+        Launch more worker threads.
+
+        Internal only function and should not be called directly.
+        """
+
+        if self.workers is None:
+            self.workers = start(
+                clintosaurous.multiprocessing._pool_worker, 0, timeout=0,
+                initializer=self.initializer, initargs=self.initargs
+            )
+
+        now = time.time()
+        for i in range(proc_cnt):
+            proc_data = self.workers._launch(self._worker_name())
+            self._idle_since[proc_data[0].name] = now
+            self.workers._stats[proc_data[0].name]['tasks'] = 0
+            self.workers._stats[proc_data[0].name]['items'] = 0
+
+
+class _pipe:
+
+    """
+    One way in-process pipe with the `multiprocessing.Pipe` connection
+    methods used by the clintosaurous tools.
+
+    Internal only class and should not be called directly.
+    """
+
+    def __init__(self, cond: threading.Condition):
+
+        """
+        Create a pipe.
+
+        Parameters:
+
+            cond (threading.Condition): Condition notified when data is sent
+                or the pipe is closed.
+        """
+
+        self._cond = cond
+        self._items = collections.deque()
+        self.closed = False
+
+    def close(self) -> None:
+
+        """ Close the Pipe """
+
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+    def poll(self, timeout: float = 0.0) -> bool:
+
+        """ Whether Data Is Ready, Waiting Up To `timeout` Seconds """
+
+        with self._cond:
+            return self._cond.wait_for(self.ready, timeout)
+
+    def ready(self) -> bool:
+
+        """ Data or End of File Ready. Called With the Condition Held. """
+
+        return bool(self._items) or self.closed
+
+    def recv(self):
+
+        """ Receive an Object. Raises EOFError If Closed and Empty. """
+
+        with self._cond:
+            self._cond.wait_for(self.ready)
+            if self._items:
+                return self._items.popleft()
+        raise EOFError
+
+    def send(self, obj) -> None:
+
+        """ Send an Object. Raises BrokenPipeError If Closed. """
+
+        with self._cond:
+            if self.closed:
+                raise BrokenPipeError('Pipe is closed')
+            self._items.append(obj)
+            self._cond.notify_all()
+
+
+class _thread(threading.Thread):
+
+    """
+    Child thread with the process attributes used by `start`.
+
+    Internal only class and should not be called directly.
+
+    Attributes:
+
+        done (bool): The target returned or the thread was abandoned.
+        exitcode (int): 0 if the target returned, 1 if it raised an
+            exception, -1 if abandoned. None while running.
+    """
+
+    def __init__(
+        self, cond: threading.Condition, target, name: str, initializer,
+        initargs: tuple, from_parent_pipe: _pipe, to_parent_pipe: _pipe,
+        record: dict
+    ):
+
+        super().__init__(name=name, daemon=True)
+        self.cond = cond
+        self.done = False
+        self.exitcode = None
+        self._child_target = target
+        self._initializer = initializer
+        self._initargs = initargs
+        self._pipes = [from_parent_pipe, to_parent_pipe]
+        self._record = record
+
+    def is_alive(self) -> bool:
+
+        return not self.done
+
+    def join(self, timeout: float = None) -> None:
+
+        # Abandoned threads are not waited on.
+        if self.exitcode == -1:
+            return
+        super().join(timeout)
+
+    def kill(self) -> None:
+
+        """ Abandon the Thread and Close Its Pipes """
+
+        with self.cond:
+            if self.done:
+                return
+            self.exitcode = -1
+            self.done = True
+            self.cond.notify_all()
+        for pipe in self._pipes:
+            pipe.close()
+
+    def sample(self) -> None:
+
+        """ Sample the Thread Resource Usage From /proc """
+
+        clintosaurous.multiprocessing._stats_sample(
+            self._record, f'/proc/self/task/{self.native_id}', thread=True)
+
+    def run(self) -> None:
+
+        exitcode = 0
+        try:
+            if self._initializer is not None:
+                local.worker_state = self._initializer(*self._initargs)
+            self._child_target(self.name, *self._pipes)
+        except Exception:
+            # Abandoned threads fail on their closed pipes.
+            if self.exitcode != -1:
+                # Only imported on failure to keep the module import time
+                # down.
+                import traceback
+                log.err(f'{self.name}: Failed:\n{traceback.format_exc()}')
+            exitcode = 1
+        finally:
+            # The thread's /proc entry is gone once it exits.
+            self.sample()
+            with self.cond:
+                self._pipes[1].close()
+                if not self.done:
+                    self.exitcode = exitcode
+                    self.done = True
+                self.cond.notify_all()
+
+
+def _abandon_on_exit() -> None:
+
+    """
+    Close the pipes of all running child threads on exit so threads waiting
+    for work return.
+
+    Internal only function and should not be called directly.
+    """
+
+    for child in threading.enumerate():
+        if isinstance(child, _thread):
+            for pipe in child._pipes:
+                pipe.close()
+
+
+# Register to run commands on exit.
+atexit.register(_abandon_on_exit)
@@ -0,0 +1,203 @@
+""" Shared Fixtures for the Clintosaurous Tests
+
+Scripts in `python/` are loaded as modules so their functions can be run
+against a `clintosaurous.mysql.connect` object backed by a fake pymysql
+connection that records the SQL executed.
+"""
+
+
+import copy
+import importlib.machinery
+import importlib.util
+import os
+import sys
+import types
+
+import pytest
+
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_DIR, 'lib', 'python'))
+
+import clintosaurous.mysql  # noqa: E402
+import clintosaurous.opts  # noqa: E402
+
+
+# pymysql names used by clintosaurous.mysql. Field type codes are the
+# MySQL protocol values.
+PYMYSQL = types.SimpleNamespace(
+    constants=types.SimpleNamespace(FIELD_TYPE=types.SimpleNamespace(
+        DECIMAL=0, TINY=1, SHORT=2, LONG=3, FLOAT=4, DOUBLE=5, LONGLONG=8,
+        INT24=9, YEAR=13, NEWDECIMAL=246, VAR_STRING=253
+    )),
+    cursors=types.SimpleNamespace(
+        Cursor=None, DictCursor=None, SSCursor=None, SSDictCursor=None)
+)
+
+# Modules outside this repository the scripts import at load time.
+EXTERNAL_MODULES = [
+    'clintosaurous.credentials', 'clintosaurous.db', 'clintosaurous.ddi',
+    'dns', 'dns.resolver', 'dns.reversename', 'requests'
+]
+
+
+class FakeCursor:
+
+    """ pymysql Cursor Recording the SQL Executed """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.description = conn.description
+        self.rows = []
+
+    def execute(self, sql, params=None):
+        sql = ' '.join(sql.split())
+        self.conn.executed.append([sql, params])
+        if sql in self.conn.variables:
+            self.rows = [[self.conn.variables[sql]]]
+        elif self.conn.results:
+            self.rows = list(self.conn.results.pop(0))
+        else:
+            self.rows = []
+        return len(self.rows)
+
+    def fetchall(self):
+        rows, self.rows = self.rows, []
+        return rows
+
+    def fetchmany(self, size):
+        rows, self.rows = self.rows[:size], self.rows[size:]
+        return rows
+
+    def fetchone(self):
+        return self.rows.pop(0) if self.rows else None
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+
+    """ pymysql Connection Returning Queued Results
+
+    `results` holds the rows returned by each `execute()` call in order.
+    Calls without a queued result return no rows. Server variable queries
+    are answered from `variables`.
+    """
+
+    open = True
+    variables = {"select @@max_allowed_packet": 4 * 1024 * 1024}
+
+    def __init__(self, results=None, description=None):
+        self.commits = 0
+        self.description = description
+        self.executed = []
+        self.results = list(results or [])
+        self.rollbacks = 0
+
+    def commit(self):
+        self.commits += 1
+
+    def cursor(self, cursor=None):
+        return FakeCursor(self)
+
+    def escape(self, value):
+        if isinstance(value, tuple):
+            return '(' + ', '.join(self.escape(v) for v in value) + ')'
+        if value is None:
+            return 'NULL'
+        return repr(value)
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def sql(self, prefix):
+
+        """ Statements Executed Starting With `prefix`
+
+        Server variable queries are left out.
+        """
+
+        return [
+            [sql, params] for sql, params in self.executed
+            if sql.lower().startswith(prefix) and sql not in self.variables
+        ]
+
+
+@pytest.fixture(autouse=True)
+def cli_args(monkeypatch):
+
+    """ Parse the CLI Options From an Empty Command Line
+
+    The modules parse `sys.argv` on first use, which holds the pytest
+    arguments.
+    """
+
+    monkeypatch.setattr(sys, 'argv', ['pytest'])
+    monkeypatch.setattr(clintosaurous.opts, '_cli_opts', None)
+
+
+@pytest.fixture
+def mysql_db():
+
+    """ Build a clintosaurous.mysql.connect on a FakeConnection
+
+    `description` is the cursor description of the queued results, as
+    [name, type code, display size, internal size, precision, scale,
+    null ok] for each column.
+    """
+
+    def build(results=None, description=None):
+        conn = FakeConnection(results, description)
+        db = object.__new__(clintosaurous.mysql.connect)
+        db.connection = conn
+        db.cursor = conn.cursor
+        db.commit = conn.commit
+        db.DictCursor = PYMYSQL.cursors.DictCursor
+        db.pymysql = PYMYSQL
+        db.instrument = False
+        db._server_local_infile = False
+        return db
+
+    return build
+
+
+@pytest.fixture
+def load_script(monkeypatch):
+
+    """ Load a Script From python/ as a Module
+
+    The scripts add their options to the shared parser, so each test parses
+    them with its own copy of it.
+    """
+
+    for name in EXTERNAL_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            module = types.ModuleType(name)
+            monkeypatch.setitem(sys.modules, name, module)
+            if '.' in name:
+                parent, child = name.rsplit('.', 1)
+                monkeypatch.setattr(
+                    sys.modules[parent], child, module, raising=False)
+
+    monkeypatch.setattr(
+        clintosaurous.opts, 'parser', copy.deepcopy(clintosaurous.opts.parser))
+    monkeypatch.setattr(clintosaurous.opts, '_cli_opts', None)
+
+    def load(name, *args):
+        monkeypatch.setattr(sys, 'argv', [name, *args])
+        path = os.path.join(REPO_DIR, 'python', name)
+        loader = importlib.machinery.SourceFileLoader(
+            name.replace('-', '_'), path)
+        spec = importlib.util.spec_from_loader(loader.name, loader)
+        script = importlib.util.module_from_spec(spec)
+        loader.exec_module(script)
+        script.opts = script.cli_opts()
+        return script
+
+    return load
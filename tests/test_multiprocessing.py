@@ -0,0 +1,324 @@
+""" clintosaurous.multiprocessing Child Processes and Worker Pools
+
+Worker functions are at the top level so they can be pickled to the
+workers. Items that fail once write a marker file, so the retry on another
+worker succeeds.
+"""
+
+
+import multiprocessing.connection
+import os
+import sys
+import time
+
+import pytest
+
+import clintosaurous.multiprocessing
+import clintosaurous.opts
+
+
+def child_proc(name, from_parent_pipe, to_parent_pipe):
+    # Exits when the parent says so, so the test controls the exit order.
+    from_parent_pipe.recv()
+    sum(range(100000))
+
+
+def child_sleep(name, from_parent_pipe, to_parent_pipe):
+    time.sleep(float(name.split()[-1]))
+    to_parent_pipe.send(name)
+
+
+def child_hang(name, from_parent_pipe, to_parent_pipe):
+    time.sleep(60)
+
+
+def square(item):
+    return item * item
+
+
+def slow_square(item):
+    time.sleep(item[1])
+    return item[0] * item[0]
+
+
+def fail_once(path):
+    if not os.path.exists(path):
+        open(path, 'w').close()
+        raise ValueError(f'{path}: First attempt')
+    return os.path.basename(path)
+
+
+def exit_once(path):
+    if not os.path.exists(path):
+        open(path, 'w').close()
+        os._exit(3)
+    return os.path.basename(path)
+
+
+def hang_once(path):
+    if not os.path.exists(path):
+        open(path, 'w').close()
+        time.sleep(60)
+    return os.path.basename(path)
+
+
+def always_fail(item):
+    raise ValueError(f'Item {item} failed')
+
+
+def worker_init(tag):
+    return f'{tag} {os.getpid()}'
+
+
+def worker_item(item):
+    return clintosaurous.multiprocessing.worker_state
+
+
+def child_share(name, from_parent_pipe, to_parent_pipe):
+    to_parent_pipe.send(clintosaurous.multiprocessing.share_batch(
+        [{"host": f'h{i % 2}', "count": i} for i in range(4)]))
+
+
+def shared_rows(rows, columns=None):
+    handle = clintosaurous.multiprocessing.share_batch(rows, columns)
+    with clintosaurous.multiprocessing.shared_batch(handle) as batch:
+        kinds = {column[0]: column[1] for column in handle["columns"]}
+        return kinds, list(batch.rows())
+
+
+def test_share_batch_types():
+    rows = [
+        [1, 1.5, 'a', 2, None, 2 ** 70, True],
+        [2 ** 62, -0.25, 'b', 2.5, 'x', 1, False],
+        [-3, 0.0, 'a', 3, 1, 2, True]
+    ]
+
+    kinds, shared = shared_rows(rows)
+
+    assert kinds == {
+        '0': 'q', '1': 'd', '2': 's', '3': 'o', '4': 'o', '5': 'o', '6': 'o'
+    }
+    assert shared == [tuple(row) for row in rows]
+    # Integers mixed with floats keep their type.
+    assert [type(row[3]) for row in shared] == [int, float, int]
+    assert [type(row[6]) for row in shared] == [bool, bool, bool]
+
+
+def test_share_batch_dicts():
+    rows = [{"host": 'h1', "count": 1}, {"host": 'h2', "count": 2}]
+
+    with clintosaurous.multiprocessing.shared_batch(
+        clintosaurous.multiprocessing.share_batch(rows)
+    ) as batch:
+        assert list(batch.rows(True)) == rows
+        assert list(batch.columns["count"]) == [1, 2]
+
+    assert shared_rows([], ['host']) == ({'host': 'q'}, [])
+
+
+def test_share_batch_child():
+    procs = clintosaurous.multiprocessing.start(child_share, 1)
+    handle = procs.procs[0][1].recv()
+    procs.check(True)
+
+    with clintosaurous.multiprocessing.shared_batch(handle) as batch:
+        assert batch.row_cnt == 4
+        assert batch.columns["host"] == ['h0', 'h1', 'h0', 'h1']
+        assert sum(batch.columns["count"]) == 6
+
+    assert not os.path.exists(f'/dev/shm/{handle["name"]}')
+
+
+def test_as_completed():
+    procs = clintosaurous.multiprocessing.start(
+        child_sleep, 2, names=['Child 0.3', 'Child 0'])
+
+    exited = []
+    for proc_data in procs.as_completed(10):
+        assert proc_data[1].recv() == proc_data[0].name
+        exited.append(proc_data[0].name)
+
+    assert exited == ['Child 0', 'Child 0.3']
+    assert not procs.procs
+
+
+def test_wait_any():
+    procs = clintosaurous.multiprocessing.start(
+        child_sleep, 2, names=['Child 0.3', 'Child 0'])
+
+    ready = procs.wait_any(10)
+    assert [proc_data[0].name for proc_data in ready] == ['Child 0']
+    assert ready[0][1].recv() == 'Child 0'
+    procs.procs[0][1].recv()
+    procs.check(True)
+
+
+def test_start_timeout():
+    procs = clintosaurous.multiprocessing.start(child_hang, 1, timeout=1)
+    start_time = time.time()
+    procs.check(True)
+
+    assert time.time() - start_time < 10
+    assert procs.stats()['Worker 0']['exitcode'] < 0
+
+
+def test_pool_map_order():
+    with clintosaurous.multiprocessing.pool(3) as workers:
+        results = workers.map(square, (i for i in range(20)), chunk_size=3)
+
+    assert results == [i * i for i in range(20)]
+
+
+def test_pool_backpressure():
+    consumed = []
+
+    def items():
+        for i in range(20):
+            consumed.append(i)
+            yield i
+
+    with clintosaurous.multiprocessing.pool(2) as workers:
+        results = workers.imap_unordered(square, items(), chunk_size=1)
+        next(results)
+        # Only one item per worker is read before the first result.
+        assert len(consumed) == 2
+        assert sorted([0] + list(results))[1:] == sorted(
+            i * i for i in range(1, 20))
+
+
+def test_pool_abandoned_run():
+    with clintosaurous.multiprocessing.pool(2) as workers:
+        results = workers.imap_unordered(
+            slow_square, [[1, 0], [2, 0.3], [3, 0.3]], chunk_size=1)
+        next(results)
+        results.close()
+
+        # Results of the abandoned run are not returned by the next one.
+        assert workers.map(square, range(4)) == [0, 1, 4, 9]
+
+
+@pytest.mark.parametrize('func', [fail_once, exit_once])
+def test_pool_retry(func, tmp_path):
+    paths = [str(tmp_path / f'item{i}') for i in range(4)]
+
+    with clintosaurous.multiprocessing.pool(2, retries=1) as workers:
+        results = workers.map(func, paths, chunk_size=1)
+
+    assert results == ['item0', 'item1', 'item2', 'item3']
+
+
+def test_pool_retries_exhausted():
+    with clintosaurous.multiprocessing.pool(2, retries=1) as workers:
+        with pytest.raises(RuntimeError, match='Item 1 failed'):
+            workers.map(always_fail, [1])
+
+
+def test_pool_task_timeout(tmp_path):
+    path = str(tmp_path / 'item')
+
+    with clintosaurous.multiprocessing.pool(
+        1, retries=1, task_timeout=1
+    ) as workers:
+        start_time = time.time()
+        assert workers.map(hang_once, [path]) == ['item']
+        assert time.time() - start_time < 10
+        # The hung worker was killed and replaced.
+        assert len(workers.stats()) == 2
+
+
+def test_pool_autoscale_grow():
+    with clintosaurous.multiprocessing.pool(
+        1, autoscale=True, max_procs=3, scale_interval=0, scale_load=1000.0
+    ) as workers:
+        results = workers.map(
+            slow_square, [[i, 0.2] for i in range(6)], chunk_size=1)
+
+        assert results == [i * i for i in range(6)]
+        assert len(workers.stats()) == 3
+
+
+def test_pool_autoscale_idle():
+    with clintosaurous.multiprocessing.pool(
+        3, autoscale=True, min_procs=1, scale_interval=0, idle_timeout=0,
+        scale_load=1000.0
+    ) as workers:
+        assert workers.map(slow_square, [[2, 0.5]]) == [4]
+
+        # Idle workers past idle_timeout are retired.
+        active = [
+            proc_data for proc_data in workers.workers.procs
+            if proc_data[0].name not in workers._retiring
+        ]
+        assert len(active) == 1
+
+
+def test_pool_warm_initializer():
+    with clintosaurous.multiprocessing.pool(
+        2, warm=True, initializer=worker_init, initargs=('state',)
+    ) as workers:
+        states = workers.map(worker_item, range(8), chunk_size=1)
+
+    assert {state.split()[0] for state in states} == {'state'}
+    assert os.getpid() not in {int(state.split()[1]) for state in states}
+    assert clintosaurous.multiprocessing.worker_state is None
+
+
+def test_stats_rusage():
+    procs = clintosaurous.multiprocessing.start(child_proc, 2)
+    for proc_data in procs.procs:
+        proc_data[2].send('exit')
+    procs.check(True)
+
+    stats = procs.stats()
+    assert len(stats) == 2
+    for record in stats.values():
+        assert record['rusage']
+        assert not record['running']
+        assert record['exitcode'] == 0
+        assert record['user_secs'] + record['system_secs'] > 0
+
+
+def test_stats_rusage_start_after_exit():
+    # Process.start() reaps children that have already exited.
+    first = clintosaurous.multiprocessing.start(child_proc, 1)
+    proc, from_child_pipe, to_child_pipe = first.procs[0][:3]
+    to_child_pipe.send('exit')
+    multiprocessing.connection.wait([proc.sentinel])
+
+    second = clintosaurous.multiprocessing.start(child_proc, 1)
+    second.procs[0][2].send('exit')
+    second.check(True)
+    first.check(True)
+
+    assert first.stats()['Worker 0']['rusage']
+    assert second.stats()['Worker 0']['rusage']
+
+
+def test_stats_keep(monkeypatch):
+    monkeypatch.setattr(clintosaurous.multiprocessing, 'stats_keep', 2)
+    procs = clintosaurous.multiprocessing.start(child_proc, 3)
+    for proc_data in procs.procs:
+        proc_data[2].send('exit')
+    procs.check(True)
+
+    # Running children are never dropped.
+    assert len(procs.stats()) == 3
+
+    more = clintosaurous.multiprocessing.start(child_proc, 1)
+    more.procs[0][2].send('exit')
+    more.check(True)
+    records = clintosaurous.multiprocessing._proc_stats
+    assert len(records) == 2
+    assert records[-1] is more._stats['Worker 0']
+
+
+def test_stats_interval(monkeypatch):
+    # Only sampled periodically when asked for.
+    assert clintosaurous.multiprocessing._stats_interval() is None
+
+    monkeypatch.setattr(sys, 'argv', ['pytest', '--proc-stats'])
+    monkeypatch.setattr(clintosaurous.opts, '_cli_opts', None)
+    assert clintosaurous.multiprocessing._stats_interval() == 1.0
+
+    monkeypatch.setattr(clintosaurous.multiprocessing, 'stats_interval', 0.5)
+    assert clintosaurous.multiprocessing._stats_interval() == 0.5
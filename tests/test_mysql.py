@@ -0,0 +1,119 @@
+""" clintosaurous.mysql Connection Methods
+
+Runs the `clintosaurous.mysql.connect` methods against a fake pymysql
+connection.
+"""
+
+
+import array
+
+import clintosaurous.mysql
+import pytest
+
+
+def test_fetch_columns_batches(mysql_db, monkeypatch):
+    monkeypatch.setattr(clintosaurous.mysql, '_numpy', lambda: None)
+    description = [
+        ['host', 253, None, None, None, 0, True],
+        ['count', 246, None, None, None, 0, True],
+        ['percentage', 246, None, None, None, 2, True]
+    ]
+    # The NULL count in the second batch makes the count column float.
+    db = mysql_db([[
+        ['h1', 1, 50.0], ['h2', 2, 25.0], ['h3', None, 25.0]
+    ]], description)
+
+    columns = db.fetch_columns('select host, count, percentage', None, 2)
+
+    assert list(columns) == ['host', 'count', 'percentage']
+    assert columns["host"] == ['h1', 'h2', 'h3']
+    assert columns["count"].typecode == 'd'
+    assert columns["count"][:2] == array.array('d', [1, 2])
+    assert columns["count"][2] != columns["count"][2]
+    assert columns["percentage"] == array.array('d', [50.0, 25.0, 25.0])
+
+
+def test_fetch_columns_integer(mysql_db, monkeypatch):
+    monkeypatch.setattr(clintosaurous.mysql, '_numpy', lambda: None)
+    db = mysql_db(
+        [[[1], [2], [3]]], [['seq', 8, None, None, None, 0, False]])
+
+    assert db.fetch_arrays('select seq', None, 2) == \
+        [array.array('q', [1, 2, 3])]
+
+
+def test_fetch_columns_duplicate_names(mysql_db):
+    description = [
+        ['count', 8, None, None, None, 0, False],
+        ['count', 8, None, None, None, 0, False]
+    ]
+    db = mysql_db([[[1, 2]]], description)
+
+    with pytest.raises(ValueError, match='count'):
+        db.fetch_columns('select t1.count, t2.count')
+
+
+def test_sync_rows_unique_key(mysql_db):
+    db = mysql_db([
+        [['h1', 1], ['h2', 2]],
+        [['hosts', 0, 'PRIMARY', 1, 'host'], ['hosts', 1, 'count', 1, 'count']]
+    ])
+
+    counts = db.sync_rows(
+        'hosts', ['host', 'count'], [['h1', 1], ['h2', 3], ['h3', 4]],
+        key_columns=['host']
+    )
+
+    assert counts == {
+        "inserted": 1, "updated": 1, "deleted": 0, "unchanged": 1
+    }
+    conn = db.connection
+    assert conn.sql('delete') == []
+    inserts = conn.sql('insert')
+    assert len(inserts) == 1
+    assert "('h2', 3), ('h3', 4)" in inserts[0][0]
+    assert 'on duplicate key update `count` = values(`count`)' in \
+        inserts[0][0]
+
+
+def test_sync_rows_no_unique_key(mysql_db):
+    # Only a non-unique index on the key column, so an upsert would add a
+    # second row for h2.
+    db = mysql_db([
+        [['h1', 1], ['h2', 2]],
+        [['hosts', 1, 'host', 1, 'host']]
+    ])
+
+    counts = db.sync_rows(
+        'hosts', ['host', 'count'], [['h1', 1], ['h2', 3], ['h3', 4]],
+        key_columns=['host']
+    )
+
+    assert counts == {
+        "inserted": 1, "updated": 1, "deleted": 0, "unchanged": 1
+    }
+    conn = db.connection
+    assert [params for sql, params in conn.sql('delete')] == [['h2']]
+    inserts = conn.sql('insert')
+    assert len(inserts) == 1
+    assert "('h2', 3), ('h3', 4)" in inserts[0][0]
+    assert 'on duplicate key' not in inserts[0][0]
+
+
+def test_bulk_load_csv_null(mysql_db, tmp_path):
+    csv_path = tmp_path / 'hosts.csv'
+    csv_path.write_text(
+        'host,comment\nh1,NULL\nh2,"NULL"\n"h3","a,\nNULL"\n', newline='')
+    db = mysql_db()
+    db.connect_opts = {"local_infile": False}
+
+    assert db.bulk_load(
+        'hosts', ['host', 'comment'], csv_path=str(csv_path),
+        skip_header=True
+    ) == 3
+
+    # Unquoted NULL is NULL, as LOAD DATA loads it.
+    inserts = db.connection.sql('insert')
+    assert len(inserts) == 1
+    assert inserts[0][0].endswith(
+        "values ('h1', NULL), ('h2', 'NULL'), ('h3', 'a,\\nNULL')")
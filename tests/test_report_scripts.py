@@ -0,0 +1,145 @@
+""" Report Script Database Writes
+
+Runs the report scripts' database functions against a
+`clintosaurous.mysql.connect` object and checks the SQL they send.
+"""
+
+
+import pytest
+
+
+def test_dns_reports_db_update(load_script, mysql_db):
+    dns_reports = load_script('dns-reports', '-D', '2026-10-16')
+    columns = ['datestamp', 'server_name', 'count', 'percentage']
+    # Existing rows: one unchanged, one changed, one no longer reported.
+    # The table has a primary key on the report key columns.
+    db = mysql_db([
+        [
+            ['2026-10-16', 'ns1', 10, 50.0],
+            ['2026-10-16', 'ns2', 5, 25.0],
+            ['2026-10-16', 'ns3', 5, 25.0]
+        ],
+        [
+            ['dns_queries_per_server', 0, 'PRIMARY', 1, 'datestamp'],
+            ['dns_queries_per_server', 0, 'PRIMARY', 2, 'server_name']
+        ]
+    ])
+    reports = [[
+        'dns_queries_per_server', columns, [
+            ['2026-10-16', 'ns1', 10, 50.0],
+            ['2026-10-16', 'ns2', 10, 50.0]
+        ]
+    ]]
+
+    dns_reports.db_update(db, reports)
+
+    conn = db.connection
+    assert conn.sql('select') == [[
+        'select `datestamp`, `server_name`, `count`, `percentage` ' +
+        'from `dns_queries_per_server` where datestamp = %s',
+        ['2026-10-16']
+    ]]
+    assert [params for sql, params in conn.sql('delete')] == [
+        ['2026-10-16', 'ns3']
+    ]
+    inserts = conn.sql('insert')
+    assert len(inserts) == 1
+    assert "('2026-10-16', 'ns2', 10, 50.0)" in inserts[0][0]
+    assert "'ns1'" not in inserts[0][0]
+    assert 'on duplicate key update' in inserts[0][0]
+    assert conn.commits == 1
+
+
+def test_dns_reports_db_update_type(load_script):
+    dns_reports = load_script('dns-reports', '-D', '2026-10-16')
+
+    with pytest.raises(TypeError):
+        dns_reports.db_update(object(), [])
+
+
+def test_syslog_reports_db_update(load_script, mysql_db):
+    syslog_reports = load_script('syslog-reports', '-D', '2026-10-16')
+    syslog_reports.start_time = '2026-10-16 00:00:00'
+    syslog_reports.end_time = '2026-10-16 23:59:59'
+    db = mysql_db()
+    login_columns = [
+        'timestamp', 'host', 'program', 'user', 'src_ip', 'src_dns_name',
+        'message_type'
+    ]
+    reports = [
+        [
+            'syslog_priority_summary',
+            ['datestamp', 'priority', 'count', 'percentage'],
+            [['2026-10-16', 'info', 4, 100.0]]
+        ],
+        [
+            'sec_login_log', login_columns,
+            [[
+                '2026-10-16 01:00:00', 'h1', 'SSHD', 'alice', '10.0.0.5',
+                'ws.example', 'Allowed'
+            ]]
+        ]
+    ]
+
+    syslog_reports.db_update(db, reports)
+
+    conn = db.connection
+    assert [params for sql, params in conn.sql('select')] == [
+        ['2026-10-16'], ['2026-10-16 00:00:00', '2026-10-16 23:59:59']
+    ]
+    assert len(conn.sql('insert')) == 2
+    # Committed with the watermark by the caller.
+    assert conn.commits == 0
+
+
+def test_syslog_reports_split_login(load_script):
+    syslog_reports = load_script('syslog-reports', '-D', '2026-10-16', '-i')
+    syslog_reports.known_hosts = {'10.0.0.5': 'ws.example'}
+    syslog_reports.start_time = '2026-10-16 00:00:00'
+    syslog_reports.end_time = '2026-10-16 23:59:59'
+    msgs = [
+        [1, 'Accepted publickey for alice from 10.0.0.5 port 22'],
+        [2, 'pam_unix(sshd:session): session opened for user alice'],
+        [3, 'Accepted publickey for bob from 10.0.0.5 port 22'],
+        [4, 'pam_unix(sshd:session): session opened for user bob']
+    ]
+
+    class StreamDB:
+        def stream(self, sql, params):
+            return [
+                {
+                    "hostname": 'h1', "seq": seq, "program": 'SSHD',
+                    "timestamp": f'2026-10-16 01:00:0{seq}', "msg": msg
+                }
+                for seq, msg in msgs if params[2] < seq <= params[3]
+            ]
+
+    def run(login_seq_start, seq_end):
+        syslog_reports.login_seq_start = login_seq_start
+        syslog_reports.seq_end = seq_end
+        (table, columns, rows), login_seq = \
+            syslog_reports.login_msgs(StreamDB())
+        return [[row[3] for row in rows], login_seq]
+
+    # bob's login is still open at the end of the first run, so it is held
+    # back and parsed again from its first message.
+    syslog_reports.opts.date = '2999-01-01'
+    assert run(0, 3) == [['alice'], 2]
+    assert run(2, 4) == [[], 2]
+
+    # Once the report date is over, the open login is reported.
+    syslog_reports.opts.date = '2026-10-16'
+    assert run(2, 4) == [['bob'], 4]
+
+
+def test_dns_reports_db_cleanup(load_script, mysql_db, monkeypatch):
+    dns_reports = load_script('dns-reports', '-D', '2026-10-16')
+    db = mysql_db()
+    calls = []
+    monkeypatch.setattr(
+        db, 'retention', lambda *args: calls.append(list(args)))
+
+    dns_reports.db_cleanup(db)
+
+    assert len(calls) == 7
+    assert ['dns_queries_per_server', 'datestamp', 30] in calls
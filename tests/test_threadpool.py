@@ -0,0 +1,27 @@
+""" clintosaurous.threadpool Worker Threads """
+
+
+import threading
+
+import clintosaurous.multiprocessing
+import clintosaurous.threadpool
+
+
+def worker_init(tag):
+    return f'{tag} {threading.current_thread().name}'
+
+
+def worker_item(item):
+    return clintosaurous.multiprocessing.worker_state
+
+
+def test_worker_state():
+    with clintosaurous.threadpool.pool(
+        3, initializer=worker_init, initargs=('state',), log_forward=True,
+        warm=True
+    ) as workers:
+        states = set(workers.map(worker_item, range(30)))
+
+    assert states <= {'state Worker 0', 'state Worker 1', 'state Worker 2'}
+    assert states
+    assert clintosaurous.multiprocessing.worker_state is None
@@ -8,24 +8,25 @@ Display syslog report data from reports table.
 import clintosaurous.cgi
 import clintosaurous.credentials as credentials
 from clintosaurous.datetime import datestamp
-import clintosaurous.db
+import clintosaurous.log as log
+import clintosaurous.mysql
 import time
 
 
-VERSION = '2.3.1'
-LAST_UPDATE = '2022-10-28'
+VERSION = '2.4.1'
+LAST_UPDATE = '2026-10-17'
 
 
-def display_report(db: clintosaurous.db.connect) -> None:
+def display_report(db: clintosaurous.mysql.connect) -> None:
 
     """
     Display syslog message summary report.
     """
 
     # Type hints.
-    if not isinstance(db, clintosaurous.db.connect):
+    if not isinstance(db, clintosaurous.mysql.connect):
         raise TypeError(
-            f'db expected `clintosaurous.db.connect`, received {type(db)}')
+            f'db expected `clintosaurous.mysql.connect`, received {type(db)}')
 
     sql = """
         select t.total, l.ldate, l.total
@@ -107,110 +108,74 @@ def display_report(db: clintosaurous.db.connect) -> None:
 # End: display_report()
 
 
-def display_trending(db: clintosaurous.db.connect) -> bool:
+def display_trending(db: clintosaurous.mysql.connect) -> bool:
 
     """
     Display summary of total number of syslog messages by host.
     """
 
     # Type hints.
-    if not isinstance(db, clintosaurous.db.connect):
+    if not isinstance(db, clintosaurous.mysql.connect):
         raise TypeError(
-            f'db expected `clintosaurous.db.connect`, received {type(db)}')
+            f'db expected `clintosaurous.mysql.connect`, received {type(db)}')
 
     if cgi.form_values.getvalue('submit_trend') is None:
         return False
 
+    headings = ['Date', 'Count', 'Delta']
+
     sql = """
-        select datestamp, host, sum(count) as total
+        select datestamp, sum(count) as total
         from syslog_host_total_messages
-        where datediff(current_date(), datestamp) <= 30
-        group by datestamp, host
+        where datestamp >= current_date() - interval 30 day
+        group by datestamp
+        order by datestamp
     """
-    cursor = db.cursor()
-    cursor.execute(sql)
-
-    host_totals = {}
-    totals = {}
-    for db_row in cursor:
-        row = list(db_row)
-        row[2] = int(row[2])
-
-        try:
-            totals[row[0]] += row[2]
-        except KeyError:
-            totals[row[0]] = row[2]
-
-        try:
-            host = host_totals[row[1]]
-        except KeyError:
-            host_totals[row[1]] = {}
-            host = host_totals[row[1]]
-
-        try:
-            host[row[0]] += row[2]
-        except KeyError:
-            host[row[0]] = row[2]
-
-    cursor.close()
-
-    daily_rows = []
-    prev_cnt = 0
-    for date in sorted(totals.keys()):
-        cnt = totals[date]
-        if prev_cnt:
-            delta = cnt - prev_cnt
-        else:
-            delta = 0
+    dates, totals = db.fetch_arrays(sql)
 
-        daily_rows.append([date, f'{cnt:,}', f'{delta:,}'])
-        prev_cnt = cnt
+    print(cgi.hr())
+    print(cgi.text_box(
+        cgi.table_split(headings, trend_rows(dates, totals)), 'Daily Totals'
+    ))
 
-    daily_rows.reverse()
+    sql = """
+        select host, datestamp, sum(count) as total
+        from syslog_host_total_messages
+        where datestamp >= current_date() - interval 30 day
+        group by host, datestamp
+        order by host, datestamp
+    """
+    hosts, dates, totals = db.fetch_arrays(sql)
 
-    print(cgi.hr())
-    headings = ['Date', 'Count', 'Delta']
-    print(cgi.text_box(cgi.table_split(headings, daily_rows), 'Daily Totals'))
-
-    for hostname in sorted(host_totals.keys()):
-        totals = host_totals[hostname]
-        daily_rows = []
-        prev_cnt = 0
-        for date in sorted(totals.keys()):
-            cnt = totals[date]
-            if prev_cnt:
-                delta = cnt - prev_cnt
-            else:
-                delta = 0
-
-            daily_rows.append([
-                date, f'{cnt:,}', f'{delta:,}'
-            ])
-            prev_cnt = cnt
-
-        daily_rows.reverse()
+    # Rows are ordered by host, so each host is a contiguous slice.
+    start = 0
+    for end in range(1, len(hosts) + 1):
+        if end < len(hosts) and hosts[end] == hosts[start]:
+            continue
 
         print(cgi.hr())
         print(cgi.text_box(
-            cgi.table_split(headings, daily_rows),
-            f'{hostname} Daily Totals'
+            cgi.table_split(
+                headings, trend_rows(dates[start:end], totals[start:end])),
+            f'{hosts[start]} Daily Totals'
         ))
+        start = end
 
     return True
 
 # End: display_trending()
 
 
-def form_options(db: clintosaurous.db.connect) -> dict:
+def form_options(db: clintosaurous.mysql.connect) -> dict:
 
     """
     Date selection HTML form options.
     """
 
     # Type hints.
-    if not isinstance(db, clintosaurous.db.connect):
+    if not isinstance(db, clintosaurous.mysql.connect):
         raise TypeError(
-            f'db expected `clintosaurous.db.connect`, received {type(db)}')
+            f'db expected `clintosaurous.mysql.connect`, received {type(db)}')
 
     sql = """
         select distinct datestamp
@@ -318,16 +283,16 @@ def parse_page(total_msgs: int) -> tuple[int, int, int]:
 # End: parse_page()
 
 
-def rpt_host_counts(db: clintosaurous.db.connect) -> list:
+def rpt_host_counts(db: clintosaurous.mysql.connect) -> list:
 
     """
     Generate host total log messages report data.
     """
 
     # Type hints.
-    if not isinstance(db, clintosaurous.db.connect):
+    if not isinstance(db, clintosaurous.mysql.connect):
         raise TypeError(
-            f'db expected `clintosaurous.db.connect`, received {type(db)}')
+            f'db expected `clintosaurous.mysql.connect`, received {type(db)}')
 
     sql = """
         select host, count, concat(percentage, '%%')
@@ -365,16 +330,16 @@ def rpt_host_counts(db: clintosaurous.db.connect) -> list:
 # End: rpt_host_counts()
 
 
-def rpt_log_level(db: clintosaurous.db.connect) -> list:
+def rpt_log_level(db: clintosaurous.mysql.connect) -> list:
 
     """
     Generates total count of log messages per log level.
     """
 
     # Type hints.
-    if not isinstance(db, clintosaurous.db.connect):
+    if not isinstance(db, clintosaurous.mysql.connect):
         raise TypeError(
-            f'db expected `clintosaurous.db.connect`, received {type(db)}')
+            f'db expected `clintosaurous.mysql.connect`, received {type(db)}')
 
     sql = 'select level, name, descr from syslog_levels order by level'
     cursor = db.cursor()
@@ -407,16 +372,16 @@ def rpt_log_level(db: clintosaurous.db.connect) -> list:
 # End: rpt_log_level()
 
 
-def rpt_priority_hosts(db: clintosaurous.db.connect) -> list:
+def rpt_priority_hosts(db: clintosaurous.mysql.connect) -> list:
 
     """
     Generate priority messages counts by host.
     """
 
     # Type hints.
-    if not isinstance(db, clintosaurous.db.connect):
+    if not isinstance(db, clintosaurous.mysql.connect):
         raise TypeError(
-            f'db expected `clintosaurous.db.connect`, received {type(db)}')
+            f'db expected `clintosaurous.mysql.connect`, received {type(db)}')
 
     sql = """
         select
@@ -473,16 +438,16 @@ def rpt_priority_hosts(db: clintosaurous.db.connect) -> list:
 # End: rpt_priority_hosts()
 
 
-def rpt_priority_summary(db: clintosaurous.db.connect) -> list:
+def rpt_priority_summary(db: clintosaurous.mysql.connect) -> list:
 
     """
     Generate summary of messages per log level.
     """
 
     # Type hints.
-    if not isinstance(db, clintosaurous.db.connect):
+    if not isinstance(db, clintosaurous.mysql.connect):
         raise TypeError(
-            f'db expected `clintosaurous.db.connect`, received {type(db)}')
+            f'db expected `clintosaurous.mysql.connect`, received {type(db)}')
 
     sql = 'select level, name from syslog_levels order by level'
     cursor = db.cursor()
@@ -583,16 +548,16 @@ def rpt_priority_summary(db: clintosaurous.db.connect) -> list:
 # End: rpt_priority_summary()
 
 
-def rpt_top_host_processes(db: clintosaurous.db.connect) -> list:
+def rpt_top_host_processes(db: clintosaurous.mysql.connect) -> list:
 
     """
     Generate top syslog message processes by host report.
     """
 
     # Type hints.
-    if not isinstance(db, clintosaurous.db.connect):
+    if not isinstance(db, clintosaurous.mysql.connect):
         raise TypeError(
-            f'db expected `clintosaurous.db.connect`, received {type(db)}')
+            f'db expected `clintosaurous.mysql.connect`, received {type(db)}')
 
     sql = """
         select host, process, count, concat(percentage, '%%')
@@ -631,16 +596,16 @@ def rpt_top_host_processes(db: clintosaurous.db.connect) -> list:
 # End: rpt_top_host_processes()
 
 
-def rpt_top_process_counts(db: clintosaurous.db.connect) -> list:
+def rpt_top_process_counts(db: clintosaurous.mysql.connect) -> list:
 
     """
     Generate top processes of all syslog messages report.
     """
 
     # Type hints.
-    if not isinstance(db, clintosaurous.db.connect):
+    if not isinstance(db, clintosaurous.mysql.connect):
         raise TypeError(
-            f'db expected `clintosaurous.db.connect`, received {type(db)}')
+            f'db expected `clintosaurous.mysql.connect`, received {type(db)}')
 
     sql = """
         select process, count, concat(percentage, '%%')
@@ -678,16 +643,16 @@ def rpt_top_process_counts(db: clintosaurous.db.connect) -> list:
 # End: rpt_top_process_counts()
 
 
-def syslog_view(db: clintosaurous.db.connect) -> bool:
+def syslog_view(db: clintosaurous.mysql.connect) -> bool:
 
     """
     Display syslog messages for a host based on web form criteria.
     """
 
     # Type hints.
-    if not isinstance(db, clintosaurous.db.connect):
+    if not isinstance(db, clintosaurous.mysql.connect):
         raise TypeError(
-            f'db expected `clintosaurous.db.connect`, received {type(db)}')
+            f'db expected `clintosaurous.mysql.connect`, received {type(db)}')
 
     log_levels = ['EMR', 'ALR', 'CRI', 'ERR', 'WRN', 'LOG', 'INF', 'DBG']
 
@@ -827,6 +792,29 @@ def syslog_view(db: clintosaurous.db.connect) -> bool:
 # End: syslog_view()
 
 
+def trend_rows(dates, totals) -> list:
+
+    """
+    Trending table rows, newest first, from date ordered dates and totals.
+    """
+
+    deltas = [0]
+    deltas += [
+        cnt - prev_cnt if prev_cnt else 0
+        for prev_cnt, cnt in zip(totals, totals[1:])
+    ]
+
+    rows = [
+        [date, f'{cnt:,}', f'{delta:,}']
+        for date, cnt, delta in zip(dates, totals, deltas)
+    ]
+    rows.reverse()
+
+    return rows
+
+# End: trend_rows()
+
+
 if __name__ == '__main__':
     cgi = clintosaurous.cgi.cgi(
         title='syslog Reports',
@@ -847,12 +835,13 @@ if __name__ == '__main__':
     top_count = 25
 
     user, passwd = credentials.data().get('mysql-report_ro')
-    db = clintosaurous.db.connect(
+    # Connection log messages would be written into the page.
+    log.log_level(-1, module='clintosaurous.mysql')
+    db = clintosaurous.mysql.connect(
         host='mysql1.clintosaurous.com',
-        user=user,
+        username=user,
         passwd=passwd,
-        database='reports',
-        logging=False
+        database='reports'
     )
 
     form_opts = form_options(db)